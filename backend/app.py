@@ -5,24 +5,54 @@ Initializes Flask app, enables CORS, and registers all routes.
 
 import os
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from config.settings import Config
+from utils.helpers import json_default
+
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes Hotel/Activity records in their wire shape."""
+
+    @staticmethod
+    def default(o):
+        if hasattr(o, "to_dict"):
+            return json_default(o)
+        return DefaultJSONProvider.default(o)
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = RecordJSONProvider(app)
 app.config.from_object(Config)
 
 # Enable CORS for Next.js frontend
 CORS(app,origins=["http://localhost:3000"])
 
 # Import and register routes
-from routes import health, hotels, activities, plan_trip
+from routes import health, hotels, activities, plan_trip, plan_trips, nearby, metrics
 
 # Register blueprints
 app.register_blueprint(health.bp)
 app.register_blueprint(hotels.bp)
 app.register_blueprint(activities.bp)
 app.register_blueprint(plan_trip.bp)
+app.register_blueprint(plan_trips.bp)
+app.register_blueprint(nearby.bp)
+app.register_blueprint(metrics.bp)
+
+# Optionally warm upstream connection pools in the background
+from services.http_pool import start_preconnect
+if Config.HTTP_PRECONNECT:
+    start_preconnect()
+
+# Warm result and summary caches for popular destinations in the background.
+# "python app.py" runs the debug reloader: only its child process, which serves
+# requests, warms (not the watching parent)
+from services.prewarm import start_prewarm
+reloader_parent = __name__ == "__main__" and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+if Config.PREWARM_ENABLED and not reloader_parent:
+    start_prewarm()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
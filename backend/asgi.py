@@ -0,0 +1,329 @@
+"""
+ASGI entry point for AI Travel Agent Backend.
+Serves /hotels, /activities and /plan_trip on the async service layer so a single
+process can hold many in-flight upstream waits without a thread per request.
+All other routes (and CORS preflights) are delegated to the Flask app.
+
+Run with:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from app import app as flask_app
+from config.settings import Config
+from services.tripadvisor_service import async_get_hotels, async_get_activities, async_get_fallback_results
+from services.openai_service import async_generate_ai_summary
+from services.prewarm import record_destination
+from services.records import dumps_records, is_fallback
+from utils.deadline import request_deadline
+from utils.helpers import json_default, normalize_destination
+from utils.metrics import request_seconds, serialization_seconds
+from utils.response_cache import response_cache
+
+# Same origin the Flask app allows via flask-cors
+ALLOWED_ORIGINS = ["http://localhost:3000"]
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+async def _send_json(send, data, status=200, origin=None):
+    """
+    Sends a JSON HTTP response.
+
+    Args:
+        send: ASGI send callable
+        data: JSON-serializable payload
+        status (int): HTTP status code
+        origin (str): Request Origin header, echoed back if allowed
+    """
+    body = json.dumps(data, ensure_ascii=False, default=json_default).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode())
+    ]
+    if origin in ALLOWED_ORIGINS:
+        headers.append((b"access-control-allow-origin", origin.encode()))
+        headers.append((b"vary", b"Origin"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_cached(send, scope, entry, origin=None, cache_status="HIT", conditional=True):
+    """
+    Sends a response-cache entry, negotiating content-coding and answering
+    If-None-Match with 304 (same behaviour as utils.response_cache.to_response).
+
+    Args:
+        send: ASGI send callable
+        scope: ASGI connection scope (for request headers)
+        entry: utils.response_cache.CachedBody
+        origin (str): Request Origin header, echoed back if allowed
+        cache_status (str): Value of the X-Cache header
+        conditional (bool): Whether to honour If-None-Match (GET only)
+    """
+    request_headers = dict(scope.get("headers", []))
+    encoding, body = entry.select(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+    headers = [
+        (b"etag", entry.etag_for(encoding).encode()),
+        (b"vary", b"Accept-Encoding"),
+        (b"x-cache", cache_status.encode())
+    ]
+    if origin in ALLOWED_ORIGINS:
+        headers.append((b"access-control-allow-origin", origin.encode()))
+        headers.append((b"vary", b"Origin"))
+
+    if conditional and entry.matches(request_headers.get(b"if-none-match", b"").decode("latin-1")):
+        status, body = 304, b""
+    else:
+        status = 200
+        headers.append((b"content-type", b"application/json"))
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+    headers.append((b"content-length", str(len(body)).encode()))
+
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive):
+    """
+    Reads the full request body.
+
+    Args:
+        receive: ASGI receive callable
+
+    Returns:
+        bytes: Request body
+    """
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _query_param(scope, name, default=None, type=None):
+    """
+    Reads a single query string parameter.
+
+    Args:
+        scope: ASGI connection scope
+        name (str): Parameter name
+        default: Value returned if missing or not convertible
+        type: Optional conversion callable (e.g. int)
+
+    Returns:
+        Parameter value or default
+    """
+    values = parse_qs(scope.get("query_string", b"").decode()).get(name)
+    if not values:
+        return default
+    if type is None:
+        return values[0]
+    try:
+        return type(values[0])
+    except (ValueError, TypeError):
+        return default
+
+
+async def hotels(scope, receive, send, origin):
+    """GET /hotels served by async_get_hotels."""
+    destination = _query_param(scope, "destination")
+    limit = _query_param(scope, "limit", 5, type=int)
+
+    if not destination:
+        return await _send_json(send, {"error": "Missing destination parameter"}, 400, origin)
+
+    record_destination(destination)
+    cache_key = ("hotels", normalize_destination(destination), limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return await _send_cached(send, scope, cached, origin)
+
+    try:
+        hotels_data = await async_get_hotels(destination, limit=limit)
+        with serialization_seconds.time():
+            entry = response_cache.store(
+                cache_key, dumps_records(hotels_data).encode("utf-8"), cache=not is_fallback(hotels_data)
+            )
+        await _send_cached(send, scope, entry, origin, "MISS")
+    except Exception as e:
+        await _send_json(send, {"error": f"Failed to fetch hotels: {str(e)}"}, 500, origin)
+
+
+async def activities(scope, receive, send, origin):
+    """GET /activities served by async_get_activities."""
+    destination = _query_param(scope, "destination")
+    limit = _query_param(scope, "limit", 5, type=int)
+
+    if not destination:
+        return await _send_json(send, {"error": "Missing destination parameter"}, 400, origin)
+
+    record_destination(destination)
+    cache_key = ("activities", normalize_destination(destination), limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return await _send_cached(send, scope, cached, origin)
+
+    try:
+        activities_data = await async_get_activities(destination, limit=limit)
+        with serialization_seconds.time():
+            entry = response_cache.store(
+                cache_key, dumps_records(activities_data).encode("utf-8"), cache=not is_fallback(activities_data)
+            )
+        await _send_cached(send, scope, entry, origin, "MISS")
+    except Exception as e:
+        await _send_json(send, {"error": f"Failed to fetch activities: {str(e)}"}, 500, origin)
+
+
+async def _plan_stage(stage, fetch, destination, limit, deadline):
+    """
+    Runs a hotels/activities fetch, answering from the fallback data if it is still
+    running when the deadline passes (the fetch itself continues and fills the caches).
+
+    Args:
+        stage (str): "hotels" or "activities"
+        fetch: async_get_hotels or async_get_activities
+        destination (str): Destination name
+        limit (int): Maximum number of results
+        deadline (Deadline): Stage deadline, or None
+
+    Returns:
+        tuple: (results, elapsed milliseconds)
+    """
+    started = time.perf_counter()
+    task = asyncio.ensure_future(fetch(destination, limit=limit, deadline=deadline))
+    if deadline is None:
+        results = await task
+    else:
+        try:
+            results = await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except asyncio.TimeoutError:
+            deadline.note_missed(f"serving fallback {stage} for {destination}")
+            results = await async_get_fallback_results(stage, destination, limit)
+    return results, round((time.perf_counter() - started) * 1000, 1)
+
+
+async def plan_trip(scope, receive, send, origin):
+    """
+    POST /plan_trip with hotels and activities fetched concurrently on the event loop.
+    Honours the same request deadline (and X-Request-Timeout header) as the Flask route.
+    """
+    try:
+        data = json.loads(await _read_body(receive) or b"null")
+    except ValueError:
+        data = None
+
+    if not data or not isinstance(data, dict):
+        return await _send_json(send, {"error": "Missing request body"}, 400, origin)
+
+    destination = data.get("destination")
+    budget = data.get("budget")
+    limit = data.get("limit", 5)
+
+    if not destination:
+        return await _send_json(send, {"error": "Missing destination parameter"}, 400, origin)
+
+    if budget is None:
+        return await _send_json(send, {"error": "Missing budget parameter"}, 400, origin)
+
+    record_destination(destination, budget)
+    cache_key = ("plan_trip", normalize_destination(destination), str(budget), str(limit))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return await _send_cached(send, scope, cached, origin, conditional=False)
+
+    headers = dict(scope.get("headers", []))
+    timeout_header = headers.get(b"x-request-timeout", b"").decode() or None
+    deadline = request_deadline(timeout_header, Config.PLAN_TRIP_DEADLINE_SECONDS)
+    stage_deadlines = {
+        stage: deadline.child() if deadline is not None else None
+        for stage in ("hotels", "activities", "summary")
+    }
+
+    async def timed(coro):
+        started = time.perf_counter()
+        result = await coro
+        return result, round((time.perf_counter() - started) * 1000, 1)
+
+    try:
+        started = time.perf_counter()
+        timings = {}
+
+        (hotels_data, timings["hotels_ms"]), (activities_data, timings["activities_ms"]) = await asyncio.gather(
+            _plan_stage("hotels", async_get_hotels, destination, limit, stage_deadlines["hotels"]),
+            _plan_stage("activities", async_get_activities, destination, limit, stage_deadlines["activities"])
+        )
+        summary, timings["summary_ms"] = await timed(
+            async_generate_ai_summary(
+                destination, budget, hotels_data, activities_data, deadline=stage_deadlines["summary"]
+            )
+        )
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        degraded = [
+            stage for stage, stage_deadline in stage_deadlines.items()
+            if stage_deadline is not None and stage_deadline.missed
+        ]
+
+        with serialization_seconds.time():
+            body = json.dumps({
+                "destination": destination,
+                "budget": budget,
+                "hotels": hotels_data,
+                "activities": activities_data,
+                "summary": summary,
+                "degraded": bool(degraded),
+                "metadata": {"timings": timings, "degraded_stages": degraded}
+            }, ensure_ascii=False, default=json_default).encode("utf-8")
+            # Partial plans and fallback data: answer now, let the next request build the full one
+            cacheable = not degraded and not is_fallback(hotels_data) and not is_fallback(activities_data)
+            entry = response_cache.store(cache_key, body, cache=cacheable)
+        await _send_cached(send, scope, entry, origin, "MISS", conditional=False)
+    except Exception as e:
+        await _send_json(send, {"error": f"Failed to plan trip: {str(e)}"}, 500, origin)
+
+
+# (method, path) -> async handler
+ROUTES = {
+    ("GET", "/hotels"): hotels,
+    ("GET", "/activities"): activities,
+    ("POST", "/plan_trip"): plan_trip
+}
+
+
+async def app(scope, receive, send):
+    """
+    ASGI application: async routes first, everything else through Flask.
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] == "http":
+        handler = ROUTES.get((scope["method"], scope["path"]))
+        if handler is not None:
+            headers = dict(scope.get("headers", []))
+            origin = headers.get(b"origin", b"").decode() or None
+            print(f"[REQUEST] {scope['method']} {scope['path']} (async)")
+            started = time.perf_counter()
+
+            async def send_recording(message):
+                if message["type"] == "http.response.start":
+                    request_seconds.observe(
+                        time.perf_counter() - started, scope["path"], scope["method"], message["status"]
+                    )
+                await send(message)
+
+            return await handler(scope, receive, send_recording, origin)
+
+    await wsgi_app(scope, receive, send)
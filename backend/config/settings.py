@@ -15,14 +15,124 @@ class Config:
     
     # OpenAI API Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+    OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", 20))
     
     # RapidAPI Travel Advisor Configuration
     RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "")
     RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST", "travel-advisor.p.rapidapi.com")
     
+    # RapidAPI Rate Limit Configuration (client-side token bucket, set from the plan limits)
+    RAPIDAPI_RATE_LIMIT_ENABLED = os.getenv("RAPIDAPI_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RAPIDAPI_RATE_PER_SECOND = float(os.getenv("RAPIDAPI_RATE_PER_SECOND", 5))
+    RAPIDAPI_RATE_BURST = float(os.getenv("RAPIDAPI_RATE_BURST", 10))
+    RAPIDAPI_RATE_MAX_WAIT = float(os.getenv("RAPIDAPI_RATE_MAX_WAIT", 2.0))
+    RATE_LIMIT_DB_PATH = os.getenv(
+        "RATE_LIMIT_DB_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rate_limit.sqlite3")
+    )
+    
+    # Circuit Breaker Configuration (per upstream; slow calls count as failures)
+    BREAKER_ENABLED = os.getenv("BREAKER_ENABLED", "true").lower() == "true"
+    BREAKER_FAILURE_RATIO = float(os.getenv("BREAKER_FAILURE_RATIO", 0.5))
+    BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", 5))
+    BREAKER_WINDOW_SECONDS = float(os.getenv("BREAKER_WINDOW_SECONDS", 60))
+    BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", 30))
+    BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", 1))
+    RAPIDAPI_SLOW_CALL_SECONDS = float(os.getenv("RAPIDAPI_SLOW_CALL_SECONDS", 5))
+    OPENAI_SLOW_CALL_SECONDS = float(os.getenv("OPENAI_SLOW_CALL_SECONDS", 20))
+    
     # Server Configuration
     PORT = int(os.getenv("PORT", 5000))
     
+    # Request Deadline Configuration (/plan_trip; clients may tighten it with X-Request-Timeout)
+    PLAN_TRIP_DEADLINE_SECONDS = float(os.getenv("PLAN_TRIP_DEADLINE_SECONDS", 10))
+    
+    # Result Cache Configuration
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 900))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 512))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 16 * 1024 * 1024))
+    # Expired results are served for up to CACHE_STALE_SECONDS while refreshed in the background;
+    # entries in the last CACHE_REFRESH_AHEAD fraction of their TTL are refreshed ahead of expiry
+    CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", 3600))
+    CACHE_REFRESH_AHEAD = float(os.getenv("CACHE_REFRESH_AHEAD", 0.1))
+    
+    # Shared Cache Configuration (L2 behind the in-process caches: "sqlite", "redis" or "memory" for none)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()
+    CACHE_DB_PATH = os.getenv(
+        "CACHE_DB_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cache.sqlite3")
+    )
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+    CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "travel:")
+    CACHE_L2_MAX_ENTRIES = int(os.getenv("CACHE_L2_MAX_ENTRIES", 50000))
+    CACHE_L2_TIMEOUT_SECONDS = float(os.getenv("CACHE_L2_TIMEOUT_SECONDS", 0.25))
+    CACHE_L2_RETRY_SECONDS = float(os.getenv("CACHE_L2_RETRY_SECONDS", 5))
+    # In-process copies are re-checked against the shared cache after this long
+    CACHE_L1_TTL_SECONDS = float(os.getenv("CACHE_L1_TTL_SECONDS", 60))
+    
+    # Summary Cache Configuration
+    SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", 3600))
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", 256))
+    SUMMARY_CACHE_STALE_SECONDS = int(os.getenv("SUMMARY_CACHE_STALE_SECONDS", 6 * 3600))
+    SUMMARY_BUDGET_BUCKET = int(os.getenv("SUMMARY_BUDGET_BUCKET", 1000))
+    SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", 5))
+    
+    # Response Cache Configuration (serialized + compressed bodies)
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", 512))
+    
+    # POI Spatial Index Configuration
+    POI_INDEX_MAX_POINTS = int(os.getenv("POI_INDEX_MAX_POINTS", 200000))
+    
+    # POI Catalog Configuration (SQLite)
+    CATALOG_ENABLED = os.getenv("CATALOG_ENABLED", "true").lower() == "true"
+    CATALOG_DB_PATH = os.getenv(
+        "CATALOG_DB_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "poi_catalog.sqlite3")
+    )
+    CATALOG_FRESH_SECONDS = int(os.getenv("CATALOG_FRESH_SECONDS", 6 * 3600))
+    CATALOG_FALLBACK_MAX_AGE = int(os.getenv("CATALOG_FALLBACK_MAX_AGE", 30 * 24 * 3600))
+    
+    # Concurrency Configuration
+    STAGE_EXECUTOR_WORKERS = int(os.getenv("STAGE_EXECUTOR_WORKERS", 16))
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 8))
+    BATCH_MAX_DESTINATIONS = int(os.getenv("BATCH_MAX_DESTINATIONS", 50))
+    SEARCH_PAGE_WORKERS = int(os.getenv("SEARCH_PAGE_WORKERS", 8))
+    REFRESH_WORKERS = int(os.getenv("REFRESH_WORKERS", 4))
+    REFRESH_MAX_PENDING = int(os.getenv("REFRESH_MAX_PENDING", 64))
+    
+    # Pre-warm Configuration (configured + most requested destinations, at startup and every interval)
+    PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "false").lower() == "true"
+    PREWARM_DESTINATIONS = [
+        name.strip()
+        for name in os.getenv(
+            "PREWARM_DESTINATIONS",
+            "Australia,Singapore,Thailand,Bali,Japan,New Zealand,Nepal,Switzerland,Tibet,South Korea"
+        ).split(",")
+        if name.strip()
+    ]
+    PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", 20))
+    PREWARM_INTERVAL_SECONDS = float(os.getenv("PREWARM_INTERVAL_SECONDS", 300))
+    PREWARM_LIMIT = int(os.getenv("PREWARM_LIMIT", 5))
+    PREWARM_BUDGET = int(os.getenv("PREWARM_BUDGET", 20000))
+    # RapidAPI tokens every pre-warm call must leave in the bucket for user requests
+    PREWARM_MIN_TOKENS = float(os.getenv("PREWARM_MIN_TOKENS", 5))
+    
+    # Search Paging Configuration
+    SEARCH_MAX_PAGES = int(os.getenv("SEARCH_MAX_PAGES", 5))
+    
+    # HTTP Connection Pool Configuration
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 4))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+    OPENAI_POOL_MAXSIZE = int(os.getenv("OPENAI_POOL_MAXSIZE", 20))
+    HTTP_PRECONNECT = os.getenv("HTTP_PRECONNECT", "false").lower() == "true"
+    
+    # Metrics Configuration (Prometheus text format at /metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
     # Feature Flags
     USE_REAL_API = os.getenv("USE_REAL_API", "false").lower() == "true"
     
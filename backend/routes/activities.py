@@ -5,7 +5,11 @@ Fetches activity/adventure data for a given destination.
 
 from flask import Blueprint, jsonify, request
 from services.tripadvisor_service import get_activities
-from utils.helpers import log_request
+from services.records import dumps_records, is_fallback
+from services.prewarm import record_destination
+from utils.helpers import log_request, normalize_destination
+from utils.metrics import serialization_seconds
+from utils.response_cache import response_cache, to_response
 
 bp = Blueprint("activities", __name__)
 
@@ -22,6 +26,8 @@ def activities():
     
     Returns:
         JSON response with list of activities or error message.
+        Cached bodies are served gzip/brotli-encoded per Accept-Encoding with a
+        strong ETag; a matching If-None-Match gets 304 Not Modified.
     """
     log_request(request)
     
@@ -33,10 +39,23 @@ def activities():
     if not destination:
         return jsonify({"error": "Missing destination parameter"}), 400
     
+    record_destination(destination)
+    
+    # Serve the serialized, precompressed body when cached (304 if the client has it)
+    cache_key = ("activities", normalize_destination(destination), limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return to_response(cached, request)
+    
     try:
         # Fetch activities from service
         activities_data = get_activities(destination, limit=limit)
-        return jsonify(activities_data), 200
+        # Records encode straight to JSON, skipping jsonify key sorting and hooks
+        with serialization_seconds.time():
+            body = dumps_records(activities_data).encode("utf-8")
+            # Fallback data (upstream failed) is served but never cached
+            entry = response_cache.store(cache_key, body, cache=not is_fallback(activities_data))
+        return to_response(entry, request, "MISS")
     except Exception as e:
         return jsonify({"error": f"Failed to fetch activities: {str(e)}"}), 500
 
@@ -3,6 +3,16 @@ Health check route for monitoring API status.
 """
 
 from flask import Blueprint, jsonify
+from services.http_pool import get_pool_stats
+from services.openai_service import get_summary_cache_stats, openai_breaker
+from services.poi_catalog import get_catalog_stats
+from services.poi_index import poi_index
+from services.prewarm import prewarmer
+from services.tripadvisor_service import (
+    get_cache_stats, get_page_yield_stats, rapidapi_breaker, rapidapi_limiter
+)
+from utils.refresh import refresher
+from utils.response_cache import response_cache
 
 bp = Blueprint("health", __name__)
 
@@ -11,10 +21,26 @@ bp = Blueprint("health", __name__)
 def health_check():
     """
     Health check endpoint.
-    Returns API status for monitoring.
+    Returns API status, result cache counters, connection pool stats and
+    upstream circuit breaker states and pre-warm progress for monitoring.
     
     Returns:
-        JSON response with status "ok"
+        JSON response with status "ok", cache and connection pool statistics
     """
-    return jsonify({"status": "ok"}), 200
-
+    return jsonify({
+        "status": "ok",
+        "cache": get_cache_stats(),
+        "search_paging": get_page_yield_stats(),
+        "summary_cache": get_summary_cache_stats(),
+        "background_refresh": refresher.stats(),
+        "prewarm": prewarmer.stats(),
+        "response_cache": response_cache.stats(),
+        "http_pools": get_pool_stats(),
+        "rapidapi_rate_limit": rapidapi_limiter.stats(),
+        "circuit_breakers": {
+            "rapidapi": rapidapi_breaker.stats(),
+            "openai": openai_breaker.stats()
+        },
+        "poi_index": poi_index.stats(),
+        "poi_catalog": get_catalog_stats()
+    }), 200
@@ -0,0 +1,83 @@
+"""
+Metrics route for Prometheus scraping.
+Also times every Flask request (per route template) and exports the cache
+hit counters the services already keep.
+"""
+
+import time
+from flask import Blueprint, Response, g, request
+from config.settings import Config
+from services.openai_service import get_summary_cache_stats
+from services.tripadvisor_service import get_cache_stats
+from utils.metrics import CONTENT_TYPE, REGISTRY, request_seconds
+from utils.response_cache import response_cache
+
+bp = Blueprint("metrics", __name__)
+
+# Cache stats counter -> "result" label value
+CACHE_RESULTS = {"hits": "hit", "stale_hits": "stale_hit", "misses": "miss", "errors": "error"}
+
+
+@bp.before_app_request
+def start_timer():
+    """Remember when the request started."""
+    g.metrics_started = time.perf_counter()
+
+
+@bp.after_app_request
+def record_latency(response):
+    """
+    Observe the request latency under its route template (e.g. "/hotels"),
+    so histograms do not grow one series per URL.
+    """
+    started = g.get("metrics_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        request_seconds.observe(time.perf_counter() - started, route, request.method, response.status_code)
+    return response
+
+
+def _cache_metrics():
+    """
+    Scrape-time collector for the result, summary and response caches.
+
+    Returns:
+        list: Metric families of cache lookups per tier and outcome, and cached entries
+    """
+    lookups = []
+    entries = []
+    caches = {
+        "results": get_cache_stats(),
+        "summaries": get_summary_cache_stats(),
+        "responses": response_cache.stats()
+    }
+    for cache, stats in caches.items():
+        tiers = stats.get("tiers") or {"l1": stats}
+        for tier, tier_stats in tiers.items():
+            if tier_stats is None:
+                continue
+            for counter, result in CACHE_RESULTS.items():
+                if counter in tier_stats:
+                    lookups.append(({"cache": cache, "tier": tier, "result": result}, tier_stats[counter]))
+        entries.append(({"cache": cache, "tier": "l1"}, stats["entries"]))
+
+    return [
+        ("travel_cache_lookups_total", "counter", "Cache lookups by cache, tier and result.", lookups),
+        ("travel_cache_entries", "gauge", "Entries held in the in-process cache.", entries)
+    ]
+
+
+REGISTRY.register_collector(_cache_metrics)
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus metrics endpoint.
+
+    Returns:
+        Metrics in the Prometheus text exposition format, or 404 when disabled
+    """
+    if not Config.METRICS_ENABLED:
+        return Response("Metrics disabled\n", status=404, mimetype="text/plain")
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,67 @@
+"""
+Nearby route handler.
+Answers radius and k-nearest queries over every hotel and activity seen so far.
+"""
+
+from flask import Blueprint, jsonify, request
+from services.poi_index import POI_TYPES, poi_index
+from utils.helpers import log_request
+
+bp = Blueprint("nearby", __name__)
+
+
+@bp.route("/nearby", methods=["GET"])
+def nearby():
+    """
+    GET /nearby endpoint.
+    Finds known hotels/activities near a point without calling upstream APIs.
+    
+    Query Parameters:
+        lat (float): Required. Latitude in decimal degrees.
+        lng (float): Required. Longitude in decimal degrees.
+        radius_km (float): Optional. Search radius in km (default: 5, unbounded when k is given).
+        type (str): Optional. "hotel" or "activity" (default: both).
+        k (int): Optional. Return the k nearest POIs (within radius_km) instead of all in range.
+        limit (int): Optional. Maximum number of results for radius queries (default: 50).
+    
+    Returns:
+        JSON response with matching POIs sorted by distance, or error message.
+    """
+    log_request(request)
+    
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    radius_km = request.args.get("radius_km", type=float)
+    poi_type = request.args.get("type")
+    k = request.args.get("k", type=int)
+    limit = request.args.get("limit", 50, type=int)
+    
+    # Validate parameters
+    if lat is None or lng is None:
+        return jsonify({"error": "Missing lat/lng parameters"}), 400
+    
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return jsonify({"error": "Invalid lat/lng parameters"}), 400
+    
+    if "radius_km" in request.args and (radius_km is None or radius_km <= 0):
+        return jsonify({"error": "Invalid radius_km parameter"}), 400
+    
+    if poi_type is not None and poi_type not in POI_TYPES:
+        return jsonify({"error": f"Invalid type parameter (expected one of {', '.join(POI_TYPES)})"}), 400
+    
+    if k is not None:
+        if k <= 0:
+            return jsonify({"error": "Invalid k parameter"}), 400
+        results = poi_index.query_nearest(lat, lng, k, poi_type=poi_type, radius_km=radius_km)
+    else:
+        results = poi_index.query_radius(lat, lng, radius_km or 5.0, poi_type=poi_type, limit=limit)
+    
+    return jsonify({
+        "count": len(results),
+        "results": results
+    }), 200
+
+
+# Example curl commands:
+# curl "http://127.0.0.1:5000/nearby?lat=15.5&lng=73.8&radius_km=5&type=hotel"
+# curl "http://127.0.0.1:5000/nearby?lat=15.5&lng=73.8&radius_km=50&k=10"
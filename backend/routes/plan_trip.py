@@ -3,14 +3,53 @@ Plan trip route handler.
 Combines hotels, activities, and AI-generated summary for a complete trip plan.
 """
 
-from flask import Blueprint, jsonify, request
+import time
+from concurrent.futures import as_completed
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from config.settings import Config
 from services.tripadvisor_service import get_hotels, get_activities
-from services.openai_service import generate_ai_summary
-from utils.helpers import log_request
+from services.openai_service import stream_ai_summary
+from services.prewarm import record_destination
+from services.trip_planner import build_trip_plan, plan_cacheable
+from utils.concurrency import get_executor
+from utils.deadline import request_deadline
+from utils.helpers import format_sse, log_request, normalize_destination, timed
+from utils.metrics import serialization_seconds
+from utils.response_cache import response_cache, to_response
 
 bp = Blueprint("plan_trip", __name__)
 
 
+def _parse_plan_request():
+    """
+    Validates the JSON body shared by the plan trip endpoints.
+    
+    Returns:
+        tuple: ((destination, budget, limit), None) on success,
+               or (None, error response tuple) on invalid input
+    """
+    # Get request data
+    data = request.get_json(silent=True)
+    
+    # Validate required parameters
+    if not data:
+        return None, (jsonify({"error": "Missing request body"}), 400)
+    
+    destination = data.get("destination")
+    budget = data.get("budget")
+    limit = data.get("limit", 5)
+    
+    if not destination:
+        return None, (jsonify({"error": "Missing destination parameter"}), 400)
+    
+    if budget is None:
+        return None, (jsonify({"error": "Missing budget parameter"}), 400)
+    
+    record_destination(destination, budget)
+    
+    return (destination, budget, limit), None
+
+
 @bp.route("/plan_trip", methods=["POST"])
 def plan_trip():
     """
@@ -24,54 +63,124 @@ def plan_trip():
             "limit": 5  # Optional, default: 5
         }
     
+    Headers:
+        X-Request-Timeout: Optional time budget in seconds; can only shorten
+            Config.PLAN_TRIP_DEADLINE_SECONDS
+    
     Returns:
-        JSON response with destination, budget, hotels, activities, and AI summary.
+        JSON response with destination, budget, hotels, activities, AI summary,
+        and per-stage timings (milliseconds) under metadata. Repeat requests are
+        served from the response cache (precompressed, with the timings of the
+        original plan); being a POST, If-None-Match is not honoured.
+        When the deadline passes, the stages still outstanding are answered with
+        fallback data, "degraded" is true and the plan is not cached; neither
+        is a plan built on fallback hotels or activities after an upstream failure.
     """
     log_request(request)
     
-    # Get request data
-    data = request.get_json()
+    params, error = _parse_plan_request()
+    if error:
+        return error
+    destination, budget, limit = params
     
-    # Validate required parameters
-    if not data:
-        return jsonify({"error": "Missing request body"}), 400
+    cache_key = ("plan_trip", normalize_destination(destination), str(budget), str(limit))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return to_response(cached, request, conditional=False)
     
-    destination = data.get("destination")
-    budget = data.get("budget")
-    limit = data.get("limit", 5)
-    
-    if not destination:
-        return jsonify({"error": "Missing destination parameter"}), 400
-    
-    if budget is None:
-        return jsonify({"error": "Missing budget parameter"}), 400
+    deadline = request_deadline(request.headers.get("X-Request-Timeout"), Config.PLAN_TRIP_DEADLINE_SECONDS)
     
     try:
-        # Fetch hotels and activities
-        hotels_data = get_hotels(destination, limit=limit)
-        activities_data = get_activities(destination, limit=limit)
-        
-        # Generate AI summary
-        summary = generate_ai_summary(
-            destination=destination,
-            budget=budget,
-            hotels=hotels_data,
-            activities=activities_data
-        )
-        
         # Return complete trip plan
-        return jsonify({
-            "destination": destination,
-            "budget": budget,
-            "hotels": hotels_data,
-            "activities": activities_data,
-            "summary": summary
-        }), 200
+        plan = build_trip_plan(destination, budget, limit, deadline)
+        with serialization_seconds.time():
+            body = current_app.json.dumps(plan).encode("utf-8")
+            # Partial plans and fallback data: answer now, let the next request build the full one
+            entry = response_cache.store(cache_key, body, cache=plan_cacheable(plan))
+        return to_response(entry, request, "MISS", conditional=False)
         
     except Exception as e:
         return jsonify({"error": f"Failed to plan trip: {str(e)}"}), 500
 
 
+@bp.route("/plan_trip/stream", methods=["POST"])
+def plan_trip_stream():
+    """
+    POST /plan_trip/stream endpoint.
+    Streaming variant of /plan_trip using Server-Sent Events. Hotels and activities
+    are emitted as soon as each is ready, then the AI summary is streamed as it
+    is generated.
+    
+    Request Body (JSON):
+        Same as /plan_trip.
+    
+    Headers:
+        X-Request-Timeout: Same as /plan_trip; a summary that cannot start in time
+            is replaced by the default one, one running over it is cut short
+    
+    Events:
+        hotels:     list of hotels
+        activities: list of activities
+        summary:    {"text": "<chunk>"} for each summary chunk
+        done:       {"summary": "<full summary>", "metadata": {"timings": {...}}}
+        error:      {"error": "<message>"} if planning fails
+    
+    Returns:
+        text/event-stream response, or JSON error for invalid input.
+    """
+    log_request(request)
+    
+    params, error = _parse_plan_request()
+    if error:
+        return error
+    destination, budget, limit = params
+    
+    deadline = request_deadline(request.headers.get("X-Request-Timeout"), Config.PLAN_TRIP_DEADLINE_SECONDS)
+    
+    def generate():
+        started = time.perf_counter()
+        timings = {}
+        results = {}
+        
+        try:
+            # Emit each TripAdvisor stage as soon as it completes
+            executor = get_executor()
+            # Each stage gets its own view of the deadline, as in fetch_trip_data
+            hotels_deadline = deadline.child() if deadline is not None else None
+            activities_deadline = deadline.child() if deadline is not None else None
+            futures = {
+                executor.submit(timed, get_hotels, destination, limit=limit, deadline=hotels_deadline): "hotels",
+                executor.submit(timed, get_activities, destination, limit=limit, deadline=activities_deadline): "activities"
+            }
+            for future in as_completed(futures):
+                stage = futures[future]
+                results[stage], timings[f"{stage}_ms"] = future.result()
+                yield format_sse(stage, results[stage])
+            
+            # Stream the summary chunk by chunk
+            summary_started = time.perf_counter()
+            chunks = []
+            summary_deadline = deadline.child() if deadline is not None else None
+            for text in stream_ai_summary(
+                destination, budget, results["hotels"], results["activities"], summary_deadline
+            ):
+                chunks.append(text)
+                yield format_sse("summary", {"text": text})
+            timings["summary_ms"] = round((time.perf_counter() - summary_started) * 1000, 1)
+            timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            
+            yield format_sse("done", {"summary": "".join(chunks), "metadata": {"timings": timings}})
+            
+        except Exception as e:
+            yield format_sse("error", {"error": f"Failed to plan trip: {str(e)}"})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Example curl commands:
 # curl -X POST http://127.0.0.1:5000/plan_trip \
 #   -H "Content-Type: application/json" \
@@ -80,4 +189,7 @@ def plan_trip():
 # curl -X POST http://127.0.0.1:5000/plan_trip \
 #   -H "Content-Type: application/json" \
 #   -d '{"destination": "Goa", "budget": 20000, "limit": 5}'
-
+#
+# curl -N -X POST http://127.0.0.1:5000/plan_trip/stream \
+#   -H "Content-Type: application/json" \
+#   -d '{"destination": "Goa", "budget": 20000}'
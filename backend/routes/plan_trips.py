@@ -0,0 +1,146 @@
+"""
+Batch plan trip route handler.
+Plans trips for many destinations in one request.
+"""
+
+import json
+import time
+from concurrent.futures import as_completed
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from config.settings import Config
+from services.trip_planner import build_trip_plan, build_trip_plans
+from utils.concurrency import get_batch_executor
+from utils.helpers import json_default, log_request, normalize_destination
+
+bp = Blueprint("plan_trips", __name__)
+
+
+def _parse_destinations(data):
+    """
+    Normalizes and dedupes the destinations of a batch request.
+    Entries are duplicates when both destination and budget match.
+
+    Args:
+        data (dict): Request body
+
+    Returns:
+        tuple: (list of (destination, budget) tuples, None) on success,
+               or (None, error message) on invalid input
+    """
+    destinations = data.get("destinations")
+    default_budget = data.get("budget")
+
+    if not destinations or not isinstance(destinations, list):
+        return None, "Missing destinations parameter"
+
+    jobs = []
+    seen = set()
+    for entry in destinations:
+        # Entries are either "Goa" or {"destination": "Goa", "budget": 20000}
+        if isinstance(entry, dict):
+            destination = entry.get("destination")
+            budget = entry.get("budget", default_budget)
+        else:
+            destination = entry
+            budget = default_budget
+
+        if not destination or not isinstance(destination, str):
+            return None, "Invalid destination entry"
+        if budget is None:
+            return None, f"Missing budget parameter for {destination}"
+
+        # Same destination with another budget is a different plan
+        key = (normalize_destination(destination), str(budget).strip())
+        if key in seen:
+            continue
+        seen.add(key)
+        jobs.append((destination, budget))
+
+    if len(jobs) > Config.BATCH_MAX_DESTINATIONS:
+        return None, f"Too many destinations (max {Config.BATCH_MAX_DESTINATIONS})"
+
+    return jobs, None
+
+
+@bp.route("/plan_trips", methods=["POST"])
+def plan_trips():
+    """
+    POST /plan_trips endpoint.
+    Creates trip plans for many destinations concurrently (bounded by
+    BATCH_MAX_CONCURRENCY). Duplicate entries (same destination and budget)
+    are planned once. In the non-streaming mode summaries are generated with
+    batched completions.
+
+    Request Body (JSON):
+        {
+            "destinations": ["Goa", {"destination": "Manali", "budget": 30000}],
+            "budget": 20000,   # Default budget for plain string entries
+            "limit": 5,        # Optional, default: 5
+            "stream": false    # Optional, stream NDJSON in completion order
+        }
+
+    Returns:
+        JSON response with per-destination results and errors, or an
+        application/x-ndjson stream with one line per destination as it completes
+        when "stream" is true or the client accepts application/x-ndjson.
+    """
+    log_request(request)
+
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "Missing request body"}), 400
+
+    jobs, error = _parse_destinations(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    limit = data.get("limit", 5)
+    stream = data.get("stream") is True or request.accept_mimetypes.best == "application/x-ndjson"
+
+    started = time.perf_counter()
+
+    if stream:
+        executor = get_batch_executor()
+        futures = {
+            executor.submit(build_trip_plan, destination, budget, limit): destination
+            for destination, budget in jobs
+        }
+
+        def generate():
+            for future in as_completed(futures):
+                destination = futures[future]
+                try:
+                    line = {"destination": destination, "result": future.result()}
+                except Exception as e:
+                    line = {"destination": destination, "error": f"Failed to plan trip: {str(e)}"}
+                yield json.dumps(line, ensure_ascii=False, default=json_default) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    # Summaries for the whole batch are generated with batched completions
+    results = []
+    errors = []
+    for (destination, _), outcome in zip(jobs, build_trip_plans(jobs, limit)):
+        if isinstance(outcome, Exception):
+            errors.append({"destination": destination, "error": f"Failed to plan trip: {str(outcome)}"})
+        else:
+            results.append(outcome)
+
+    return jsonify({
+        "results": results,
+        "errors": errors,
+        "metadata": {
+            "destinations": len(jobs),
+            "total_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+    }), 200
+
+
+# Example curl commands:
+# curl -X POST http://127.0.0.1:5000/plan_trips \
+#   -H "Content-Type: application/json" \
+#   -d '{"destinations": ["Goa", "Manali", "goa"], "budget": 20000}'
+#
+# curl -N -X POST http://127.0.0.1:5000/plan_trips \
+#   -H "Content-Type: application/json" \
+#   -d '{"destinations": ["Goa", "Manali"], "budget": 20000, "stream": true}'
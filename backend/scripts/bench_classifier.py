@@ -0,0 +1,178 @@
+"""
+Micro-benchmark for the keyword classifier.
+Times the per-keyword .lower()/substring checks the search filters used to run
+against the KeywordClassifier-backed versions in tripadvisor_service, on a few
+thousand generated search candidates (repeating categories and destinations,
+mostly unique names, as in real search pages), and checks both agree.
+
+Usage (from backend/):
+    python scripts/bench_classifier.py [--candidates 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.tripadvisor_service import (
+    ALLOWED_ACTIVITY_CATEGORIES, BEACH_KEYWORDS, HOTEL_CATEGORIES, MOUNTAIN_KEYWORDS,
+    WATER_ACTIVITY_KEYWORDS, is_allowed_activity_category, is_beach_destination,
+    is_hotel_category, is_mountain_destination, is_water_activity
+)
+
+
+DESTINATIONS = [
+    "Goa", "Bali", "Manali", "Leh Ladakh", "Kathmandu, Nepal", "Phuket", "Maldives",
+    "Shimla Hills", "Annapurna Base Camp", "Jaipur", "Kerala Coast", "Singapore",
+    "Tokyo", "Swiss Alps", "Andaman Islands", "Mount Abu", "Rishikesh", "Udaipur"
+]
+
+CATEGORIES = [
+    ("hotel", "Hotel"), ("lodging", "Lodging"), ("resort", "Resort"), ("guest_house", "Guest House"),
+    ("attraction", "Attraction"), ("attraction", "Sights & Landmarks"), ("attraction", "Museums"),
+    ("attraction", "Nature & Parks"), ("attraction", "Historical Sites"), ("tour", "Tours"),
+    ("activity", "Outdoor Activities"), ("activity", "Water Sports"), ("activity", "Boat Tour"),
+    ("restaurant", "Restaurant"), ("restaurant", "Cafe"), ("shopping", "Shopping Mall"),
+    ("geo", "City"), ("geo", "Neighborhood")
+]
+
+NAME_PARTS = (
+    ["Grand", "Royal", "Sunset", "Old Town", "Blue", "Lakeview", "Himalayan", "Paradise", "Heritage", "Green"],
+    ["Palace", "Fort", "Beach", "Market", "Temple", "Garden", "Trek", "Diving Center", "Inn", "Cafe",
+     "Museum", "Kayaking Tour", "Resort & Spa", "Hostel", "Viewpoint", "Waterfall", "Peak", "Bazaar"]
+)
+
+
+def old_is_hotel_category(result_obj: dict) -> bool:
+    category = result_obj.get("category", {})
+    category_key = category.get("key", "").lower() if isinstance(category, dict) else str(category).lower()
+    category_name = category.get("name", "").lower() if isinstance(category, dict) else ""
+    for hotel_cat in HOTEL_CATEGORIES:
+        if hotel_cat in category_key:
+            return True
+    for hotel_cat in HOTEL_CATEGORIES:
+        if hotel_cat in category_name:
+            return True
+    name = result_obj.get("name", "").lower()
+    for hotel_cat in HOTEL_CATEGORIES:
+        if hotel_cat in name:
+            return True
+    return False
+
+
+def old_is_mountain_destination(destination: str) -> bool:
+    dest_lower = destination.lower()
+    return any(keyword in dest_lower for keyword in MOUNTAIN_KEYWORDS)
+
+
+def old_is_beach_destination(destination: str) -> bool:
+    dest_lower = destination.lower()
+    return any(keyword in dest_lower for keyword in BEACH_KEYWORDS)
+
+
+def old_is_water_activity(activity_name: str, category: str) -> bool:
+    name_lower = activity_name.lower()
+    category_lower = category.lower()
+    for keyword in WATER_ACTIVITY_KEYWORDS:
+        if keyword in name_lower or keyword in category_lower:
+            return True
+    return False
+
+
+def old_is_allowed_activity_category(category: str) -> bool:
+    category_lower = category.lower()
+    for allowed in ALLOWED_ACTIVITY_CATEGORIES:
+        if allowed.lower() in category_lower:
+            return True
+    return False
+
+
+def make_candidates(count: int, seed: int = 0) -> list[dict]:
+    """
+    Generate search candidates shaped like locations/search result objects.
+
+    Args:
+        count: Number of candidates
+        seed: Random seed
+
+    Returns:
+        List of dicts with name, category {key, name} and destination
+    """
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        key, name = rng.choice(CATEGORIES)
+        candidates.append({
+            "name": f"{rng.choice(NAME_PARTS[0])} {rng.choice(NAME_PARTS[1])} {i}",
+            "category": {"key": key, "name": name},
+            "destination": rng.choice(DESTINATIONS)
+        })
+    return candidates
+
+
+def workloads(candidates: list[dict]) -> dict:
+    """Per check: (old, new, argument tuples), mirroring the search filter call sites."""
+    categories = [c["category"]["name"] for c in candidates]
+    return {
+        "is_hotel_category": (old_is_hotel_category, is_hotel_category, [(c,) for c in candidates]),
+        "is_allowed_activity_category": (
+            old_is_allowed_activity_category, is_allowed_activity_category, [(c,) for c in categories]
+        ),
+        "is_water_activity": (
+            old_is_water_activity, is_water_activity, [(c["name"], c["category"]["name"]) for c in candidates]
+        ),
+        "is_mountain_destination": (
+            old_is_mountain_destination, is_mountain_destination, [(c["destination"],) for c in candidates]
+        ),
+        "is_beach_destination": (
+            old_is_beach_destination, is_beach_destination, [(c["destination"],) for c in candidates]
+        )
+    }
+
+
+def best_time(func, args_list: list[tuple], repeat: int) -> float:
+    """Best wall time in seconds of one pass of func over args_list."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the keyword classifier against per-keyword checks")
+    parser.add_argument("--candidates", type=int, default=5000, help="Number of generated candidates")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per check (best is reported)")
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.candidates)
+    print(f"[INFO] {len(candidates)} candidates, best of {args.repeat} passes")
+    print(f"{'check':<30} {'old us/call':>12} {'new us/call':>12} {'speedup':>8}")
+
+    mismatches = 0
+    total_old = total_new = 0.0
+    for name, (old, new, args_list) in workloads(candidates).items():
+        mismatches += sum(old(*a) != new(*a) for a in args_list)
+        old_seconds = best_time(old, args_list, args.repeat)
+        new_seconds = best_time(new, args_list, args.repeat)
+        total_old += old_seconds
+        total_new += new_seconds
+        per_call = 1e6 / len(args_list)
+        print(f"{name:<30} {old_seconds * per_call:>12.3f} {new_seconds * per_call:>12.3f} "
+              f"{old_seconds / new_seconds:>7.2f}x")
+
+    print(f"{'all checks':<30} {total_old * 1000:>10.2f}ms {total_new * 1000:>10.2f}ms "
+          f"{total_old / total_new:>7.2f}x")
+    if mismatches:
+        print(f"[ERROR] {mismatches} results differ between old and new checks")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
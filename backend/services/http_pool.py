@@ -0,0 +1,232 @@
+"""
+Process-wide HTTP connection pools for upstream APIs.
+Keeps persistent keep-alive sessions per upstream host (RapidAPI via requests,
+OpenAI via httpx) so short calls skip DNS, TCP and TLS setup.
+"""
+
+import asyncio
+import threading
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from openai import AsyncOpenAI, OpenAI
+from config.settings import Config
+
+
+PRECONNECT_TIMEOUT = 5
+
+_sessions = {}
+_openai_client = None
+_openai_stats = {"requests": 0, "connections_opened": 0}
+_lock = threading.Lock()
+
+# Async clients are bound to the event loop that created them
+_async_clients = weakref.WeakKeyDictionary()
+_async_openai_clients = weakref.WeakKeyDictionary()
+
+
+def get_session(host: str) -> requests.Session:
+    """
+    Return the persistent requests session for an upstream host.
+
+    Args:
+        host: Upstream host name (e.g. "travel-advisor.p.rapidapi.com")
+
+    Returns:
+        requests.Session with a keep-alive connection pool sized by Config.HTTP_POOL_MAXSIZE
+    """
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+    return session
+
+
+def _trace_openai_connection(event_name, info):
+    """httpcore trace callback counting newly opened OpenAI connections."""
+    if event_name == "connection.connect_tcp.complete":
+        with _lock:
+            _openai_stats["connections_opened"] += 1
+
+
+def _on_openai_request(request):
+    """httpx request hook that counts requests and attaches the connection tracer."""
+    request.extensions["trace"] = _trace_openai_connection
+    with _lock:
+        _openai_stats["requests"] += 1
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Return the shared OpenAI client backed by a pooled httpx client.
+
+    Returns:
+        OpenAI client reusing keep-alive connections across calls
+    """
+    global _openai_client
+    if _openai_client is not None:
+        return _openai_client
+
+    with _lock:
+        if _openai_client is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=Config.OPENAI_POOL_MAXSIZE,
+                    max_keepalive_connections=Config.OPENAI_POOL_MAXSIZE
+                ),
+                event_hooks={"request": [_on_openai_request]}
+            )
+            _openai_client = OpenAI(
+                api_key=Config.OPENAI_API_KEY,
+                base_url=Config.OPENAI_BASE_URL,
+                timeout=Config.OPENAI_TIMEOUT_SECONDS,
+                http_client=http_client
+            )
+    return _openai_client
+
+
+def get_openai_host() -> str:
+    """
+    Return the host the OpenAI client talks to (OPENAI_BASE_URL, a proxy or
+    Azure endpoint, or api.openai.com by default).
+
+    Returns:
+        Host name, with the port when it is not the scheme default
+    """
+    return get_openai_client().base_url.netloc.decode("ascii")
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the pooled async HTTP client for the running event loop.
+
+    Returns:
+        httpx.AsyncClient with keep-alive limits sized by Config.HTTP_POOL_MAXSIZE
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=Config.HTTP_POOL_MAXSIZE
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Return the pooled AsyncOpenAI client for the running event loop.
+
+    Returns:
+        AsyncOpenAI client reusing keep-alive connections across calls
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.OPENAI_POOL_MAXSIZE,
+                max_keepalive_connections=Config.OPENAI_POOL_MAXSIZE
+            )
+        )
+        client = AsyncOpenAI(
+                api_key=Config.OPENAI_API_KEY,
+                base_url=Config.OPENAI_BASE_URL,
+                timeout=Config.OPENAI_TIMEOUT_SECONDS,
+                http_client=http_client
+            )
+        _async_openai_clients[loop] = client
+    return client
+
+
+def preconnect() -> None:
+    """
+    Open pooled connections to the configured upstream hosts ahead of the first request.
+    Failures are logged and ignored; the pools simply start cold.
+    """
+    if Config.USE_REAL_API and Config.RAPIDAPI_KEY:
+        try:
+            get_session(Config.RAPIDAPI_HOST).head(
+                f"https://{Config.RAPIDAPI_HOST}/", timeout=PRECONNECT_TIMEOUT
+            )
+            print(f"[INFO] Pre-connected to {Config.RAPIDAPI_HOST}")
+        except requests.exceptions.RequestException as e:
+            print(f"[WARNING] Pre-connect to {Config.RAPIDAPI_HOST} failed: {str(e)}")
+
+    if Config.OPENAI_API_KEY:
+        # Warm the same origin the client sends completions to
+        base_url = get_openai_client().base_url
+        host = get_openai_host()
+        try:
+            get_openai_client()._client.head(f"{base_url.scheme}://{host}/", timeout=PRECONNECT_TIMEOUT)
+            print(f"[INFO] Pre-connected to {host}")
+        except httpx.HTTPError as e:
+            print(f"[WARNING] Pre-connect to {host} failed: {str(e)}")
+
+
+def start_preconnect() -> None:
+    """Run preconnect() in a background thread so startup is not blocked."""
+    threading.Thread(target=preconnect, name="http-preconnect", daemon=True).start()
+
+
+def get_pool_stats() -> dict:
+    """
+    Return per-pool connection statistics.
+
+    Returns:
+        Dict keyed by upstream host with connections opened, requests, reused and idle counts
+    """
+    stats = {}
+
+    with _lock:
+        sessions = list(_sessions.items())
+
+    for host, session in sessions:
+        opened = 0
+        requests_made = 0
+        idle = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                requests_made += pool.num_requests
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        stats[host] = {
+            "connections_opened": opened,
+            "requests": requests_made,
+            "reused": max(requests_made - opened, 0),
+            "idle": idle
+        }
+
+    if _openai_client is not None:
+        with _lock:
+            opened = _openai_stats["connections_opened"]
+            requests_made = _openai_stats["requests"]
+        transport_pool = getattr(getattr(_openai_client._client, "_transport", None), "_pool", None)
+        connections = getattr(transport_pool, "connections", [])
+        stats[get_openai_host()] = {
+            "connections_opened": opened,
+            "requests": requests_made,
+            "reused": max(requests_made - opened, 0),
+            "idle": sum(1 for conn in connections if conn.is_idle())
+        }
+
+    return stats
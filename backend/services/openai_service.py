@@ -2,19 +2,204 @@
 OpenAI service for generating AI-powered travel summaries and itineraries.
 """
 
-from openai import OpenAI
+import asyncio
+import hashlib
+import json
+import time
+from openai import APITimeoutError
 from config.settings import Config
+from services.http_pool import get_async_openai_client, get_openai_client
+from utils.cache_backend import get_shared_backend
+from utils.circuit_breaker import CircuitBreaker
+from utils.concurrency import get_batch_executor
+from utils.deadline import Deadline, time_left
+from utils.helpers import normalize_destination
+from utils.metrics import stage_seconds, upstream_responses
+from utils.refresh import refresher
+from utils.singleflight import AsyncSingleFlight, SingleFlight
+from utils.tiered_cache import TieredCache
 
 
-def generate_ai_summary(destination, budget, hotels, activities):
+# A completion is not started with less time than this before the request deadline
+MIN_SUMMARY_SECONDS = 1.0
+
+# Cache of generated summaries keyed by a fingerprint of the prompt inputs;
+# shared between worker processes through the L2 backend. Stale summaries are
+# served while being regenerated in the background
+_summary_cache = TieredCache(
+    "summaries",
+    backend=get_shared_backend(),
+    l1_ttl=Config.CACHE_L1_TTL_SECONDS,
+    max_entries=Config.SUMMARY_CACHE_MAX_ENTRIES,
+    default_ttl=Config.SUMMARY_CACHE_TTL_SECONDS,
+    stale_ttl=Config.SUMMARY_CACHE_STALE_SECONDS,
+    refresh_ahead=Config.CACHE_REFRESH_AHEAD
+)
+
+# Coalesces concurrent generations for the same fingerprint
+_inflight_summaries = SingleFlight()
+_async_inflight_summaries = AsyncSingleFlight()
+
+# Trips on OpenAI errors or slow completions; while open, the default summary is used
+openai_breaker = CircuitBreaker(
+    "openai",
+    failure_ratio=Config.BREAKER_FAILURE_RATIO,
+    min_calls=Config.BREAKER_MIN_CALLS,
+    window_seconds=Config.BREAKER_WINDOW_SECONDS,
+    slow_call_seconds=Config.OPENAI_SLOW_CALL_SECONDS,
+    open_seconds=Config.BREAKER_OPEN_SECONDS,
+    half_open_calls=Config.BREAKER_HALF_OPEN_CALLS,
+    enabled=Config.BREAKER_ENABLED
+)
+
+
+# Completion latency (time to the last token for streamed completions)
+_openai_seconds = stage_seconds.labels("openai_call")
+
+
+def _record_openai_call(started, error=None):
+    """
+    Records the duration and outcome of one completion call.
+    
+    Args:
+        started (float): perf_counter() value when the call started
+        error (Exception): The exception the call failed with, or None on success
+    """
+    _openai_seconds.observe(time.perf_counter() - started)
+    if error is None:
+        status = 200
+    elif isinstance(error, APITimeoutError):
+        status = "timeout"
+    else:
+        status = getattr(error, "status_code", None) or "error"
+    upstream_responses.inc("openai", status)
+
+
+def bucket_budget(budget):
+    """
+    Rounds a budget down to its cache bucket so near-identical budgets share summaries.
+    
+    Args:
+        budget: Travel budget (int, float or numeric string)
+    
+    Returns:
+        Bucketed budget as int, or the original value if it is not numeric
+    """
+    bucket = Config.SUMMARY_BUDGET_BUCKET
+    try:
+        value = int(float(budget))
+    except (ValueError, TypeError):
+        return budget
+    return value // bucket * bucket if bucket > 0 else value
+
+
+def summary_fingerprint(destination, budget, hotels, activities):
+    """
+    Builds a stable fingerprint of the inputs that shape the summary prompt.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+    
+    Returns:
+        str: Hex digest identifying the prompt inputs
+    """
+    payload = {
+        "destination": normalize_destination(destination),
+        "budget": bucket_budget(budget),
+        "hotels": [[h.get("name"), h.get("rating"), h.get("price")] for h in hotels[:3]],
+        "activities": [[a.get("name"), a.get("rating"), a.get("category")] for a in activities[:3]]
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_summary_cache_stats():
+    """
+    Returns hit/miss/eviction counters for the summary cache.
+    
+    Returns:
+        dict: Cache statistics plus coalesced generation counts
+    """
+    stats = _summary_cache.stats()
+    stats["coalesced"] = _inflight_summaries.stats()["coalesced"]
+    return stats
+
+
+def _cached_summary(key, destination, budget, hotels, activities):
+    """
+    Looks up a cached summary, scheduling a background regeneration if it is
+    stale or close to expiry.
+    
+    Args:
+        key (str): Summary fingerprint
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+    
+    Returns:
+        str: Cached summary, or None on a miss
+    """
+    summary, refresh = _summary_cache.get_stale(key)
+    if summary is None:
+        return None
+    
+    def regenerate():
+        result = _request_summary(destination, budget, hotels, activities)
+        if result:
+            _summary_cache.set(key, result)
+    
+    if refresh and refresher.schedule(("summary", key), regenerate):
+        print(f"[CACHE] Hit for summary of {destination}, refreshing in background")
+    else:
+        print(f"[CACHE] Hit for summary of {destination}")
+    return summary
+
+
+def warm_summary(destination, budget, hotels, activities):
+    """
+    Makes sure a fresh summary is cached for these inputs (used by the pre-warmer).
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+    
+    Returns:
+        bool: True if a fresh summary is cached, False if generation failed,
+              None if no OpenAI API key is configured
+    """
+    if not Config.OPENAI_API_KEY:
+        return None
+    
+    key = summary_fingerprint(destination, budget, hotels, activities)
+    if not _summary_cache.refresh_due(key):
+        return True
+    
+    summary = _request_summary(destination, budget, hotels, activities)
+    if not summary:
+        return False
+    _summary_cache.set(key, summary)
+    return True
+
+
+def generate_ai_summary(destination, budget, hotels, activities, deadline=None):
     """
     Generates an AI-powered travel summary and itinerary using OpenAI GPT.
+    Summaries are cached by a fingerprint of the prompt inputs (with the budget
+    bucketed) and identical in-flight generations are coalesced.
     
     Args:
         destination (str): Destination name
         budget (int): Travel budget in local currency
         hotels (list): List of hotel dictionaries
         activities (list): List of activity dictionaries
+        deadline (Deadline): Optional request deadline; the OpenAI call's timeout is
+            shrunk to fit it and the default summary is returned once it passes
     
     Returns:
         str: AI-generated travel summary and itinerary
@@ -24,23 +209,266 @@ def generate_ai_summary(destination, budget, hotels, activities):
         print("[WARNING] OpenAI API key not found, returning default summary")
         return _get_default_summary(destination, budget, hotels, activities)
     
-    try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=Config.OPENAI_API_KEY)
+    key = summary_fingerprint(destination, budget, hotels, activities)
+    summary = _cached_summary(key, destination, budget, hotels, activities)
+    if summary is not None:
+        return summary
+    
+    def generate():
+        result = _request_summary(destination, budget, hotels, activities, deadline)
+        if result:
+            _summary_cache.set(key, result)
+        return result
+    
+    summary = _inflight_summaries.do(key, generate)
+    if not summary:
+        print("[INFO] Returning default summary")
+        return _get_default_summary(destination, budget, hotels, activities)
+    return summary
+
+
+def generate_ai_summaries(trips):
+    """
+    Generates summaries for several destinations, packing uncached ones into
+    batched completions of up to SUMMARY_BATCH_SIZE destinations each.
+    Destinations whose batched output cannot be parsed fall back to individual
+    generate_ai_summary calls, run concurrently on the batch executor and bounded
+    together by one OPENAI_TIMEOUT_SECONDS deadline. When a batched call fails
+    as a whole its destinations get the default summary.
+    
+    Args:
+        trips (list): List of dicts with destination, budget, hotels and activities
+    
+    Returns:
+        list: Summary string per trip, in input order
+    """
+    if not Config.OPENAI_API_KEY:
+        print("[WARNING] OpenAI API key not found, returning default summaries")
+        return [_get_default_summary(**trip) for trip in trips]
+    
+    summaries = [None] * len(trips)
+    pending = []
+    for index, trip in enumerate(trips):
+        key = summary_fingerprint(**trip)
+        cached = _cached_summary(key, **trip)
+        if cached is not None:
+            summaries[index] = cached
+        else:
+            pending.append((index, key))
+    
+    unparsed = []
+    batch_size = max(Config.SUMMARY_BATCH_SIZE, 1)
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        print(f"[INFO] Generating {len(chunk)} summaries in one batched completion")
+        results = _request_batch_summaries([trips[index] for index, _ in chunk])
         
-        # Format hotels and activities for the prompt
-        hotels_text = "\n".join([
-            f"- {h.get('name', 'Unknown')} (Rating: {h.get('rating', 0)}/5, Price: {h.get('price', 'N/A')})"
-            for h in hotels[:3]
-        ])
+        if results is None:
+            # The upstream failed; individual calls would most likely fail the same way
+            for index, _ in chunk:
+                summaries[index] = _get_default_summary(**trips[index])
+            continue
+        
+        for (index, key), summary in zip(chunk, results):
+            if summary:
+                _summary_cache.set(key, summary)
+                summaries[index] = summary
+            else:
+                unparsed.append(index)
+    
+    if unparsed:
+        # Individual calls for unparseable entries, concurrently and under one deadline
+        deadline = Deadline(Config.OPENAI_TIMEOUT_SECONDS)
+        executor = get_batch_executor()
+        futures = [
+            (index, executor.submit(generate_ai_summary, deadline=deadline.child(), **trips[index]))
+            for index in unparsed
+        ]
+        for index, future in futures:
+            try:
+                summaries[index] = future.result()
+            except Exception as e:
+                print(f"[ERROR] Failed to generate AI summary: {str(e)}")
+                summaries[index] = _get_default_summary(**trips[index])
+    
+    return summaries
+
+
+async def async_generate_ai_summary(destination, budget, hotels, activities, deadline=None):
+    """
+    Async equivalent of generate_ai_summary, sharing its summary cache.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget in local currency
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+        deadline (Deadline): Optional request deadline
+    
+    Returns:
+        str: AI-generated travel summary and itinerary
+    """
+    if not Config.OPENAI_API_KEY:
+        print("[WARNING] OpenAI API key not found, returning default summary")
+        return _get_default_summary(destination, budget, hotels, activities)
+    
+    key = summary_fingerprint(destination, budget, hotels, activities)
+    # Fresh in-process hits inline; the shared cache backend is only read and
+    # written from a worker thread so it never blocks the event loop
+    summary = _summary_cache.get_local(key)
+    if summary is not None:
+        print(f"[CACHE] Hit for summary of {destination}")
+        return summary
+    summary = await asyncio.to_thread(_cached_summary, key, destination, budget, hotels, activities)
+    if summary is not None:
+        return summary
+    
+    async def generate():
+        result = await _async_request_summary(destination, budget, hotels, activities, deadline)
+        if result:
+            await asyncio.to_thread(_summary_cache.set, key, result)
+        return result
+    
+    summary = await _async_inflight_summaries.do(key, generate)
+    if not summary:
+        print("[INFO] Returning default summary")
+        return _get_default_summary(destination, budget, hotels, activities)
+    return summary
+
+
+def stream_ai_summary(destination, budget, hotels, activities, deadline=None):
+    """
+    Streams an AI-generated travel summary as text chunks as they arrive from OpenAI.
+    A cached summary is yielded in one chunk. If the call fails or misses the
+    deadline before any text is produced, the default summary is yielded instead;
+    a stream cut short by the deadline after that just ends (and is not cached).
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget in local currency
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+        deadline (Deadline): Optional request deadline; the OpenAI call's timeout is
+            shrunk to fit it and the stream is stopped once it passes
+    
+    Yields:
+        str: Summary text chunks
+    """
+    if not Config.OPENAI_API_KEY:
+        print("[WARNING] OpenAI API key not found, returning default summary")
+        yield _get_default_summary(destination, budget, hotels, activities)
+        return
+    
+    key = summary_fingerprint(destination, budget, hotels, activities)
+    summary = _cached_summary(key, destination, budget, hotels, activities)
+    if summary is not None:
+        yield summary
+        return
+    
+    if not _summary_fits(deadline):
+        yield _get_default_summary(destination, budget, hotels, activities)
+        return
+    
+    if not openai_breaker.allow():
+        print("[WARNING] OpenAI circuit open, returning default summary")
+        yield _get_default_summary(destination, budget, hotels, activities)
+        return
+    
+    chunks = []
+    started = time.perf_counter()
+    try:
+        client = _within_deadline(get_openai_client(), deadline)
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner AI assistant."},
+                {"role": "user", "content": _build_prompt(destination, budget, hotels, activities)}
+            ],
+            max_tokens=300,
+            temperature=0.7,
+            stream=True
+        )
         
-        activities_text = "\n".join([
-            f"- {a.get('name', 'Unknown')} (Rating: {a.get('rating', 0)}/5, Category: {a.get('category', 'Adventure')})"
-            for a in activities[:3]
-        ])
+        for chunk in stream:
+            # The timeout bounds each read, not the whole stream
+            if deadline is not None and deadline.expired:
+                stream.response.close()
+                raise TimeoutError("deadline passed while streaming")
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                # Drop leading whitespace like the non-streaming path's strip()
+                if not chunks:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                chunks.append(text)
+                yield text
         
-        # Create the prompt
-        prompt = f"""You are a helpful travel planner AI.
+    except GeneratorExit:
+        # Client disconnected mid-stream: no verdict on OpenAI, free the trial slot
+        openai_breaker.release()
+        raise
+    except Exception as e:
+        print(f"[ERROR] Failed to stream AI summary: {str(e)}")
+        _record_summary_failure(deadline)
+        _record_openai_call(started, e)
+        if not chunks:
+            print("[INFO] Returning default summary")
+            yield _get_default_summary(destination, budget, hotels, activities)
+        return
+    
+    openai_breaker.record_success(time.perf_counter() - started)
+    _record_openai_call(started)
+    summary = "".join(chunks).strip()
+    if summary:
+        _summary_cache.set(key, summary)
+    else:
+        yield _get_default_summary(destination, budget, hotels, activities)
+
+
+def _format_trip_data(hotels, activities):
+    """
+    Formats the top hotels and activities as bullet lists for a prompt.
+    
+    Args:
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+    
+    Returns:
+        tuple: (hotels_text, activities_text)
+    """
+    hotels_text = "\n".join([
+        f"- {h.get('name', 'Unknown')} (Rating: {h.get('rating', 0)}/5, Price: {h.get('price', 'N/A')})"
+        for h in hotels[:3]
+    ])
+    
+    activities_text = "\n".join([
+        f"- {a.get('name', 'Unknown')} (Rating: {a.get('rating', 0)}/5, Category: {a.get('category', 'Adventure')})"
+        for a in activities[:3]
+    ])
+    
+    return hotels_text, activities_text
+
+
+def _build_prompt(destination, budget, hotels, activities):
+    """
+    Builds the user prompt for the travel summary.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+    
+    Returns:
+        str: Prompt text
+    """
+    # Format hotels and activities for the prompt
+    hotels_text, activities_text = _format_trip_data(hotels, activities)
+    
+    return f"""You are a helpful travel planner AI.
 Based on this data, create a short travel summary for {destination} under a budget of ₹{budget}.
 Mention 2-3 top hotels and 2-3 interesting activities.
 Then suggest a 3-day itinerary in bullet points.
@@ -54,24 +482,257 @@ Activities:
 
 Provide a concise, engaging summary with a 3-day itinerary."""
 
+
+def _build_batch_prompt(trips):
+    """
+    Builds one prompt asking for summaries of several destinations as JSON.
+    
+    Args:
+        trips (list): List of dicts with destination, budget, hotels and activities
+    
+    Returns:
+        str: Prompt text; trip i is labelled with id i + 1
+    """
+    sections = []
+    for index, trip in enumerate(trips, start=1):
+        hotels_text, activities_text = _format_trip_data(trip["hotels"], trip["activities"])
+        sections.append(f"""Destination {index}: {trip["destination"]} (budget ₹{trip["budget"]})
+Hotels:
+{hotels_text}
+
+Activities:
+{activities_text}""")
+    
+    trips_text = "\n\n".join(sections)
+    
+    return f"""You are a helpful travel planner AI.
+For each destination below, create a short travel summary under its budget.
+Mention 2-3 top hotels and 2-3 interesting activities.
+Then suggest a 3-day itinerary in bullet points.
+Keep each summary under 150 words.
+
+{trips_text}
+
+Respond with a JSON object of the form
+{{"summaries": [{{"id": <destination number>, "summary": "<summary text>"}}]}}
+with exactly one entry per destination."""
+
+
+def _parse_batch_summaries(content, count):
+    """
+    Splits a batched completion back into per-destination summaries.
+    
+    Args:
+        content (str): Completion text (expected to be the JSON object requested)
+        count (int): Number of destinations in the batch
+    
+    Returns:
+        list: Summary string per destination, or None where it could not be parsed
+    """
+    summaries = [None] * count
+    try:
+        entries = json.loads(content).get("summaries", [])
+    except (ValueError, TypeError, AttributeError):
+        return summaries
+    
+    if not isinstance(entries, list):
+        return summaries
+    
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id")) - 1
+        except (ValueError, TypeError):
+            continue
+        summary = entry.get("summary")
+        if 0 <= index < count and isinstance(summary, str) and summary.strip():
+            summaries[index] = summary.strip()
+    
+    return summaries
+
+
+def _request_batch_summaries(trips):
+    """
+    Calls the OpenAI chat completion API once for several destinations.
+    
+    Args:
+        trips (list): List of dicts with destination, budget, hotels and activities
+    
+    Returns:
+        list: Summary string per trip, or None where parsing failed; None instead
+              of a list if the call itself failed or the circuit is open
+    """
+    if not openai_breaker.allow():
+        print("[WARNING] OpenAI circuit open, skipping batched summaries")
+        return None
+    
+    started = time.perf_counter()
+    try:
+        client = get_openai_client()
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner AI assistant."},
+                {"role": "user", "content": _build_batch_prompt(trips)}
+            ],
+            max_tokens=300 * len(trips),
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        openai_breaker.record_success(time.perf_counter() - started)
+        _record_openai_call(started)
+        return _parse_batch_summaries(response.choices[0].message.content, len(trips))
+        
+    except Exception as e:
+        print(f"[ERROR] Failed to generate batched AI summaries: {str(e)}")
+        openai_breaker.record_failure()
+        _record_openai_call(started, e)
+        return None
+
+
+def _within_deadline(client, deadline):
+    """
+    Bounds a pooled client's per-call timeout by the request deadline.
+    
+    Args:
+        client: OpenAI or AsyncOpenAI client
+        deadline (Deadline): Request deadline, or None
+    
+    Returns:
+        The client, or a copy sharing its connection pool with the timeout shrunk
+        and retries disabled (they could not fit)
+    """
+    if deadline is None:
+        return client
+    return client.with_options(timeout=time_left(deadline, Config.OPENAI_TIMEOUT_SECONDS), max_retries=0)
+
+
+def _summary_fits(deadline):
+    """
+    Checks whether a completion can still be started before the deadline.
+    
+    Args:
+        deadline (Deadline): Request deadline, or None
+    
+    Returns:
+        bool: False if too little time is left
+    """
+    if time_left(deadline, MIN_SUMMARY_SECONDS) < MIN_SUMMARY_SECONDS:
+        deadline.note_missed("skipping AI summary")
+        return False
+    return True
+
+
+def _record_summary_failure(deadline):
+    """
+    Records a failed completion, unless it only failed because the deadline cut
+    it short (then the breaker slot is released without a verdict).
+    
+    Args:
+        deadline (Deadline): Request deadline, or None
+    """
+    if deadline is not None and deadline.expired:
+        deadline.note_missed("AI summary cut short")
+        openai_breaker.release()
+    else:
+        openai_breaker.record_failure()
+
+
+def _request_summary(destination, budget, hotels, activities, deadline=None):
+    """
+    Calls the OpenAI chat completion API for a travel summary.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+        deadline (Deadline): Optional request deadline
+    
+    Returns:
+        str: Generated summary, or None if the call failed or did not fit the deadline
+    """
+    if not _summary_fits(deadline):
+        return None
+    
+    if not openai_breaker.allow():
+        print("[WARNING] OpenAI circuit open, skipping summary request")
+        return None
+    
+    started = time.perf_counter()
+    try:
+        # Reuse the pooled OpenAI client
+        client = _within_deadline(get_openai_client(), deadline)
+        
         # Call OpenAI API
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are an expert travel planner AI assistant."},
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": _build_prompt(destination, budget, hotels, activities)}
             ],
             max_tokens=300,
             temperature=0.7
         )
+        openai_breaker.record_success(time.perf_counter() - started)
+        _record_openai_call(started)
         
-        summary = response.choices[0].message.content.strip()
-        return summary
+        return response.choices[0].message.content.strip()
         
     except Exception as e:
         print(f"[ERROR] Failed to generate AI summary: {str(e)}")
-        print("[INFO] Returning default summary")
-        return _get_default_summary(destination, budget, hotels, activities)
+        _record_summary_failure(deadline)
+        _record_openai_call(started, e)
+        return None
+
+
+async def _async_request_summary(destination, budget, hotels, activities, deadline=None):
+    """
+    Async equivalent of _request_summary.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget
+        hotels (list): List of hotel dictionaries
+        activities (list): List of activity dictionaries
+        deadline (Deadline): Optional request deadline
+    
+    Returns:
+        str: Generated summary, or None if the call failed or did not fit the deadline
+    """
+    if not _summary_fits(deadline):
+        return None
+    
+    if not openai_breaker.allow():
+        print("[WARNING] OpenAI circuit open, skipping summary request")
+        return None
+    
+    started = time.perf_counter()
+    try:
+        client = _within_deadline(get_async_openai_client(), deadline)
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert travel planner AI assistant."},
+                {"role": "user", "content": _build_prompt(destination, budget, hotels, activities)}
+            ],
+            max_tokens=300,
+            temperature=0.7
+        )
+        openai_breaker.record_success(time.perf_counter() - started)
+        _record_openai_call(started)
+        
+        return response.choices[0].message.content.strip()
+        
+    except asyncio.CancelledError:
+        openai_breaker.release()
+        raise
+    except Exception as e:
+        print(f"[ERROR] Failed to generate AI summary: {str(e)}")
+        _record_summary_failure(deadline)
+        _record_openai_call(started, e)
+        return None
 
 
 def _get_default_summary(destination, budget, hotels, activities):
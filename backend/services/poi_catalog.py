@@ -0,0 +1,199 @@
+"""
+Persistent local POI catalog backed by SQLite.
+Stores every normalized hotel and activity returned by tripadvisor_service so
+results survive restarts, can be served while fresh, and act as a warm offline
+fallback when RapidAPI is unavailable.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from config.settings import Config
+from utils.helpers import json_default, normalize_destination
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pois (
+    destination TEXT NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating REAL,
+    lat REAL,
+    lng REAL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (destination, type, name)
+);
+CREATE INDEX IF NOT EXISTS idx_pois_destination_type ON pois (destination, type, updated_at, position);
+CREATE INDEX IF NOT EXISTS idx_pois_type_rating ON pois (type, rating);
+CREATE INDEX IF NOT EXISTS idx_pois_coordinates ON pois (lat, lng);
+
+CREATE TABLE IF NOT EXISTS fetches (
+    destination TEXT NOT NULL,
+    type TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (destination, type)
+);
+"""
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """
+    Return this thread's connection to the catalog database, creating the schema on first use.
+
+    Returns:
+        sqlite3.Connection, or None if the catalog is disabled or unavailable
+    """
+    if not Config.CATALOG_ENABLED:
+        return None
+
+    path = Config.CATALOG_DB_PATH
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path:
+        return conn
+
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _schema_lock:
+            if path not in _schema_ready:
+                conn.executescript(SCHEMA)
+                _schema_ready.add(path)
+    except sqlite3.Error as e:
+        print(f"[WARNING] POI catalog unavailable: {str(e)}")
+        return None
+
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def upsert_pois(destination: str, poi_type: str, pois: list[dict]) -> None:
+    """
+    Insert or update normalized POIs for a destination and mark it as freshly fetched.
+
+    Args:
+        destination: Destination name
+        poi_type: "hotel" or "activity"
+        pois: Hotel or activity dictionaries in ranked order
+    """
+    conn = _connect()
+    if conn is None or not pois:
+        return
+
+    key = normalize_destination(destination)
+    now = time.time()
+    rows = []
+    for position, poi in enumerate(pois):
+        rating = poi.get("rating")
+        coords = poi.get("coordinates") or {}
+        rows.append((
+            key, poi_type, poi.get("name", ""),
+            rating if isinstance(rating, (int, float)) else None,
+            coords.get("lat"), coords.get("lng"),
+            position, json.dumps(poi, ensure_ascii=False, default=json_default), now
+        ))
+
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO pois (destination, type, name, rating, lat, lng, position, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (destination, type, name) DO UPDATE SET
+                    rating = excluded.rating, lat = excluded.lat, lng = excluded.lng,
+                    position = excluded.position, data = excluded.data, updated_at = excluded.updated_at
+                """,
+                rows
+            )
+            conn.execute(
+                """
+                INSERT INTO fetches (destination, type, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT (destination, type) DO UPDATE SET fetched_at = excluded.fetched_at
+                """,
+                (key, poi_type, now)
+            )
+    except sqlite3.Error as e:
+        print(f"[WARNING] Failed to update POI catalog: {str(e)}")
+
+
+def get_pois(destination: str, poi_type: str, limit: int, max_age: Optional[float] = None) -> Optional[list[dict]]:
+    """
+    Read catalogued POIs for a destination, most recently fetched first.
+
+    Args:
+        destination: Destination name
+        poi_type: "hotel" or "activity"
+        limit: Number of POIs required
+        max_age: Maximum age in seconds of the last fetch (None accepts any age)
+
+    Returns:
+        List of exactly limit POI dictionaries, or None if the catalog has
+        fewer entries or the last fetch is older than max_age
+    """
+    conn = _connect()
+    if conn is None or limit <= 0:
+        return None
+
+    key = normalize_destination(destination)
+    try:
+        fetched = conn.execute(
+            "SELECT fetched_at FROM fetches WHERE destination = ? AND type = ?",
+            (key, poi_type)
+        ).fetchone()
+        if fetched is None:
+            return None
+        if max_age is not None and time.time() - fetched[0] > max_age:
+            return None
+
+        rows = conn.execute(
+            """
+            SELECT data FROM pois WHERE destination = ? AND type = ?
+            ORDER BY updated_at DESC, position ASC LIMIT ?
+            """,
+            (key, poi_type, limit)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"[WARNING] Failed to read POI catalog: {str(e)}")
+        return None
+
+    if len(rows) < limit:
+        return None
+    return [json.loads(row[0]) for row in rows]
+
+
+def get_catalog_stats() -> dict:
+    """
+    Return catalog row counts.
+
+    Returns:
+        Dict with enabled flag, destinations and per-type POI counts
+    """
+    conn = _connect()
+    if conn is None:
+        return {"enabled": False}
+
+    try:
+        counts = dict(conn.execute("SELECT type, COUNT(*) FROM pois GROUP BY type").fetchall())
+        destinations = conn.execute("SELECT COUNT(DISTINCT destination) FROM fetches").fetchone()[0]
+    except sqlite3.Error:
+        return {"enabled": True, "error": "unavailable"}
+
+    return {
+        "enabled": True,
+        "destinations": destinations,
+        "hotels": counts.get("hotel", 0),
+        "activities": counts.get("activity", 0)
+    }
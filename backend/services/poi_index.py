@@ -0,0 +1,386 @@
+"""
+In-memory spatial index over every hotel and activity the service has seen.
+Points are stored as unit vectors on the sphere in a KD-tree (chord distance
+is monotonic in great-circle distance) for exact radius and k-nearest queries.
+New points go to a small grid-bucketed pending area that is folded into the
+tree by a background rebuild, so inserts never pay for a full rebuild.
+"""
+
+import heapq
+import math
+import threading
+from typing import Optional
+from config.settings import Config
+from services.records import Activity, Hotel
+
+
+EARTH_RADIUS_KM = 6371.0
+LEAF_SIZE = 16
+GRID_CELL_DEGREES = 0.5
+POI_TYPES = ("hotel", "activity")
+
+
+def _to_xyz(lat: float, lng: float) -> tuple[float, float, float]:
+    """Convert latitude/longitude in degrees to a unit vector."""
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    cos_lat = math.cos(lat_rad)
+    return (cos_lat * math.cos(lng_rad), cos_lat * math.sin(lng_rad), math.sin(lat_rad))
+
+
+def _chord_for_km(km: float) -> float:
+    """Chord length on the unit sphere for a great-circle distance in km."""
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def _km_for_chord_sq(chord_sq: float) -> float:
+    """Great-circle distance in km for a squared chord length."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(chord_sq) / 2, 1.0))
+
+
+def _dist_sq(a, b) -> float:
+    """Squared Euclidean distance between two unit vectors."""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+def _grid_cell(lat: float, lng: float) -> tuple[int, int]:
+    """Grid bucket for a location."""
+    return (int(math.floor(lat / GRID_CELL_DEGREES)), int(math.floor(lng / GRID_CELL_DEGREES)))
+
+
+def _grid_cells_near(lat: float, lng: float, km: float):
+    """
+    Grid cells that may contain points within km of a location.
+
+    Returns:
+        List of cells, or None when the search area is too large or wraps
+        around a pole or the antimeridian (callers then scan every cell)
+    """
+    lat_span = math.degrees(km / EARTH_RADIUS_KM)
+    if lat + lat_span >= 90 or lat - lat_span <= -90:
+        return None
+    lng_span = lat_span / max(math.cos(math.radians(abs(lat) + lat_span)), 1e-9)
+    if lng_span >= 180 or lng - lng_span < -180 or lng + lng_span > 180:
+        return None
+
+    lo_lat, lo_lng = _grid_cell(lat - lat_span, lng - lng_span)
+    hi_lat, hi_lng = _grid_cell(lat + lat_span, lng + lng_span)
+    if (hi_lat - lo_lat + 1) * (hi_lng - lo_lng + 1) > 4096:
+        return None
+    return [(a, b) for a in range(lo_lat, hi_lat + 1) for b in range(lo_lng, hi_lng + 1)]
+
+
+def _build_tree(ids: list, xyz: list):
+    """
+    Build a KD-tree over point ids.
+
+    Returns:
+        Nested nodes: ("leaf", ids, lo, hi) or ("node", axis, split, left, right, lo, hi)
+        where lo/hi are the bounding box corners of the subtree.
+    """
+    if not ids:
+        return None
+
+    coords = [xyz[i] for i in ids]
+    lo = tuple(min(c[axis] for c in coords) for axis in range(3))
+    hi = tuple(max(c[axis] for c in coords) for axis in range(3))
+
+    if len(ids) <= LEAF_SIZE:
+        return ("leaf", ids, lo, hi)
+
+    # Split on the widest axis at the median
+    axis = max(range(3), key=lambda a: hi[a] - lo[a])
+    ids = sorted(ids, key=lambda i: xyz[i][axis])
+    mid = len(ids) // 2
+    split = xyz[ids[mid]][axis]
+    return ("node", axis, split, _build_tree(ids[:mid], xyz), _build_tree(ids[mid:], xyz), lo, hi)
+
+
+def _box_dist_sq(point, lo, hi) -> float:
+    """Squared distance from a point to an axis-aligned bounding box."""
+    total = 0.0
+    for axis in range(3):
+        value = point[axis]
+        if value < lo[axis]:
+            diff = lo[axis] - value
+            total += diff * diff
+        elif value > hi[axis]:
+            diff = value - hi[axis]
+            total += diff * diff
+    return total
+
+
+class SpatialIndex:
+    """Thread-safe spatial index of hotel and activity POIs."""
+
+    def __init__(self, max_points: int = 200000):
+        """
+        Args:
+            max_points: Maximum number of POIs kept (further inserts are ignored)
+        """
+        self.max_points = max_points
+        self._xyz = []
+        self._types = []
+        self._pois = []
+        self._type_counts = {}
+        self._keys = {}  # (type, name, lat, lng) -> id
+        self._tree = None
+        self._tree_size = 0
+        self._pending = {}  # grid cell -> ids not yet in the tree
+        self._pending_count = 0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def add(self, poi_type: str, poi: Hotel | Activity) -> None:
+        """
+        Add or update a POI.
+
+        Args:
+            poi_type: "hotel" or "activity"
+            poi: Hotel or Activity record
+        """
+        self.add_many(poi_type, [poi])
+
+    def add_many(self, poi_type: str, pois: list[Hotel | Activity]) -> None:
+        """
+        Add or update several POIs of one type.
+
+        Args:
+            poi_type: "hotel" or "activity"
+            pois: Hotel or Activity records
+        """
+        with self._lock:
+            for poi in pois:
+                lat = poi.lat
+                lng = poi.lng
+                if lat is None or lng is None:
+                    continue
+
+                key = (poi_type, poi.name, round(lat, 5), round(lng, 5))
+                existing = self._keys.get(key)
+                if existing is not None:
+                    self._pois[existing] = poi
+                    continue
+                if len(self._pois) >= self.max_points:
+                    continue
+
+                point_id = len(self._pois)
+                self._keys[key] = point_id
+                self._xyz.append(_to_xyz(lat, lng))
+                self._types.append(poi_type)
+                self._pois.append(poi)
+                self._type_counts[poi_type] = self._type_counts.get(poi_type, 0) + 1
+                self._pending.setdefault(_grid_cell(lat, lng), []).append(point_id)
+                self._pending_count += 1
+
+            start_rebuild = (
+                not self._rebuilding
+                and self._pending_count > max(LEAF_SIZE * 8, self._tree_size // 10)
+            )
+            if start_rebuild:
+                self._rebuilding = True
+
+        if start_rebuild:
+            threading.Thread(target=self._rebuild, name="poi-index-rebuild", daemon=True).start()
+
+    def _rebuild(self) -> None:
+        """Rebuild the KD-tree over all points and clear the pending area."""
+        try:
+            with self._lock:
+                size = len(self._xyz)
+                xyz = self._xyz[:size]
+            tree = _build_tree(list(range(size)), xyz)
+            with self._lock:
+                self._tree = tree
+                self._tree_size = size
+                # Keep only points added while the rebuild was running
+                pending = {}
+                count = 0
+                for cell, ids in self._pending.items():
+                    remaining = [i for i in ids if i >= size]
+                    if remaining:
+                        pending[cell] = remaining
+                        count += len(remaining)
+                self._pending = pending
+                self._pending_count = count
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _snapshot(self, cells=None):
+        """
+        Return the tree and a copy of pending ids under the lock.
+
+        Args:
+            cells: Optional iterable of grid cells to restrict pending ids to
+        """
+        with self._lock:
+            return self._tree, self._pending_ids(cells), self._xyz, self._types, self._pois
+
+    def _pending_ids(self, cells=None) -> list:
+        """Pending ids, optionally restricted to grid cells (lock held)."""
+        if cells is None:
+            return [i for ids in self._pending.values() for i in ids]
+        return [i for cell in cells for i in self._pending.get(cell, ())]
+
+    def _pending_after(self, tree, tree_size: int, cells=None) -> list:
+        """
+        Pending ids for a query that already searched tree (of tree_size points).
+        If a rebuild replaced the tree in the meantime, the points it folded in
+        that the old tree lacks are returned too, so none are missed.
+        """
+        with self._lock:
+            pending = self._pending_ids(cells)
+            if self._tree is not tree:
+                pending.extend(range(tree_size, self._tree_size))
+            return pending
+
+    def query_radius(self, lat: float, lng: float, radius_km: float,
+                     poi_type: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+        """
+        Find POIs within radius_km of a point, nearest first.
+
+        Args:
+            lat, lng: Query point in decimal degrees
+            radius_km: Search radius in kilometers
+            poi_type: Optional "hotel" or "activity" filter
+            limit: Optional maximum number of results
+
+        Returns:
+            List of {"type", "distance_km", "poi"} dicts sorted by distance
+        """
+        tree, pending, xyz, types, pois = self._snapshot(_grid_cells_near(lat, lng, radius_km))
+        center = _to_xyz(lat, lng)
+        max_sq = _chord_for_km(radius_km) ** 2
+        hits = []
+
+        stack = [tree] if tree is not None else []
+        while stack:
+            node = stack.pop()
+            if node is None or _box_dist_sq(center, node[-2], node[-1]) > max_sq:
+                continue
+            if node[0] == "leaf":
+                for i in node[1]:
+                    if poi_type is None or types[i] == poi_type:
+                        d = _dist_sq(center, xyz[i])
+                        if d <= max_sq:
+                            hits.append((d, i))
+            else:
+                stack.append(node[3])
+                stack.append(node[4])
+
+        for i in pending:
+            if poi_type is None or types[i] == poi_type:
+                d = _dist_sq(center, xyz[i])
+                if d <= max_sq:
+                    hits.append((d, i))
+
+        hits.sort()
+        if limit is not None:
+            hits = hits[:limit]
+        return [self._result(d, i, types, pois) for d, i in hits]
+
+    def query_nearest(self, lat: float, lng: float, k: int,
+                      poi_type: Optional[str] = None, radius_km: Optional[float] = None) -> list[dict]:
+        """
+        Find the k nearest POIs to a point.
+
+        Args:
+            lat, lng: Query point in decimal degrees
+            k: Number of neighbours to return
+            poi_type: Optional "hotel" or "activity" filter
+            radius_km: Optional maximum distance in kilometers
+
+        Returns:
+            List of {"type", "distance_km", "poi"} dicts sorted by distance
+        """
+        if k <= 0:
+            return []
+
+        with self._lock:
+            tree, tree_size, xyz, types, pois = self._tree, self._tree_size, self._xyz, self._types, self._pois
+        center = _to_xyz(lat, lng)
+        bound = _chord_for_km(radius_km) ** 2 if radius_km is not None else float("inf")
+        best = []  # max-heap of (-dist_sq, id) holding the k best so far
+
+        def consider(i):
+            if poi_type is not None and types[i] != poi_type:
+                return
+            d = _dist_sq(center, xyz[i])
+            if d > bound:
+                return
+            if len(best) < k:
+                heapq.heappush(best, (-d, i))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, i))
+
+        # Best-first traversal ordered by box distance
+        frontier = [(0.0, 0, tree)] if tree is not None else []
+        counter = 1
+        while frontier:
+            box_d, _, node = heapq.heappop(frontier)
+            worst = -best[0][0] if len(best) >= k else bound
+            if box_d > worst:
+                break
+            if node[0] == "leaf":
+                for i in node[1]:
+                    consider(i)
+                continue
+            for child in (node[3], node[4]):
+                if child is not None:
+                    child_d = _box_dist_sq(center, child[-2], child[-1])
+                    if child_d <= worst:
+                        heapq.heappush(frontier, (child_d, counter, child))
+                        counter += 1
+
+        # Only pending points closer than the current k-th best can change the
+        # answer, so only the grid cells within that distance are scanned
+        worst = -best[0][0] if len(best) >= k else bound
+        cells = _grid_cells_near(lat, lng, _km_for_chord_sq(worst)) if worst != float("inf") else None
+        for i in self._pending_after(tree, tree_size, cells):
+            consider(i)
+
+        return [self._result(-neg_d, i, types, pois) for neg_d, i in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _result(dist_sq: float, point_id: int, types: list, pois: list) -> dict:
+        """Format a query hit."""
+        return {
+            "type": types[point_id],
+            "distance_km": round(_km_for_chord_sq(dist_sq), 3),
+            "poi": pois[point_id]
+        }
+
+    def stats(self) -> dict:
+        """
+        Return index size counters.
+
+        Returns:
+            Dict with total, per-type, indexed (in tree) and pending counts
+        """
+        with self._lock:
+            return {
+                "total": len(self._pois),
+                "hotels": self._type_counts.get("hotel", 0),
+                "activities": self._type_counts.get("activity", 0),
+                "indexed": self._tree_size,
+                "pending": self._pending_count
+            }
+
+
+# Process-wide index fed by tripadvisor_service
+poi_index = SpatialIndex(max_points=Config.POI_INDEX_MAX_POINTS)
+
+
+def index_candidates(candidates: dict) -> None:
+    """
+    Add every hotel and activity from parsed search candidates to the index.
+
+    Args:
+        candidates: Result of tripadvisor_service.parse_search_results
+    """
+    poi_index.add_many("hotel", candidates.get("hotels", []))
+    poi_index.add_many("activity", candidates.get("activities", []))
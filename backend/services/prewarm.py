@@ -0,0 +1,263 @@
+"""
+Cache pre-warming for popular destinations.
+A background thread fills the hotel, activity and summary caches for a fixed
+list of destinations (the frontend's featured ones by default) plus the most
+requested destinations observed at runtime, once at startup and then on a
+schedule, so the first users after a deploy or cache expiry hit warm caches.
+Every RapidAPI call made while warming takes a token only while the shared
+bucket keeps PREWARM_MIN_TOKENS spare and is shed otherwise, so warming never
+queues user requests behind it. Disabled by default (PREWARM_ENABLED).
+"""
+
+import threading
+import time
+from collections import Counter
+from config.settings import Config
+from services.openai_service import bucket_budget, warm_summary
+from services.tripadvisor_service import get_activities, get_hotels, rapidapi_limiter, warm_results
+from utils.helpers import normalize_destination
+
+
+# Observed destinations kept for popularity ranking; the least requested half is
+# dropped when the limit is reached
+MAX_TRACKED_DESTINATIONS = 1000
+
+# Poll interval while waiting for rate limit headroom
+QUOTA_POLL_SECONDS = 0.5
+
+
+class DestinationTracker:
+    """Counts requested destinations and their budget buckets."""
+
+    def __init__(self, max_tracked: int = MAX_TRACKED_DESTINATIONS):
+        """
+        Args:
+            max_tracked: Maximum number of distinct destinations kept
+        """
+        self.max_tracked = max_tracked
+        self._counts = Counter()  # normalized destination -> requests
+        self._names = {}  # normalized destination -> name as last requested
+        self._budgets = {}  # normalized destination -> Counter of budget buckets
+        self._lock = threading.Lock()
+
+    def record(self, destination: str, budget=None) -> None:
+        """
+        Count one request for a destination.
+
+        Args:
+            destination: Destination name as requested
+            budget: Requested budget, if any
+        """
+        key = normalize_destination(destination)
+        if not key:
+            return
+        bucket = bucket_budget(budget) if budget is not None else None
+
+        with self._lock:
+            self._counts[key] += 1
+            self._names[key] = destination.strip()
+            if isinstance(bucket, int):
+                self._budgets.setdefault(key, Counter())[bucket] += 1
+
+            if len(self._counts) > self.max_tracked:
+                keep = dict(self._counts.most_common(self.max_tracked // 2))
+                for dropped in [k for k in self._counts if k not in keep]:
+                    del self._counts[dropped]
+                    self._names.pop(dropped, None)
+                    self._budgets.pop(dropped, None)
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """
+        Return the most requested destinations.
+
+        Args:
+            n: Number of destinations
+
+        Returns:
+            List of (destination name, most requested budget bucket or None)
+        """
+        with self._lock:
+            return [
+                (
+                    self._names[key],
+                    self._budgets[key].most_common(1)[0][0] if key in self._budgets else None
+                )
+                for key, _ in self._counts.most_common(n)
+            ]
+
+
+class PrewarmScheduler:
+    """Background warm-up of popular destinations at startup and every interval."""
+
+    def __init__(self, tracker: DestinationTracker):
+        """
+        Args:
+            tracker: Source of observed popular destinations
+        """
+        self.tracker = tracker
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._status = {
+            "state": "idle",
+            "runs": 0,
+            "destinations": 0,
+            "done": 0,
+            "warmed": 0,
+            "failed": 0,
+            "current": None,
+            "quota_wait_seconds": 0.0,
+            "first_run_duration_seconds": None,
+            "last_run_duration_seconds": None,
+            "last_run_finished_at": None
+        }
+
+    def destinations(self) -> list[tuple[str, int]]:
+        """
+        Destinations to warm: the configured list first, then the observed top N.
+
+        Returns:
+            List of (destination name, budget used for its summary)
+        """
+        selected = []
+        seen = set()
+        candidates = [(name, None) for name in Config.PREWARM_DESTINATIONS]
+        candidates += self.tracker.top(Config.PREWARM_TOP_N)
+
+        for name, budget in candidates:
+            key = normalize_destination(name)
+            if key and key not in seen:
+                seen.add(key)
+                selected.append((name, budget if budget is not None else Config.PREWARM_BUDGET))
+        return selected
+
+    def run_once(self) -> None:
+        """Warm every selected destination once."""
+        destinations = self.destinations()
+        started = time.perf_counter()
+        self._update(state="running", destinations=len(destinations), done=0, warmed=0, failed=0)
+        print(f"[INFO] Pre-warming {len(destinations)} destinations")
+
+        for name, budget in destinations:
+            if self._stop.is_set():
+                break
+            self._update(current=name)
+            self._wait_for_quota()
+            warmed = self._warm(name, budget)
+            with self._lock:
+                self._status["done"] += 1
+                self._status["warmed" if warmed else "failed"] += 1
+
+        duration = round(time.perf_counter() - started, 2)
+        with self._lock:
+            status = self._status
+            status["state"] = "idle"
+            status["current"] = None
+            status["runs"] += 1
+            status["last_run_duration_seconds"] = duration
+            status["last_run_finished_at"] = time.time()
+            if status["first_run_duration_seconds"] is None:
+                status["first_run_duration_seconds"] = duration
+            print(f"[INFO] Pre-warmed {status['warmed']}/{status['destinations']} destinations in {duration}s")
+
+    def _warm(self, destination: str, budget: int) -> bool:
+        """
+        Warm hotels, activities and the summary for one destination.
+
+        Returns:
+            False if any part could not be fetched
+        """
+        limit = Config.PREWARM_LIMIT
+        try:
+            outcomes = [
+                warm_results("hotels", destination, limit),
+                warm_results("activities", destination, limit)
+            ]
+            if False in outcomes:
+                # Not cached (e.g. deferred for lack of spare quota): the lookups
+                # below would fetch at user priority
+                return False
+            # Served from the cache just warmed; the summary fingerprint depends on them
+            hotels = get_hotels(destination, limit=limit)
+            activities = get_activities(destination, limit=limit)
+            outcomes.append(warm_summary(destination, budget, hotels, activities))
+        except Exception as e:
+            print(f"[WARNING] Pre-warming {destination} failed: {str(e)}")
+            return False
+        return False not in outcomes
+
+    def _wait_for_quota(self) -> None:
+        """
+        Block until the RapidAPI bucket has Config.PREWARM_MIN_TOKENS spare tokens,
+        so a destination is not started only to have its calls shed.
+        """
+        if not Config.RAPIDAPI_RATE_LIMIT_ENABLED or not Config.USE_REAL_API:
+            return
+        started = time.perf_counter()
+        while not self._stop.is_set() and rapidapi_limiter.available() < Config.PREWARM_MIN_TOKENS:
+            self._update(state="waiting_for_quota")
+            self._stop.wait(QUOTA_POLL_SECONDS)
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._status["state"] = "running"
+            self._status["quota_wait_seconds"] = round(self._status["quota_wait_seconds"] + waited, 2)
+
+    def _loop(self) -> None:
+        """Warm at startup, then every PREWARM_INTERVAL_SECONDS until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[ERROR] Pre-warm run failed: {str(e)}")
+                self._update(state="idle", current=None)
+            self._stop.wait(Config.PREWARM_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Start the background scheduler (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="prewarm", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the scheduler to stop after the current destination."""
+        self._stop.set()
+
+    def _update(self, **fields) -> None:
+        with self._lock:
+            self._status.update(fields)
+
+    def stats(self) -> dict:
+        """
+        Return warm-up progress and timing.
+
+        Returns:
+            Dict with enabled flag, state, runs, destinations/done/warmed/failed for the
+            current or last run, the destination being warmed, time spent waiting for
+            rate limit headroom, first (startup) and last run durations in seconds and
+            the last finish time (epoch seconds)
+        """
+        with self._lock:
+            return {"enabled": Config.PREWARM_ENABLED, **self._status}
+
+
+destination_tracker = DestinationTracker()
+prewarmer = PrewarmScheduler(destination_tracker)
+
+
+def record_destination(destination: str, budget=None) -> None:
+    """
+    Count a request for a destination towards the observed top-N.
+
+    Args:
+        destination: Destination name as requested
+        budget: Requested budget, if any
+    """
+    destination_tracker.record(destination, budget)
+
+
+def start_prewarm() -> None:
+    """Start background pre-warming of popular destinations."""
+    prewarmer.start()
@@ -0,0 +1,186 @@
+"""
+Compact hotel and activity records.
+Slotted dataclasses with flat coordinates replace the nested per-item dicts
+kept in result lists and caches. Repeated strings (categories, currencies,
+prices, placeholder images) are interned, and each record converts straight
+to the existing wire shape. Records also support read-only dict-style access
+so code written against the dict shape keeps working.
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def _intern(value):
+    """Intern a string value (non-strings are returned unchanged)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    """Dict-style read access and wire conversion shared by Hotel and Activity."""
+
+    __slots__ = ()
+
+    # Wire field order; "coordinates" is assembled from lat/lng
+    WIRE_FIELDS = ()
+    INTERNED_FIELDS = ()
+
+    def __post_init__(self):
+        for field in self.INTERNED_FIELDS:
+            setattr(self, field, _intern(getattr(self, field)))
+
+    @property
+    def coordinates(self) -> dict:
+        return {"lat": self.lat, "lng": self.lng}
+
+    def __getitem__(self, key):
+        if key not in self.WIRE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.WIRE_FIELDS
+
+    def get(self, key, default=None):
+        """Read a wire field like dict.get."""
+        if key not in self.WIRE_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self) -> dict:
+        """
+        Convert to the wire dictionary shape.
+
+        Returns:
+            Dictionary with the same keys the API has always returned
+        """
+        raise NotImplementedError
+
+    def to_json(self) -> str:
+        """
+        Encode directly as a JSON object.
+
+        Returns:
+            JSON string of to_dict()
+        """
+        return _encoder.encode(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Build a record from its wire dictionary (e.g. a catalog row).
+
+        Args:
+            data: Hotel or activity dictionary
+
+        Returns:
+            Record instance
+        """
+        coords = data.get("coordinates") or {}
+        values = {
+            field: data.get(field) for field in cls.WIRE_FIELDS if field != "coordinates"
+        }
+        return cls(lat=coords.get("lat"), lng=coords.get("lng"), **values)
+
+
+@dataclass(slots=True)
+class Hotel(_Record):
+    """A hotel candidate."""
+
+    name: str
+    rating: Optional[float]
+    price: str
+    currency: Optional[str]
+    image: str
+    lat: Optional[float]
+    lng: Optional[float]
+    address: str = "Not available"
+    ranking: Optional[str] = None
+
+    WIRE_FIELDS = ("name", "rating", "price", "currency", "image", "coordinates", "address", "ranking")
+    INTERNED_FIELDS = ("price", "currency", "image", "address")
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "rating": self.rating,
+            "price": self.price,
+            "currency": self.currency,
+            "image": self.image,
+            "coordinates": {"lat": self.lat, "lng": self.lng},
+            "address": self.address,
+            "ranking": self.ranking
+        }
+
+
+@dataclass(slots=True)
+class Activity(_Record):
+    """An activity/attraction candidate."""
+
+    name: str
+    image: str
+    category: str
+    duration_minutes: Optional[int]
+    price: str
+    currency: Optional[str]
+    rating: Optional[float]
+    lat: Optional[float]
+    lng: Optional[float]
+    booking_link: Optional[str] = None
+
+    WIRE_FIELDS = (
+        "name", "image", "category", "duration_minutes", "price",
+        "currency", "rating", "coordinates", "booking_link"
+    )
+    INTERNED_FIELDS = ("image", "category", "price", "currency")
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "image": self.image,
+            "category": self.category,
+            "duration_minutes": self.duration_minutes,
+            "price": self.price,
+            "currency": self.currency,
+            "rating": self.rating,
+            "coordinates": {"lat": self.lat, "lng": self.lng},
+            "booking_link": self.booking_link
+        }
+
+
+class FallbackResults(list):
+    """
+    Hotels or activities served in place of the upstream after it failed, was
+    shed or ran out of time (catalogued or mock data). Behaves as a plain list;
+    response caches check is_fallback so a brief outage does not pin
+    placeholder data.
+    """
+
+    __slots__ = ()
+
+
+def is_fallback(results) -> bool:
+    """Check whether results are fallback data rather than an upstream answer."""
+    return isinstance(results, FallbackResults)
+
+
+def dumps_records(records: list) -> str:
+    """
+    Encode a list of records (or plain dicts, e.g. mock data) as a JSON array
+    in one encoder call, without the key sorting and default-hook dispatch
+    of jsonify.
+
+    Args:
+        records: Hotels or activities
+
+    Returns:
+        JSON string
+    """
+    return _encoder.encode([
+        record.to_dict() if isinstance(record, _Record) else record for record in records
+    ])
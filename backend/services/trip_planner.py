@@ -0,0 +1,175 @@
+"""
+Trip planning service combining hotels, activities and the AI summary.
+Shared by the single and batch plan trip endpoints.
+"""
+
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from services.tripadvisor_service import get_activities, get_fallback_results, get_hotels
+from services.openai_service import generate_ai_summary, generate_ai_summaries
+from services.records import is_fallback
+from utils.concurrency import get_batch_executor, get_executor
+from utils.helpers import timed
+
+
+def fetch_trip_data(destination, limit=5, deadline=None):
+    """
+    Fetches hotels and activities for a destination concurrently on the shared stage executor.
+    With a deadline, a stage still running when it passes is answered from the
+    fallback data instead; the fetch keeps running and fills the caches for later requests.
+    
+    Args:
+        destination (str): Destination name
+        limit (int): Maximum number of hotels and activities
+        deadline (Deadline): Optional request deadline
+    
+    Returns:
+        tuple: (hotels, activities, timings dict in milliseconds,
+                list of stages cut short by the deadline)
+    """
+    started = time.perf_counter()
+    timings = {}
+    results = {}
+    degraded = []
+    executor = get_executor()
+    
+    stages = []
+    for stage, fetch in (("hotels", get_hotels), ("activities", get_activities)):
+        # Each stage gets its own view of the deadline so it can be flagged separately
+        stage_deadline = deadline.child() if deadline is not None else None
+        future = executor.submit(timed, fetch, destination, limit=limit, deadline=stage_deadline)
+        stages.append((stage, future, stage_deadline))
+    
+    for stage, future, stage_deadline in stages:
+        if stage_deadline is None:
+            results[stage], timings[f"{stage}_ms"] = future.result()
+            continue
+        try:
+            results[stage], timings[f"{stage}_ms"] = future.result(timeout=stage_deadline.remaining())
+        except FutureTimeoutError:
+            stage_deadline.note_missed(f"serving fallback {stage} for {destination}")
+            results[stage] = get_fallback_results(stage, destination, limit)
+            timings[f"{stage}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if stage_deadline.missed:
+            degraded.append(stage)
+    
+    return results["hotels"], results["activities"], timings, degraded
+
+
+def build_trip_plan(destination, budget, limit=5, deadline=None):
+    """
+    Builds a complete trip plan for one destination.
+    Hotels and activities are fetched concurrently on the shared stage executor,
+    then the AI summary is generated from them.
+    
+    Args:
+        destination (str): Destination name
+        budget (int): Travel budget in local currency
+        limit (int): Maximum number of hotels and activities
+        deadline (Deadline): Optional request deadline; stages that cannot finish
+            in time are answered with fallback data and the plan is marked degraded
+    
+    Returns:
+        dict: destination, budget, hotels, activities, summary, degraded flag and
+              per-stage timings (milliseconds) under metadata
+    """
+    started = time.perf_counter()
+    
+    # Fetch hotels and activities concurrently
+    hotels_data, activities_data, timings, degraded = fetch_trip_data(destination, limit, deadline)
+    
+    # Generate AI summary
+    summary_deadline = deadline.child() if deadline is not None else None
+    summary, timings["summary_ms"] = timed(
+        generate_ai_summary,
+        destination=destination,
+        budget=budget,
+        hotels=hotels_data,
+        activities=activities_data,
+        deadline=summary_deadline
+    )
+    if summary_deadline is not None and summary_deadline.missed:
+        degraded.append("summary")
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    return _trip_plan(destination, budget, hotels_data, activities_data, summary, timings, degraded)
+
+
+def build_trip_plans(jobs, limit=5):
+    """
+    Builds trip plans for several destinations.
+    Hotel/activity fetches run concurrently on the batch executor, then all
+    summaries are generated together with batched OpenAI completions.
+    
+    Args:
+        jobs (list): List of (destination, budget) tuples
+        limit (int): Maximum number of hotels and activities per destination
+    
+    Returns:
+        list: Per job, either the trip plan dict or the exception that failed it
+    """
+    started = time.perf_counter()
+    executor = get_batch_executor()
+    futures = [executor.submit(fetch_trip_data, destination, limit) for destination, _ in jobs]
+    
+    fetched = []
+    outcomes = [None] * len(jobs)
+    for index, future in enumerate(futures):
+        try:
+            fetched.append((index, future.result()))
+        except Exception as e:
+            outcomes[index] = e
+    
+    trips = [
+        {
+            "destination": jobs[index][0],
+            "budget": jobs[index][1],
+            "hotels": hotels_data,
+            "activities": activities_data
+        }
+        for index, (hotels_data, activities_data, _, _) in fetched
+    ]
+    summaries, summary_ms = timed(generate_ai_summaries, trips)
+    total_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    for (index, (hotels_data, activities_data, timings, _)), trip, summary in zip(fetched, trips, summaries):
+        timings["summary_ms"] = summary_ms
+        timings["total_ms"] = total_ms
+        outcomes[index] = _trip_plan(
+            trip["destination"], trip["budget"], hotels_data, activities_data, summary, timings
+        )
+    
+    return outcomes
+
+
+def plan_cacheable(plan):
+    """
+    Checks whether a trip plan may be cached: complete (not cut short by the
+    deadline) and built from upstream results rather than fallback data.
+    
+    Args:
+        plan (dict): Trip plan from build_trip_plan
+    
+    Returns:
+        bool: True if the plan can be stored in the response cache
+    """
+    return not plan["degraded"] and not is_fallback(plan["hotels"]) and not is_fallback(plan["activities"])
+
+
+def _trip_plan(destination, budget, hotels_data, activities_data, summary, timings, degraded=()):
+    """
+    Assembles the trip plan response shape.
+    
+    Returns:
+        dict: Trip plan; "degraded" is true when any stage was cut short by the
+              request deadline, and metadata lists those stages
+    """
+    return {
+        "destination": destination,
+        "budget": budget,
+        "hotels": hotels_data,
+        "activities": activities_data,
+        "summary": summary,
+        "degraded": bool(degraded),
+        "metadata": {"timings": timings, "degraded_stages": list(degraded)}
+    }
@@ -3,12 +3,33 @@ TripAdvisor/RapidAPI service for fetching hotels and activities data.
 Falls back to mock data if API keys are missing or API calls fail.
 """
 
+import asyncio
+import threading
 import time
 import math
+import httpx
 import requests
 from typing import Optional
+from urllib.parse import urlparse
 from config.settings import Config
+from services.http_pool import get_async_client, get_session
 from services.mock_data import get_mock_hotels, get_mock_activities
+from services.poi_catalog import get_pois as get_catalog_pois, upsert_pois as upsert_catalog_pois
+from services.poi_index import index_candidates
+from services.records import Activity, FallbackResults, Hotel
+from utils.cache_backend import JSONCodec, get_shared_backend
+from utils.circuit_breaker import CircuitBreaker
+from utils.concurrency import get_page_executor
+from utils.deadline import Deadline, time_left
+from utils.geo import within_radius_mask
+from utils.helpers import normalize_destination
+from utils.json_stream import JSONArrayItemDecoder
+from utils.rate_limiter import TokenBucket
+from utils.refresh import refresher
+from utils.keyword_classifier import KeywordClassifier
+from utils.metrics import fallbacks, filter_items, stage_seconds, upstream_responses, upstream_retries
+from utils.singleflight import AsyncSingleFlight, SingleFlight
+from utils.tiered_cache import TieredCache
 
 
 # Constants
@@ -16,8 +37,20 @@ PLACEHOLDER_IMAGE = "https://via.placeholder.com/400x300?text=No+Image"
 REQUEST_TIMEOUT = 8
 MAX_RETRIES = 3
 RETRY_BACKOFFS = [0.5, 1.0, 2.0]
+# Attempts with less time than this before the request deadline are not started
+MIN_ATTEMPT_SECONDS = 0.25
 HOTEL_MAX_DISTANCE_KM = 200
 ACTIVITY_MAX_DISTANCE_KM = 100
+SEARCH_URL = "https://travel-advisor.p.rapidapi.com/locations/search"
+SEARCH_PAGE_SIZE = 30
+
+# Chunk size for streamed response bodies
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Search paging: lower bound on the expected usable results per page (keeps page
+# estimates finite for queries that yielded nothing) and EWMA weight of new yields
+MIN_PAGE_YIELD = 0.5
+PAGE_YIELD_SMOOTHING = 0.3
 
 # Hotel category keywords (case-insensitive matching)
 HOTEL_CATEGORIES = ["hotel", "lodging", "resort", "motel", "guest_house", "inn", "hostel"]
@@ -38,6 +71,89 @@ MOUNTAIN_KEYWORDS = ["mount", "mountain", "hill", "himalaya", "himalayan", "anna
 # Beach destination keywords
 BEACH_KEYWORDS = ["goa", "bali", "maldives", "boracay", "phuket", "beach", "coast", "island"]
 
+# All keyword lists compiled into one classifier; texts are tagged in a single memoized scan
+_classifier = KeywordClassifier({
+    "hotel": HOTEL_CATEGORIES,
+    "activity": ALLOWED_ACTIVITY_CATEGORIES,
+    "water": WATER_ACTIVITY_KEYWORDS,
+    "mountain": MOUNTAIN_KEYWORDS,
+    "beach": BEACH_KEYWORDS
+})
+
+# Result kinds: cache key prefix -> (POI catalog type, mock data fallback, record type)
+RESULT_KINDS = {
+    "hotels": ("hotel", get_mock_hotels, Hotel),
+    "activities": ("activity", get_mock_activities, Activity)
+}
+
+# Shared cache for parsed hotel/activity results (keyed by kind, destination, limit)
+# and search candidates; in-process L1 in front of the worker-shared L2 backend.
+# Stale entries are served while the background refresher re-fetches them
+_result_cache = TieredCache(
+    "results",
+    backend=get_shared_backend(),
+    codec=JSONCodec({"hotel": Hotel, "activity": Activity}),
+    l1_ttl=Config.CACHE_L1_TTL_SECONDS,
+    max_entries=Config.CACHE_MAX_ENTRIES,
+    max_bytes=Config.CACHE_MAX_BYTES,
+    default_ttl=Config.CACHE_TTL_SECONDS,
+    stale_ttl=Config.CACHE_STALE_SECONDS,
+    refresh_ahead=Config.CACHE_REFRESH_AHEAD
+)
+
+# Coalesces concurrent identical upstream requests into one call
+_inflight_requests = SingleFlight()
+
+# Coalesces concurrent fetch-and-parse of the same search query
+_inflight_searches = SingleFlight()
+
+# Async counterparts used by the async_* functions
+_async_inflight_requests = AsyncSingleFlight()
+_async_inflight_searches = AsyncSingleFlight()
+
+# Client-side RapidAPI quota, shared by all threads and worker processes on the host
+rapidapi_limiter = TokenBucket(
+    "rapidapi",
+    rate=Config.RAPIDAPI_RATE_PER_SECOND,
+    burst=Config.RAPIDAPI_RATE_BURST,
+    max_wait=Config.RAPIDAPI_RATE_MAX_WAIT,
+    db_path=Config.RATE_LIMIT_DB_PATH
+)
+
+# Trips on RapidAPI errors or slow responses; while open, requests fail fast and
+# callers fall back to the catalog or mock data
+rapidapi_breaker = CircuitBreaker(
+    "rapidapi",
+    failure_ratio=Config.BREAKER_FAILURE_RATIO,
+    min_calls=Config.BREAKER_MIN_CALLS,
+    window_seconds=Config.BREAKER_WINDOW_SECONDS,
+    slow_call_seconds=Config.RAPIDAPI_SLOW_CALL_SECONDS,
+    open_seconds=Config.BREAKER_OPEN_SECONDS,
+    half_open_calls=Config.BREAKER_HALF_OPEN_CALLS,
+    enabled=Config.BREAKER_ENABLED
+)
+
+# Stage timers bound once, so recording costs one lock round-trip
+_fetch_seconds = stage_seconds.labels("upstream_fetch")
+_parse_seconds = stage_seconds.labels("parse")
+_backoff_seconds = stage_seconds.labels("retry_backoff")
+_filter_seconds = stage_seconds.labels("filter")
+
+# Per (normalized query, kind) average of usable results per search page
+_page_yields = {}
+_page_stats = {"extensions": 0, "early_stops": 0}
+_page_yield_lock = threading.Lock()
+
+
+def get_cache_stats() -> dict:
+    """
+    Return hit/miss/eviction counters for the hotel/activity result cache.
+    
+    Returns:
+        Dict of cache statistics
+    """
+    return _result_cache.stats()
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -85,47 +201,246 @@ def within_radius(lat1: float, lon1: float, lat2: float, lon2: float, km: float)
     return distance <= km
 
 
-def make_api_request(url: str, headers: dict, params: dict) -> Optional[dict]:
+def make_api_request(url: str, headers: dict, params: dict, parse=None,
+                     deadline: Optional[Deadline] = None) -> Optional[dict]:
     """
     Make an API request with retry logic and exponential backoff.
+    Concurrent calls with identical url and params share a single upstream
+    request, including its retries and final outcome (bounded by the first
+    caller's deadline). Under a background deadline every attempt takes a
+    RapidAPI token only if PREWARM_MIN_TOKENS are left spare, and is shed otherwise.
+    
+    Args:
+        url: API endpoint URL
+        headers: Request headers
+        params: Request parameters
+        parse: Optional streaming parser class (see SearchPageParser); when given the
+            body is fed to it chunk by chunk instead of being decoded as a whole
+        deadline: Optional request deadline; timeouts, backoff and the number of
+            attempts shrink to fit it
+    
+    Returns:
+        JSON response as dict (or the parser's result), or None if all retries fail.
+        The dict may be shared between callers and must not be mutated.
+    """
+    # Background calls may be shed where a user's would queue, so the two never share a call
+    key = (url, tuple(sorted((str(k), str(v)) for k, v in params.items())), parse, _is_background(deadline))
+    return _inflight_requests.do(key, lambda: _request_with_retries(url, headers, params, parse, deadline))
+
+
+def _is_background(deadline: Optional[Deadline]) -> bool:
+    return deadline is not None and deadline.background
+
+
+def _quota_args(deadline: Optional[Deadline]) -> tuple[float, float]:
+    """
+    Limiter arguments for one attempt.
+    
+    Args:
+        deadline: Request deadline, or None
+    
+    Returns:
+        (max_wait, spare): user requests queue up to RAPIDAPI_RATE_MAX_WAIT (shrunk
+        to the deadline); background ones never wait and leave PREWARM_MIN_TOKENS
+        in the bucket for user requests
+    """
+    if _is_background(deadline):
+        return 0, Config.PREWARM_MIN_TOKENS
+    return time_left(deadline, Config.RAPIDAPI_RATE_MAX_WAIT), 0
+
+
+def _quota_shed(deadline: Optional[Deadline]) -> None:
+    """Log a request shed by the rate limiter; a shed background request counts as missed."""
+    if _is_background(deadline):
+        print(f"[INFO] No spare RapidAPI quota, deferring background request")
+        deadline.missed = True
+    else:
+        print(f"[WARNING] RapidAPI rate limit reached, shedding request")
+
+
+def _attempt_timeout(deadline: Optional[Deadline]) -> Optional[float]:
+    """
+    Timeout for the next upstream attempt.
+    
+    Args:
+        deadline: Request deadline, or None
+    
+    Returns:
+        REQUEST_TIMEOUT shrunk to the deadline, or None if no attempt fits any more
+    """
+    timeout = time_left(deadline, REQUEST_TIMEOUT)
+    if timeout < MIN_ATTEMPT_SECONDS:
+        deadline.note_missed("skipping RapidAPI attempt")
+        return None
+    return timeout
+
+
+def _retry_wait(attempt: int, wait: float, deadline: Optional[Deadline]) -> Optional[float]:
+    """
+    Backoff before the next attempt.
+    
+    Args:
+        attempt: Index of the attempt that just failed
+        wait: Backoff in seconds
+        deadline: Request deadline, or None
+    
+    Returns:
+        Seconds to wait, or None if no retry is left or it would not fit the deadline
+    """
+    if attempt >= MAX_RETRIES - 1:
+        return None
+    if deadline is not None and deadline.remaining() - wait < MIN_ATTEMPT_SECONDS:
+        deadline.note_missed("not retrying RapidAPI request")
+        return None
+    return wait
+
+
+def _deadline_cut(timeout: float, deadline: Optional[Deadline]) -> bool:
+    """Check whether a timed-out attempt only failed because the deadline shortened it."""
+    if deadline is not None and timeout < REQUEST_TIMEOUT and deadline.expired:
+        deadline.note_missed("RapidAPI attempt cut short")
+        return True
+    return False
+
+
+def _record_attempt(status, started: float, parse_time: float = 0.0) -> None:
+    """
+    Record the outcome and duration of one upstream attempt.
+    
+    Args:
+        status: HTTP status code, or "timeout"/"error" when there was no response
+        started: perf_counter() value when the attempt started
+        parse_time: Seconds of the attempt spent parsing the body
+    """
+    _fetch_seconds.observe(time.perf_counter() - started)
+    if parse_time:
+        _parse_seconds.observe(parse_time)
+    upstream_responses.inc("rapidapi", status)
+
+
+def _backoff(reason: str, wait_time: float) -> None:
+    """Sleep before retrying a failed attempt, recording the retry."""
+    upstream_retries.inc("rapidapi", reason)
+    _backoff_seconds.observe(wait_time)
+    time.sleep(wait_time)
+
+
+async def _async_backoff(reason: str, wait_time: float) -> None:
+    """Async equivalent of _backoff."""
+    upstream_retries.inc("rapidapi", reason)
+    _backoff_seconds.observe(wait_time)
+    await asyncio.sleep(wait_time)
+
+
+def _request_with_retries(url: str, headers: dict, params: dict, parse=None,
+                          deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Perform the upstream GET with retry logic and exponential backoff.
     
     Args:
         url: API endpoint URL
         headers: Request headers
         params: Request parameters
+        parse: Optional streaming parser class (see make_api_request)
+        deadline: Optional request deadline (see make_api_request)
     
     Returns:
-        JSON response as dict, or None if all retries fail
+        JSON response as dict (or the parser's result), or None if all retries fail
     """
+    session = get_session(urlparse(url).netloc)
+    
     for attempt in range(MAX_RETRIES):
+        if _attempt_timeout(deadline) is None:
+            return None
+        # Fail fast while the upstream is known to be unhealthy
+        if not rapidapi_breaker.allow():
+            print(f"[WARNING] RapidAPI circuit open, using fallback")
+            return None
+        # Queue for quota up front; shed the request if the wait would be too long
+        if Config.RAPIDAPI_RATE_LIMIT_ENABLED and not rapidapi_limiter.acquire(*_quota_args(deadline)):
+            _quota_shed(deadline)
+            rapidapi_breaker.release()
+            return None
+        timeout = _attempt_timeout(deadline)
+        if timeout is None:
+            rapidapi_breaker.release()
+            return None
+        started = time.perf_counter()
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            response = session.get(
+                url, headers=headers, params=params, timeout=timeout, stream=parse is not None
+            )
             if response.status_code == 200:
-                return response.json()
+                parse_time = 0.0
+                if parse is None:
+                    mark = time.perf_counter()
+                    result = response.json()
+                    parse_time = time.perf_counter() - mark
+                else:
+                    with response:
+                        parser = parse()
+                        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                            mark = time.perf_counter()
+                            parser.feed(chunk)
+                            parse_time += time.perf_counter() - mark
+                        result = parser.result()
+                rapidapi_breaker.record_success(time.perf_counter() - started)
+                _record_attempt(200, started, parse_time)
+                return result
             elif response.status_code == 429:
-                # Rate limited - wait longer before retry
-                if attempt < MAX_RETRIES - 1:
-                    wait_time = RETRY_BACKOFFS[attempt] * 2
-                    print(f"[WARNING] Rate limited, waiting {wait_time}s before retry {attempt + 1}/{MAX_RETRIES}")
-                    time.sleep(wait_time)
-                    continue
+                # Quota, not upstream health: the breaker counts it as a completed call.
+                # Empty the shared bucket so other workers back off too,
+                # then wait longer before retry
+                rapidapi_breaker.record_success(time.perf_counter() - started)
+                _record_attempt(429, started)
+                rapidapi_limiter.penalize()
+                response.close()
+                wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt] * 2, deadline)
+                if wait_time is None:
+                    break
+                print(f"[WARNING] Rate limited, waiting {wait_time}s before retry {attempt + 1}/{MAX_RETRIES}")
+                _backoff("rate_limited", wait_time)
             else:
                 print(f"[WARNING] API returned status {response.status_code}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_BACKOFFS[attempt])
-                    continue
+                rapidapi_breaker.record_failure()
+                _record_attempt(response.status_code, started)
+                response.close()
+                wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+                if wait_time is None:
+                    break
+                _backoff("status", wait_time)
         except requests.exceptions.Timeout:
             print(f"[WARNING] Request timeout (attempt {attempt + 1}/{MAX_RETRIES})")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_BACKOFFS[attempt])
-                continue
+            _record_attempt("timeout", started)
+            if _deadline_cut(timeout, deadline):
+                rapidapi_breaker.release()
+                break
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            _backoff("timeout", wait_time)
         except requests.exceptions.RequestException as e:
             print(f"[WARNING] Request error: {str(e)} (attempt {attempt + 1}/{MAX_RETRIES})")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_BACKOFFS[attempt])
-                continue
+            _record_attempt("error", started)
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            _backoff("error", wait_time)
+        except ValueError as e:
+            # Truncated or malformed body: transient like a dropped connection
+            print(f"[WARNING] Invalid response body: {str(e)} (attempt {attempt + 1}/{MAX_RETRIES})")
+            _record_attempt("invalid_body", started)
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            _backoff("invalid_body", wait_time)
         except Exception as e:
             print(f"[ERROR] Unexpected error: {str(e)}")
+            _record_attempt("error", started)
+            rapidapi_breaker.record_failure()
             break
     
     return None
@@ -215,26 +530,19 @@ def is_hotel_category(result_obj: dict) -> bool:
         True if it's a hotel category, False otherwise
     """
     category = result_obj.get("category", {})
-    category_key = category.get("key", "").lower() if isinstance(category, dict) else str(category).lower()
-    category_name = category.get("name", "").lower() if isinstance(category, dict) else ""
-    
-    # Check category key
-    for hotel_cat in HOTEL_CATEGORIES:
-        if hotel_cat in category_key:
-            return True
-    
-    # Check category name
-    for hotel_cat in HOTEL_CATEGORIES:
-        if hotel_cat in category_name:
-            return True
-    
-    # Check name for hotel keywords
-    name = result_obj.get("name", "").lower()
-    for hotel_cat in HOTEL_CATEGORIES:
-        if hotel_cat in name:
-            return True
+    if isinstance(category, dict):
+        category_key = category.get("key") or ""
+        category_name = category.get("name") or ""
+    else:
+        category_key = str(category)
+        category_name = ""
     
-    return False
+    # Check category key, category name (memoized), then name for hotel keywords
+    return (
+        "hotel" in _classifier.tags(category_key)
+        or "hotel" in _classifier.tags(category_name)
+        or _classifier.has(result_obj.get("name") or "", "hotel")
+    )
 
 
 def is_mountain_destination(destination: str) -> bool:
@@ -247,8 +555,7 @@ def is_mountain_destination(destination: str) -> bool:
     Returns:
         True if mountain destination, False otherwise
     """
-    dest_lower = destination.lower()
-    return any(keyword in dest_lower for keyword in MOUNTAIN_KEYWORDS)
+    return "mountain" in _classifier.tags(destination)
 
 
 def is_beach_destination(destination: str) -> bool:
@@ -261,8 +568,7 @@ def is_beach_destination(destination: str) -> bool:
     Returns:
         True if beach destination, False otherwise
     """
-    dest_lower = destination.lower()
-    return any(keyword in dest_lower for keyword in BEACH_KEYWORDS)
+    return "beach" in _classifier.tags(destination)
 
 
 def is_water_activity(activity_name: str, category: str) -> bool:
@@ -276,14 +582,7 @@ def is_water_activity(activity_name: str, category: str) -> bool:
     Returns:
         True if water activity, False otherwise
     """
-    name_lower = activity_name.lower()
-    category_lower = category.lower()
-    
-    for keyword in WATER_ACTIVITY_KEYWORDS:
-        if keyword in name_lower or keyword in category_lower:
-            return True
-    
-    return False
+    return "water" in _classifier.tags(category) or _classifier.has(activity_name, "water")
 
 
 def is_allowed_activity_category(category: str) -> bool:
@@ -296,343 +595,1364 @@ def is_allowed_activity_category(category: str) -> bool:
     Returns:
         True if allowed, False otherwise
     """
-    category_lower = category.lower()
-    for allowed in ALLOWED_ACTIVITY_CATEGORIES:
-        if allowed.lower() in category_lower:
-            return True
-    return False
+    return "activity" in _classifier.tags(category)
 
 
-def get_hotels(destination: str, limit: int = 5) -> list[dict]:
+def extract_coordinates(result_obj: dict) -> Optional[tuple[float, float]]:
     """
-    Fetch hotel data from RapidAPI Travel Advisor.
+    Extract and validate latitude/longitude from result object.
     
     Args:
-        destination: Destination city/location name
-        limit: Maximum number of hotels to return
+        result_obj: The result_object from API response
     
     Returns:
-        List of hotel dictionaries with name, rating, price, image, coordinates, address, ranking
+        Tuple of (lat, lng) as floats, or None if missing or invalid
     """
-    # Check if we should use real API
-    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
-        print(f"[INFO] Using mock data for hotels in {destination}")
-        return get_mock_hotels(destination, limit)
+    lat = result_obj.get("latitude")
+    lng = result_obj.get("longitude")
     
-    url = "https://travel-advisor.p.rapidapi.com/locations/search"
-    headers = {
-        "X-RapidAPI-Key": Config.RAPIDAPI_KEY,
-        "X-RapidAPI-Host": Config.RAPIDAPI_HOST
-    }
-    params = {
-        "query": destination,
-        "limit": 30,
-        "offset": "0",
-        "units": "km",
-        "lang": "en_US"
-    }
+    if lat is None or lng is None:
+        return None
     
-    print(f"[INFO] Fetching hotels for: {destination}")
-    data = make_api_request(url, headers, params)
+    try:
+        lat_float = float(lat)
+        lng_float = float(lng)
+    except (ValueError, TypeError):
+        return None
     
-    if not data:
-        print(f"[ERROR] API request failed for hotels, using mock data")
-        return get_mock_hotels(destination, limit)
+    if not (-90 <= lat_float <= 90 and -180 <= lng_float <= 180):
+        return None
     
-    # Parse response
-    items = data.get("data", [])
-    raw_count = len(items)
-    print(f"[INFO] Received {raw_count} raw items from API")
+    return (lat_float, lng_float)
+
+
+def extract_rating(result_obj: dict):
+    """
+    Extract rating from result object.
     
-    hotels = []
-    center_lat = None
-    center_lng = None
+    Args:
+        result_obj: The result_object from API response
     
-    # First pass: find center coordinates from first valid hotel
-    for item in items:
-        result_obj = item.get("result_object", {})
-        if not result_obj:
-            continue
-        
-        if not is_hotel_category(result_obj):
-            continue
-        
-        lat = result_obj.get("latitude")
-        lng = result_obj.get("longitude")
-        
-        if lat is not None and lng is not None:
-            try:
-                lat_float = float(lat)
-                lng_float = float(lng)
-                if -90 <= lat_float <= 90 and -180 <= lng_float <= 180:
-                    center_lat = lat_float
-                    center_lng = lng_float
-                    break
-            except (ValueError, TypeError):
-                continue
+    Returns:
+        Rating as float, or "N/A" if missing or invalid
+    """
+    rating = result_obj.get("rating")
+    if rating is None:
+        return "N/A"
+    try:
+        return float(rating)
+    except (ValueError, TypeError):
+        return "N/A"
+
+
+def _build_hotel(result_obj: dict, lat: float, lng: float) -> Optional[Hotel]:
+    """
+    Build a Hotel record from a hotel-category result object.
     
-    # Second pass: extract and filter hotels
-    for item in items:
-        result_obj = item.get("result_object", {})
-        if not result_obj:
-            continue
-        
-        # Filter by category
-        if not is_hotel_category(result_obj):
-            continue
-        
-        # Extract coordinates
-        lat = result_obj.get("latitude")
-        lng = result_obj.get("longitude")
-        
-        if lat is None or lng is None:
-            continue
-        
+    Args:
+        result_obj: The result_object from API response
+        lat, lng: Validated coordinates
+    
+    Returns:
+        Hotel record, or None if the item has no name
+    """
+    name = result_obj.get("name", "Unknown Hotel")
+    if name == "Unknown Hotel":
+        return None
+    
+    # Extract price and currency
+    price, currency = extract_price(result_obj)
+    
+    # Extract address
+    address = result_obj.get("address", "Not available")
+    if not address or address == "":
+        address = "Not available"
+    
+    # Extract ranking
+    ranking = result_obj.get("ranking_position")
+    if ranking is not None:
+        ranking = str(ranking)
+    
+    return Hotel(
+        name=name,
+        rating=extract_rating(result_obj),
+        price=price,
+        currency=currency,
+        image=extract_image_url(result_obj),
+        lat=lat,
+        lng=lng,
+        address=address,
+        ranking=ranking
+    )
+
+
+def _build_activity(result_obj: dict, lat: float, lng: float) -> Optional[Activity]:
+    """
+    Build an Activity record from a result object in the activity allowlist.
+    
+    Args:
+        result_obj: The result_object from API response
+        lat, lng: Validated coordinates
+    
+    Returns:
+        Activity record, or None if the item has no name or a disallowed category
+    """
+    name = result_obj.get("name", "Unknown Activity")
+    if name == "Unknown Activity":
+        return None
+    
+    # Extract category
+    category_obj = result_obj.get("category", {})
+    if isinstance(category_obj, dict):
+        category = category_obj.get("name", "Attraction")
+    else:
+        category = str(category_obj) if category_obj else "Attraction"
+    
+    # Filter by category allowlist
+    if not is_allowed_activity_category(category):
+        return None
+    
+    # Extract price and currency
+    price, currency = extract_price(result_obj)
+    if price == "Price unavailable":
+        price = "Free"
+    
+    # Extract duration (if available)
+    duration_minutes = result_obj.get("duration_minutes")
+    if duration_minutes is not None:
         try:
-            lat_float = float(lat)
-            lng_float = float(lng)
+            duration_minutes = int(duration_minutes)
         except (ValueError, TypeError):
+            duration_minutes = None
+    
+    # Extract booking link (if available)
+    booking_link = result_obj.get("booking_link") or result_obj.get("web_url") or None
+    
+    return Activity(
+        name=name,
+        image=extract_image_url(result_obj),
+        category=category,
+        duration_minutes=duration_minutes,
+        price=price,
+        currency=currency,
+        rating=extract_rating(result_obj),
+        lat=lat,
+        lng=lng,
+        booking_link=booking_link
+    )
+
+
+def _located_results(items):
+    """
+    Generator stage: yield (result_object, lat, lng) for items with valid coordinates.
+    
+    Args:
+        items: Iterable of locations/search items
+    """
+    for item in items:
+        result_obj = item.get("result_object") if isinstance(item, dict) else None
+        if not result_obj:
             continue
         
-        # Validate coordinates
-        if not (-90 <= lat_float <= 90 and -180 <= lng_float <= 180):
-            continue
-        
-        # Geo-filtering: exclude hotels too far from center
-        if center_lat is not None and center_lng is not None:
-            if not within_radius(center_lat, center_lng, lat_float, lng_float, HOTEL_MAX_DISTANCE_KM):
-                continue
-        
-        # Extract hotel data
-        name = result_obj.get("name", "Unknown Hotel")
-        if name == "Unknown Hotel":
+        coords = extract_coordinates(result_obj)
+        if coords is None:
             continue
+        yield result_obj, coords[0], coords[1]
+
+
+class SearchPageParser:
+    """
+    Incremental parser for one locations/search page.
+    Items can be added in batches as they are decoded, or body chunks can be fed
+    directly (make_api_request(..., parse=SearchPageParser)); the page is never
+    materialized as a whole.
+    """
+    
+    def __init__(self):
+        self.hotels = []
+        self.activities = []
+        self.hotel_center = None
+        self.center = None
+        self.items = 0
+        self._decoder = None
+    
+    def add(self, items) -> None:
+        """
+        Parse decoded items into hotel and activity candidates.
         
-        # Extract rating
-        rating = result_obj.get("rating")
-        if rating is not None:
-            try:
-                rating = float(rating)
-            except (ValueError, TypeError):
-                rating = "N/A"
-        else:
-            rating = "N/A"
-        
-        # Extract price and currency
-        price, currency = extract_price(result_obj)
-        
-        # Extract image
-        image = extract_image_url(result_obj)
+        Args:
+            items: Iterable of locations/search items
+        """
+        for result_obj, lat, lng in _located_results(self._counted(items)):
+            if self.center is None:
+                self.center = (lat, lng)
+            
+            if is_hotel_category(result_obj):
+                if self.hotel_center is None:
+                    self.hotel_center = (lat, lng)
+                hotel = _build_hotel(result_obj, lat, lng)
+                if hotel:
+                    self.hotels.append(hotel)
+            
+            activity = _build_activity(result_obj, lat, lng)
+            if activity:
+                self.activities.append(activity)
+    
+    def _counted(self, items):
+        """Generator stage counting raw items (for short-page detection)."""
+        for item in items:
+            self.items += 1
+            yield item
+    
+    def feed(self, chunk: bytes) -> None:
+        """
+        Decode and parse the "data" items completed by a body chunk.
         
-        # Extract address
-        address = result_obj.get("address", "Not available")
-        if not address or address == "":
-            address = "Not available"
+        Args:
+            chunk: Raw response body chunk
+        """
+        if self._decoder is None:
+            self._decoder = JSONArrayItemDecoder("data")
+        self.add(self._decoder.feed(chunk))
+    
+    def result(self) -> dict:
+        """
+        Finish parsing.
         
-        # Extract ranking
-        ranking = result_obj.get("ranking_position")
-        if ranking is not None:
-            ranking = str(ranking)
-        else:
-            ranking = None
+        Returns:
+            Parsed page (see parse_search_results)
         
-        hotel = {
-            "name": name,
-            "rating": rating,
-            "price": price,
-            "currency": currency,
-            "image": image,
-            "coordinates": {"lat": lat_float, "lng": lng_float},
-            "address": address,
-            "ranking": ranking
+        Raises:
+            ValueError: If a fed body was truncated or invalid
+        """
+        if self._decoder is not None:
+            self.add(self._decoder.close())
+            self._decoder = None
+        return {
+            "hotels": self.hotels,
+            "activities": self.activities,
+            "hotel_center": self.hotel_center,
+            "center": self.center,
+            "items": self.items
         }
-        
-        hotels.append(hotel)
-        
-        if len(hotels) >= limit:
-            break
-    
-    print(f"[INFO] Returning {len(hotels)} hotels after filtering")
-    return hotels if hotels else get_mock_hotels(destination, limit)
 
 
-def get_activities(destination: str, limit: int = 5) -> list[dict]:
+def parse_search_results(items) -> dict:
     """
-    Fetch activity data from RapidAPI Travel Advisor.
+    Parse locations/search items in a single pass into hotel and activity candidates.
     
     Args:
-        destination: Destination city/location name
-        limit: Maximum number of activities to return
+        items: The "data" list (or any iterable of items) from a locations/search response
     
     Returns:
-        List of activity dictionaries with name, image, category, duration_minutes, price, currency, rating, coordinates, booking_link
+        Dict with:
+            hotels: hotel dictionaries in response order (not geo-filtered)
+            activities: activity dictionaries in response order (not geo-filtered)
+            hotel_center: (lat, lng) of the first hotel with valid coordinates, or None
+            center: (lat, lng) of the first item with valid coordinates, or None
+            items: number of raw items
     """
-    # Check if we should use real API
-    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
-        print(f"[INFO] Using mock data for activities in {destination}")
-        return get_mock_activities(destination, limit)
+    parser = SearchPageParser()
+    parser.add(items)
+    return parser.result()
+
+
+def _search_request(query: str, offset: int = 0) -> tuple[dict, dict]:
+    """
+    Build headers and params for a RapidAPI locations/search request.
+    
+    Args:
+        query: Search query
+        offset: Result offset of the page to request
     
-    url = "https://travel-advisor.p.rapidapi.com/locations/search"
+    Returns:
+        Tuple of (headers, params)
+    """
     headers = {
         "X-RapidAPI-Key": Config.RAPIDAPI_KEY,
         "X-RapidAPI-Host": Config.RAPIDAPI_HOST
     }
     params = {
-        "query": f"{destination} attractions",
-        "limit": 30,
-        "offset": "0",
+        "query": query,
+        "limit": SEARCH_PAGE_SIZE,
+        "offset": str(offset),
         "units": "km",
         "lang": "en_US"
     }
+    return headers, params
+
+
+def _search_locations(query: str, offset: int = 0, deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Query the RapidAPI locations/search endpoint for one page, parsing items
+    as the response body streams in.
     
-    print(f"[INFO] Fetching activities for: {destination}")
-    data = make_api_request(url, headers, params)
+    Args:
+        query: Search query
+        offset: Result offset of the page to request
+        deadline: Optional request deadline
     
-    if not data:
-        print(f"[ERROR] API request failed for activities, using mock data")
-        return get_mock_activities(destination, limit)
+    Returns:
+        Parsed page (see parse_search_results), or None if the request failed
+    """
+    headers, params = _search_request(query, offset)
+    return make_api_request(SEARCH_URL, headers, params, parse=SearchPageParser, deadline=deadline)
+
+
+def _covers(candidates: dict, pages: int) -> bool:
+    """Check whether parsed candidates already include the first `pages` pages (or all there are)."""
+    return candidates["pages"] >= pages or candidates["exhausted"]
+
+
+def _missing_offsets(current: Optional[dict], pages: int) -> list[int]:
+    """Offsets of the pages that still have to be fetched to cover `pages` pages."""
+    have = current["pages"] if current else 0
+    return [page * SEARCH_PAGE_SIZE for page in range(have, pages)]
+
+
+def _dedupe_key(poi: Hotel | Activity) -> tuple:
+    """Identity of a POI across pages: name plus coordinates rounded as in the spatial index."""
+    if poi.lat is None or poi.lng is None:
+        return poi.name, None, None
+    return poi.name, round(poi.lat, 5), round(poi.lng, 5)
+
+
+def _merge_pages(current: Optional[dict], parsed_pages: list) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Append parsed pages, in offset order, to already parsed candidates.
+    Merging stops at the first failed page; a short page marks the search as exhausted.
     
-    # Parse response
-    items = data.get("data", [])
-    raw_count = len(items)
-    print(f"[INFO] Received {raw_count} raw items from API")
+    Args:
+        current: Candidates parsed from earlier pages, or None
+        parsed_pages: Parsed pages (None for failed requests) following current, in order
     
-    activities = []
-    center_lat = None
-    center_lng = None
-    is_mountain = is_mountain_destination(destination)
-    is_beach = is_beach_destination(destination)
+    Returns:
+        Tuple of (merged candidates or None if nothing could be fetched,
+        candidates parsed from the new pages only or None)
+    """
+    added = {"hotels": [], "activities": [], "hotel_center": None, "center": None}
+    pages = current["pages"] if current else 0
+    exhausted = False
     
-    # First pass: find center coordinates from first valid activity
-    for item in items:
-        result_obj = item.get("result_object", {})
-        if not result_obj:
-            continue
-        
-        lat = result_obj.get("latitude")
-        lng = result_obj.get("longitude")
-        
-        if lat is not None and lng is not None:
-            try:
-                lat_float = float(lat)
-                lng_float = float(lng)
-                if -90 <= lat_float <= 90 and -180 <= lng_float <= 180:
-                    center_lat = lat_float
-                    center_lng = lng_float
-                    break
-            except (ValueError, TypeError):
-                continue
-    
-    # If no center from activities, try to get from hotels (fallback)
-    if center_lat is None or center_lng is None:
-        hotels = get_hotels(destination, 1)
-        if hotels and hotels[0].get("coordinates"):
-            coords = hotels[0]["coordinates"]
-            center_lat = coords.get("lat")
-            center_lng = coords.get("lng")
-    
-    # Second pass: extract and filter activities
-    for item in items:
-        result_obj = item.get("result_object", {})
-        if not result_obj:
-            continue
-        
-        # Extract coordinates
-        lat = result_obj.get("latitude")
-        lng = result_obj.get("longitude")
-        
-        if lat is None or lng is None:
-            continue
-        
-        try:
-            lat_float = float(lat)
-            lng_float = float(lng)
-        except (ValueError, TypeError):
-            continue
-        
-        # Validate coordinates
-        if not (-90 <= lat_float <= 90 and -180 <= lng_float <= 180):
-            continue
-        
-        # Geo-filtering: exclude activities too far from center
-        if center_lat is not None and center_lng is not None:
-            if not within_radius(center_lat, center_lng, lat_float, lng_float, ACTIVITY_MAX_DISTANCE_KM):
-                continue
-        
-        # Extract name
-        name = result_obj.get("name", "Unknown Activity")
-        if name == "Unknown Activity":
-            continue
-        
-        # Extract category
-        category_obj = result_obj.get("category", {})
-        if isinstance(category_obj, dict):
-            category = category_obj.get("name", "Attraction")
-        else:
-            category = str(category_obj) if category_obj else "Attraction"
-        
-        # Filter by category allowlist
-        if not is_allowed_activity_category(category):
-            continue
-        
-        # Destination-based filtering: exclude water activities for mountain destinations
-        if is_mountain and is_water_activity(name, category):
-            continue
-        
-        # Extract rating
-        rating = result_obj.get("rating")
-        if rating is not None:
-            try:
-                rating = float(rating)
-            except (ValueError, TypeError):
-                rating = "N/A"
-        else:
-            rating = "N/A"
-        
-        # Extract price and currency
-        price, currency = extract_price(result_obj)
-        if price == "Price unavailable":
-            price = "Free"
-        
-        # Extract image
-        image = extract_image_url(result_obj)
-        
-        # Extract duration (if available)
-        duration_minutes = result_obj.get("duration_minutes")
-        if duration_minutes is not None:
-            try:
-                duration_minutes = int(duration_minutes)
-            except (ValueError, TypeError):
-                duration_minutes = None
-        else:
-            duration_minutes = None
-        
-        # Extract booking link (if available)
-        booking_link = result_obj.get("booking_link")
-        if not booking_link:
-            booking_link = result_obj.get("web_url")
-        if not booking_link:
-            booking_link = None
-        
-        activity = {
-            "name": name,
-            "image": image,
-            "category": category,
-            "duration_minutes": duration_minutes,
-            "price": price,
-            "currency": currency,
-            "rating": rating,
-            "coordinates": {"lat": lat_float, "lng": lng_float},
-            "booking_link": booking_link
-        }
-        
-        activities.append(activity)
-        
-        if len(activities) >= limit:
+    seen = {
+        kind: {_dedupe_key(poi) for poi in current[kind]} if current else set()
+        for kind in ("hotels", "activities")
+    }
+    for parsed in parsed_pages:
+        if not parsed:
             break
+        for kind in ("hotels", "activities"):
+            for poi in parsed[kind]:
+                # Neighbouring pages can overlap when upstream ranking shifts;
+                # same-named places elsewhere (chain hotels) are kept
+                key = _dedupe_key(poi)
+                if key not in seen[kind]:
+                    seen[kind].add(key)
+                    added[kind].append(poi)
+        added["hotel_center"] = added["hotel_center"] or parsed["hotel_center"]
+        added["center"] = added["center"] or parsed["center"]
+        pages += 1
+        if parsed["items"] < SEARCH_PAGE_SIZE:
+            exhausted = True
+            break
+    
+    if current is None and pages == 0:
+        return None, None
+    if current is not None and pages == current["pages"]:
+        return current, None
+    
+    merged = {
+        "hotels": (current["hotels"] if current else []) + added["hotels"],
+        "activities": (current["activities"] if current else []) + added["activities"],
+        "hotel_center": (current and current["hotel_center"]) or added["hotel_center"],
+        "center": (current and current["center"]) or added["center"],
+        "pages": pages,
+        "exhausted": exhausted
+    }
+    return merged, added
+
+
+def _fetch_search_pages(query: str, offsets: list[int], deadline: Optional[Deadline] = None) -> list:
+    """
+    Fetch several locations/search pages in parallel.
+    
+    Args:
+        query: Search query
+        offsets: Page offsets in order
+        deadline: Optional request deadline
+    
+    Returns:
+        List of JSON responses (None for failed pages) in offset order
+    """
+    if len(offsets) == 1:
+        return [_search_locations(query, offsets[0], deadline)]
+    
+    executor = get_page_executor()
+    futures = [executor.submit(_search_locations, query, offset, deadline) for offset in offsets]
+    return [future.result() for future in futures]
+
+
+def get_search_candidates(query: str, pages: int = 1, deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Fetch and parse locations/search results for a query, shared by hotels and activities.
+    Missing pages are fetched in parallel and appended to the cached candidates.
+    Parsed results are cached, added to the POI spatial index, and concurrent
+    callers share one fetch-and-parse.
+    
+    Args:
+        query: Search query (normally the destination name)
+        pages: Number of result pages (SEARCH_PAGE_SIZE items each) to cover
+        deadline: Optional request deadline
+    
+    Returns:
+        Parsed candidates (see parse_search_results) plus "pages" fetched and whether the
+        search is "exhausted", or None if the request failed.
+        The result may be shared between callers and must not be mutated.
+    """
+    cache_key = ("search", normalize_destination(query))
+    cached = _result_cache.get(cache_key)
+    if cached is not None and _covers(cached, pages):
+        return cached
+    
+    def fetch_and_parse():
+        current = _result_cache.get(cache_key)
+        if current is not None and _covers(current, pages):
+            return current
+        
+        offsets = _missing_offsets(current, pages)
+        print(f"[INFO] Searching locations for: {query} ({len(offsets)} page(s) from offset {offsets[0]})")
+        candidates, added = _merge_pages(current, _fetch_search_pages(query, offsets, deadline))
+        if added is not None:
+            print(f"[INFO] Parsed {len(added['hotels'])} hotels and {len(added['activities'])} activities from new pages")
+            _result_cache.set(cache_key, candidates)
+            index_candidates(added)
+        return candidates
+    
+    return _inflight_searches.do((cache_key, pages), fetch_and_parse)
+
+
+def _pages_for(query_key: str, kind: str, needed: int) -> int:
+    """
+    Estimate how many pages yield `needed` usable results, from past filter yields.
+    
+    Args:
+        query_key: Normalized search query
+        kind: "hotels" or "activities"
+        needed: Number of usable results still required
+    
+    Returns:
+        Page count between 1 and Config.SEARCH_MAX_PAGES
+    """
+    with _page_yield_lock:
+        per_page = _page_yields.get((query_key, kind))
+    if per_page is None:
+        return 1
+    return max(1, min(Config.SEARCH_MAX_PAGES, math.ceil(needed / max(per_page, MIN_PAGE_YIELD))))
+
+
+def _record_page_yield(query_key: str, kind: str, usable: int, pages: int) -> None:
+    """
+    Fold an observed filter yield (usable results per page) into the per-query average.
+    
+    Args:
+        query_key: Normalized search query
+        kind: "hotels" or "activities"
+        usable: Results that survived category/geo filtering
+        pages: Pages those results came from
+    """
+    observed = usable / pages
+    with _page_yield_lock:
+        previous = _page_yields.pop((query_key, kind), None)
+        _page_yields[(query_key, kind)] = (
+            observed if previous is None else previous + PAGE_YIELD_SMOOTHING * (observed - previous)
+        )
+        # Bounded like the result cache; the least recently updated entries are dropped first
+        if len(_page_yields) > Config.CACHE_MAX_ENTRIES:
+            del _page_yields[next(iter(_page_yields))]
+
+
+def _next_pages(query: str, kind: str, target: int, candidates: dict, usable: int) -> Optional[int]:
+    """
+    Record the filter yield of candidates and decide whether more pages are needed.
+    
+    Args:
+        query: Search query
+        kind: "hotels" or "activities"
+        target: Number of usable results wanted
+        candidates: Parsed candidates fetched so far
+        usable: Usable results among them
+    
+    Returns:
+        Page count to extend the search to, or None to stop
+    """
+    query_key = normalize_destination(query)
+    _record_page_yield(query_key, kind, usable, candidates["pages"])
+    
+    if usable >= target:
+        if not candidates["exhausted"]:
+            with _page_yield_lock:
+                _page_stats["early_stops"] += 1
+        return None
+    if candidates["exhausted"] or candidates["pages"] >= Config.SEARCH_MAX_PAGES:
+        return None
+    
+    with _page_yield_lock:
+        _page_stats["extensions"] += 1
+    return min(Config.SEARCH_MAX_PAGES, candidates["pages"] + _pages_for(query_key, kind, target - usable))
+
+
+def _search_until(query: str, kind: str, target: int, count_usable,
+                  deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Fetch search pages until target usable results are available, the search is
+    exhausted or SEARCH_MAX_PAGES is reached. The first request already covers the
+    number of pages past filter yields suggest, so most searches need one round.
+    
+    Args:
+        query: Search query
+        kind: "hotels" or "activities" (selects the yield statistics)
+        target: Number of usable results wanted
+        count_usable: Callable returning the usable results in parsed candidates
+        deadline: Optional request deadline; no further pages are requested once it passes
+    
+    Returns:
+        Parsed candidates, or None if the first page could not be fetched
+    """
+    candidates = get_search_candidates(query, _pages_for(normalize_destination(query), kind, target), deadline)
+    while candidates:
+        pages = _next_pages(query, kind, target, candidates, count_usable(candidates))
+        if pages is None:
+            break
+        if deadline is not None and deadline.expired:
+            deadline.note_missed(f"not fetching more {kind} pages")
+            break
+        grown = get_search_candidates(query, pages, deadline)
+        if not grown or grown["pages"] <= candidates["pages"]:
+            break
+        candidates = grown
+    return candidates
+
+
+def get_page_yield_stats() -> dict:
+    """
+    Return search paging counters.
+    
+    Returns:
+        Dict with tracked queries, searches extended with more pages, and
+        searches that stopped with more pages available
+    """
+    with _page_yield_lock:
+        return {"tracked_queries": len(_page_yields), **_page_stats}
+
+
+def _count_hotels(candidates: dict) -> int:
+    """Number of hotel candidates within HOTEL_MAX_DISTANCE_KM of the hotel center."""
+    return len(_select_within_radius(
+        candidates["hotels"], candidates["hotel_center"], HOTEL_MAX_DISTANCE_KM, len(candidates["hotels"])
+    ))
+
+
+def _select_within_radius(candidates: list[dict], center: Optional[tuple[float, float]],
+                          max_km: float, limit: int, filters: tuple = (),
+                          tally: Optional[dict] = None) -> list[dict]:
+    """
+    Select up to limit candidates within max_km of center, preserving order.
+    
+    Args:
+        candidates: Hotel or Activity records
+        center: (lat, lng) to filter around, or None to skip geo-filtering
+        max_km: Maximum distance from center in kilometers
+        limit: Maximum number of items to return
+        filters: (name, predicate) pairs applied in order after the radius check;
+            candidates for which a predicate returns True are dropped
+        tally: Optional dict accumulating (filter name, "kept"/"dropped") counts,
+            with "radius" for the geo filter and "limit" for the result cap
+    
+    Returns:
+        Filtered list of candidates
+    """
+    # Geo-filtering: exclude items too far from center, in one batch pass
+    if center is not None and candidates:
+        lats = [candidate.lat for candidate in candidates]
+        lngs = [candidate.lng for candidate in candidates]
+        in_range = within_radius_mask(center[0], center[1], lats, lngs, max_km)
+    else:
+        in_range = [True] * len(candidates)
+    
+    selected = []
+    for index, (candidate, keep) in enumerate(zip(candidates, in_range)):
+        if len(selected) >= limit:
+            if tally is not None:
+                _tally(tally, "limit", "dropped", len(candidates) - index)
+            break
+        
+        if not keep:
+            if tally is not None:
+                _tally(tally, "radius", "dropped")
+            continue
+        if tally is not None:
+            _tally(tally, "radius", "kept")
+        
+        for name, drop in filters:
+            if drop(candidate):
+                if tally is not None:
+                    _tally(tally, name, "dropped")
+                break
+            if tally is not None:
+                _tally(tally, name, "kept")
+        else:
+            selected.append(candidate)
+    
+    if tally is not None:
+        _tally(tally, "limit", "kept", len(selected))
+    return selected
+
+
+def _tally(tally: dict, name: str, outcome: str, count: int = 1) -> None:
+    """Add count to a filter tally (see _select_within_radius)."""
+    tally[(name, outcome)] = tally.get((name, outcome), 0) + count
+
+
+def _record_filters(kind: str, tally: dict) -> None:
+    """
+    Export a filter tally to the filter metrics.
+    
+    Args:
+        kind: "hotels" or "activities"
+        tally: Counts collected by _select_within_radius
+    """
+    for (name, outcome), count in tally.items():
+        filter_items.inc(kind, name, outcome, amount=count)
+
+
+def _lookup_results(kind: str, destination: str, limit: int) -> Optional[list[dict]]:
+    """
+    Look up previously fetched results in the result cache, then the fresh POI catalog.
+    Stale or soon-to-expire cached results are returned as hits and refreshed in the background.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        List of result dictionaries, or None on a miss
+    """
+    cache_key = (kind, normalize_destination(destination), limit)
+    cached, refresh = _result_cache.get_stale(cache_key)
+    if cached is not None:
+        if refresh and refresher.schedule(cache_key, lambda: _refresh_results(kind, destination, limit)):
+            print(f"[CACHE] Hit for {kind} in {destination}, refreshing in background")
+        else:
+            print(f"[CACHE] Hit for {kind} in {destination}")
+        return cached
+    
+    catalogued = _catalog_results(kind, destination, limit, Config.CATALOG_FRESH_SECONDS)
+    if catalogued is not None:
+        print(f"[CATALOG] Serving fresh {kind} for {destination}")
+        _result_cache.set(cache_key, catalogued)
+        return catalogued
+    
+    return None
+
+
+def _store_results(kind: str, destination: str, limit: int, results: list[dict],
+                   deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Cache and catalogue freshly fetched results, or fall back when there are none.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+        results: Results from the upstream fetch (empty if it failed)
+        deadline: Request deadline the fetch ran under, if any
+    
+    Returns:
+        The results, or the offline fallback (FallbackResults) if results is empty
+    """
+    if not results:
+        return FallbackResults(_offline_results(kind, destination, limit))
+    
+    if deadline is not None and deadline.missed and len(results) < limit:
+        # Cut short by the deadline: serve it, but do not cache the partial list
+        return results
+    
+    _result_cache.set((kind, normalize_destination(destination), limit), results)
+    upsert_catalog_pois(destination, RESULT_KINDS[kind][0], results)
+    return results
+
+
+def _refresh_results(kind: str, destination: str, limit: int,
+                     deadline: Optional[Deadline] = None) -> bool:
+    """
+    Re-fetch results for a stale or expiring cache entry (runs on the background refresher).
+    Search candidates that are due for refresh themselves are dropped first, so the
+    upstream is queried instead of re-filtering the old candidates.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+        deadline: Optional deadline for the fetch (see make_api_request)
+    
+    Returns:
+        True if fresh results were cached
+    """
+    queries = [destination] if kind == "hotels" else [destination, f"{destination} attractions"]
+    for query in queries:
+        search_key = ("search", normalize_destination(query))
+        if _result_cache.refresh_due(search_key):
+            _result_cache.delete(search_key)
+    
+    fetch = _fetch_hotels if kind == "hotels" else _fetch_activities
+    results = fetch(destination, limit, deadline)
+    if not results:
+        print(f"[WARNING] Refresh of {kind} for {destination} failed, keeping cached results")
+        return False
+    _store_results(kind, destination, limit, results, deadline)
+    # A partial list cut short by the deadline is not cached (see _store_results)
+    return deadline is None or not deadline.missed or len(results) >= limit
+
+
+def warm_results(kind: str, destination: str, limit: int) -> Optional[bool]:
+    """
+    Make sure fresh upstream results for a destination are cached (used by the pre-warmer).
+    Entries that are fresh and not yet due for refresh are left alone. Upstream calls
+    run at background priority: each takes only spare RapidAPI quota and is shed
+    rather than queued, so warming never delays user requests.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        True if fresh results are cached, False if fetching them failed,
+        None if the real API is not in use
+    """
+    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
+        return None
+    if not _result_cache.refresh_due((kind, normalize_destination(destination), limit)):
+        return True
+    return _refresh_results(kind, destination, limit, Deadline(float("inf"), background=True))
+
+
+def get_fallback_results(kind: str, destination: str, limit: int) -> list[dict]:
+    """
+    Serve results without waiting on the upstream, for callers out of time.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        Cached (possibly stale) results if available, else catalogued or mock data
+        as FallbackResults
+    """
+    cached, _ = _result_cache.get_stale((kind, normalize_destination(destination), limit))
+    if cached is not None:
+        return cached
+    return FallbackResults(_offline_results(kind, destination, limit))
+
+
+def _offline_results(kind: str, destination: str, limit: int) -> list[dict]:
+    """
+    Serve results without the upstream API: catalogued data if recent enough, else mock data.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        List of result dictionaries
+    """
+    catalogued = _catalog_results(kind, destination, limit, Config.CATALOG_FALLBACK_MAX_AGE)
+    if catalogued is not None:
+        print(f"[CATALOG] Serving catalogued {kind} for {destination}")
+        fallbacks.inc(kind, "catalog")
+        return catalogued
+    
+    print(f"[INFO] Using mock data for {kind} in {destination}")
+    fallbacks.inc(kind, "mock")
+    return RESULT_KINDS[kind][1](destination, limit)
+
+
+def _catalog_results(kind: str, destination: str, limit: int, max_age: float) -> Optional[list]:
+    """
+    Read catalogued results as compact records.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+        max_age: Maximum age in seconds of the last catalog fetch
+    
+    Returns:
+        List of Hotel/Activity records, or None on a miss
+    """
+    poi_type, _, record_type = RESULT_KINDS[kind]
+    catalogued = get_catalog_pois(destination, poi_type, limit, max_age)
+    if catalogued is None:
+        return None
+    return [record_type.from_dict(poi) for poi in catalogued]
+
+
+def get_hotels(destination: str, limit: int = 5, deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Fetch hotel data from RapidAPI Travel Advisor.
+    Successful results are cached per normalized destination and limit and stored
+    in the POI catalog, which is served while fresh and used as an offline fallback.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of hotels to return
+        deadline: Optional request deadline; upstream work is cut short to meet it
+    
+    Returns:
+        List of hotel dictionaries with name, rating, price, image, coordinates, address, ranking
+    """
+    # Check if we should use real API
+    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
+        return _offline_results("hotels", destination, limit)
+    
+    cached = _lookup_results("hotels", destination, limit)
+    if cached is not None:
+        return cached
+    
+    return _store_results("hotels", destination, limit, _fetch_hotels(destination, limit, deadline), deadline)
+
+
+def _fetch_hotels(destination: str, limit: int, deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Select hotels from the shared search candidates without consulting the result cache.
+    Further search pages are fetched while fewer than limit hotels pass filtering.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of hotels to return
+        deadline: Optional request deadline
+    
+    Returns:
+        List of hotel dictionaries (empty if the request failed or nothing matched)
+    """
+    candidates = _search_until(destination, "hotels", limit, _count_hotels, deadline)
+    if not candidates:
+        print(f"[ERROR] API request failed for hotels, using fallback data")
+        return []
+    
+    hotels = _select_hotels(candidates, limit)
+    
+    print(f"[INFO] Returning {len(hotels)} hotels after filtering")
+    return hotels
+
+
+def _select_hotels(candidates: dict, limit: int) -> list[dict]:
+    """
+    Final hotel selection from search candidates, recorded in the filter metrics.
+    
+    Args:
+        candidates: Parsed search candidates
+        limit: Maximum number of hotels to return
+    
+    Returns:
+        List of hotel records
+    """
+    tally = {}
+    with _filter_seconds.time():
+        hotels = _select_within_radius(
+            candidates["hotels"], candidates["hotel_center"], HOTEL_MAX_DISTANCE_KM, limit, tally=tally
+        )
+    _record_filters("hotels", tally)
+    return hotels
+
+
+def get_activities(destination: str, limit: int = 5, deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Fetch activity data from RapidAPI Travel Advisor.
+    Successful results are cached per normalized destination and limit and stored
+    in the POI catalog, which is served while fresh and used as an offline fallback.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of activities to return
+        deadline: Optional request deadline; upstream work is cut short to meet it
+    
+    Returns:
+        List of activity dictionaries with name, image, category, duration_minutes, price, currency, rating, coordinates, booking_link
+    """
+    # Check if we should use real API
+    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
+        return _offline_results("activities", destination, limit)
+    
+    cached = _lookup_results("activities", destination, limit)
+    if cached is not None:
+        return cached
+    
+    return _store_results(
+        "activities", destination, limit, _fetch_activities(destination, limit, deadline), deadline
+    )
+
+
+def _fetch_activities(destination: str, limit: int, deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Select activities from the shared search candidates without consulting the result cache.
+    Uses the destination search shared with get_hotels first (paging while it yields
+    too few activities), and only queries "<destination> attractions" when that
+    does not yield enough activities.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of activities to return
+        deadline: Optional request deadline
+    
+    Returns:
+        List of activity dictionaries (empty if the request failed or nothing matched)
+    """
+    base = _search_until(destination, "activities", limit, _activity_counter(destination), deadline)
+    activities = _select_activities(destination, limit, base)
+    
+    if len(activities) < limit:
+        attractions = _search_until(
+            f"{destination} attractions", "activities", limit - len(activities),
+            _activity_counter(destination, base, len(activities)), deadline
+        )
+        if attractions:
+            activities = _select_activities(destination, limit, base, attractions)
+        elif not base:
+            print(f"[ERROR] API request failed for activities, using fallback data")
+            return []
+    
+    print(f"[INFO] Returning {len(activities)} activities after filtering")
+    return activities
+
+
+def _select_activities(destination: str, limit: int, base: Optional[dict],
+                       attractions: Optional[dict] = None) -> list[dict]:
+    """
+    Final activity selection (see _collect_activities), recorded in the filter metrics.
+    Only the selection that is returned is recorded, not the counting passes.
+    
+    Returns:
+        List of activity records
+    """
+    tally = {}
+    with _filter_seconds.time():
+        activities = _collect_activities(destination, limit, base, attractions, tally)
+    _record_filters("activities", tally)
+    return activities
+
+
+def _activity_counter(destination: str, base: Optional[dict] = None, base_count: int = 0):
+    """
+    Build a count_usable callable for activity searches (see _search_until).
+    
+    Args:
+        destination: Destination city/location name
+        base: Parsed destination search when counting an attractions search, else None
+        base_count: Usable activities already taken from base
+    
+    Returns:
+        Callable mapping parsed candidates to the number of usable activities they add
+    """
+    if base is None:
+        return lambda candidates: len(
+            _collect_activities(destination, len(candidates["activities"]), candidates)
+        )
+    return lambda candidates: len(
+        _collect_activities(destination, base_count + len(candidates["activities"]), base, candidates)
+    ) - base_count
+
+
+def _collect_activities(destination: str, limit: int, base: Optional[dict],
+                        attractions: Optional[dict] = None, tally: Optional[dict] = None) -> list[dict]:
+    """
+    Select activities from the destination search, topped up from the attractions search.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of activities to return
+        base: Parsed candidates for the destination search, or None
+        attractions: Parsed candidates for the "<destination> attractions" search, or None
+        tally: Optional filter tally (see _select_within_radius)
+    
+    Returns:
+        List of activity dictionaries
+    """
+    # Destination-based filtering: exclude water activities for mountain destinations
+    filters = ()
+    if is_mountain_destination(destination):
+        filters = (("mountain_water", lambda activity: is_water_activity(activity.name, activity.category)),)
+    
+    center = None
+    activities = []
+    
+    if base:
+        # Center from the destination search, falling back to its first hotel
+        center = base["center"] or base["hotel_center"]
+        activities = _select_within_radius(
+            base["activities"], center, ACTIVITY_MAX_DISTANCE_KM, limit, filters, tally
+        )
+    
+    if attractions and len(activities) < limit:
+        if center is None:
+            center = attractions["center"] or attractions["hotel_center"]
+        
+        seen = {activity.name for activity in activities}
+        activities += _select_within_radius(
+            attractions["activities"], center, ACTIVITY_MAX_DISTANCE_KM,
+            limit - len(activities),
+            (("duplicate", lambda activity: activity.name in seen),) + filters,
+            tally
+        )
+    
+    return activities
+
+
+# ---------------------------------------------------------------------------
+# Async variants
+#
+# These mirror the sync API for ASGI serving: upstream I/O and backoff are
+# awaited instead of blocking a thread, while parsing, filtering and the
+# result cache are shared with the sync functions above. Fresh in-process
+# cache hits are served inline; anything that may touch the shared cache
+# backend or the SQLite POI catalog runs in a worker thread, so a slow or
+# locked store never stalls the event loop.
+# ---------------------------------------------------------------------------
+
+async def _async_cache_get(key):
+    """Result cache get() that only leaves the event loop when L1 cannot answer."""
+    cached = _result_cache.get_local(key)
+    if cached is not None:
+        return cached
+    return await asyncio.to_thread(_result_cache.get, key)
+
+
+async def _async_lookup_results(kind: str, destination: str, limit: int) -> Optional[list[dict]]:
+    """
+    Async equivalent of _lookup_results.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        List of result dictionaries, or None on a miss
+    """
+    cached = _result_cache.get_local((kind, normalize_destination(destination), limit))
+    if cached is not None:
+        print(f"[CACHE] Hit for {kind} in {destination}")
+        return cached
+    return await asyncio.to_thread(_lookup_results, kind, destination, limit)
+
+
+async def async_get_fallback_results(kind: str, destination: str, limit: int) -> list[dict]:
+    """
+    Async equivalent of get_fallback_results.
+    
+    Args:
+        kind: "hotels" or "activities"
+        destination: Destination city/location name
+        limit: Number of results requested
+    
+    Returns:
+        Cached (possibly stale) results if available, else catalogued or mock data
+    """
+    cached = _result_cache.get_local((kind, normalize_destination(destination), limit))
+    if cached is not None:
+        return cached
+    return await asyncio.to_thread(get_fallback_results, kind, destination, limit)
+
+
+async def async_make_api_request(url: str, headers: dict, params: dict, parse=None,
+                                 deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Async equivalent of make_api_request.
+    Concurrent calls with identical url and params share a single upstream request.
+    
+    Args:
+        url: API endpoint URL
+        headers: Request headers
+        params: Request parameters
+        parse: Optional streaming parser class (see make_api_request)
+        deadline: Optional request deadline (see make_api_request)
+    
+    Returns:
+        JSON response as dict (or the parser's result), or None if all retries fail
+    """
+    # Background calls may be shed where a user's would queue, so the two never share a call
+    key = (url, tuple(sorted((str(k), str(v)) for k, v in params.items())), parse, _is_background(deadline))
+    return await _async_inflight_requests.do(
+        key, lambda: _async_request_with_retries(url, headers, params, parse, deadline)
+    )
+
+
+async def _async_request_with_retries(url: str, headers: dict, params: dict, parse=None,
+                                      deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Perform the upstream GET with retry logic, awaiting backoff instead of sleeping.
+    
+    Args:
+        url: API endpoint URL
+        headers: Request headers
+        params: Request parameters
+        parse: Optional streaming parser class (see make_api_request)
+        deadline: Optional request deadline (see make_api_request)
+    
+    Returns:
+        JSON response as dict (or the parser's result), or None if all retries fail
+    """
+    client = get_async_client()
+    
+    for attempt in range(MAX_RETRIES):
+        if _attempt_timeout(deadline) is None:
+            return None
+        if not rapidapi_breaker.allow():
+            print(f"[WARNING] RapidAPI circuit open, using fallback")
+            return None
+        if Config.RAPIDAPI_RATE_LIMIT_ENABLED and not await rapidapi_limiter.async_acquire(*_quota_args(deadline)):
+            _quota_shed(deadline)
+            rapidapi_breaker.release()
+            return None
+        timeout = _attempt_timeout(deadline)
+        if timeout is None:
+            rapidapi_breaker.release()
+            return None
+        started = time.perf_counter()
+        try:
+            if parse is not None:
+                async with client.stream("GET", url, headers=headers, params=params, timeout=timeout) as response:
+                    if response.status_code == 200:
+                        parse_time = 0.0
+                        parser = parse()
+                        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            mark = time.perf_counter()
+                            parser.feed(chunk)
+                            parse_time += time.perf_counter() - mark
+                        result = parser.result()
+                        rapidapi_breaker.record_success(time.perf_counter() - started)
+                        _record_attempt(200, started, parse_time)
+                        return result
+            else:
+                response = await client.get(url, headers=headers, params=params, timeout=timeout)
+            if response.status_code == 200:
+                mark = time.perf_counter()
+                result = response.json()
+                parse_time = time.perf_counter() - mark
+                rapidapi_breaker.record_success(time.perf_counter() - started)
+                _record_attempt(200, started, parse_time)
+                return result
+            elif response.status_code == 429:
+                # Quota, not upstream health: the breaker counts it as a completed call.
+                # Empty the shared bucket so other workers back off too,
+                # then wait longer before retry
+                rapidapi_breaker.record_success(time.perf_counter() - started)
+                _record_attempt(429, started)
+                await rapidapi_limiter.async_penalize()
+                wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt] * 2, deadline)
+                if wait_time is None:
+                    break
+                print(f"[WARNING] Rate limited, waiting {wait_time}s before retry {attempt + 1}/{MAX_RETRIES}")
+                await _async_backoff("rate_limited", wait_time)
+            else:
+                print(f"[WARNING] API returned status {response.status_code}")
+                rapidapi_breaker.record_failure()
+                _record_attempt(response.status_code, started)
+                wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+                if wait_time is None:
+                    break
+                await _async_backoff("status", wait_time)
+        except asyncio.CancelledError:
+            # Client gone or deadline task cancelled: no verdict on the upstream
+            rapidapi_breaker.release()
+            raise
+        except httpx.TimeoutException:
+            print(f"[WARNING] Request timeout (attempt {attempt + 1}/{MAX_RETRIES})")
+            _record_attempt("timeout", started)
+            if _deadline_cut(timeout, deadline):
+                rapidapi_breaker.release()
+                break
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            await _async_backoff("timeout", wait_time)
+        except httpx.HTTPError as e:
+            print(f"[WARNING] Request error: {str(e)} (attempt {attempt + 1}/{MAX_RETRIES})")
+            _record_attempt("error", started)
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            await _async_backoff("error", wait_time)
+        except ValueError as e:
+            # Truncated or malformed body: transient like a dropped connection
+            print(f"[WARNING] Invalid response body: {str(e)} (attempt {attempt + 1}/{MAX_RETRIES})")
+            _record_attempt("invalid_body", started)
+            rapidapi_breaker.record_failure()
+            wait_time = _retry_wait(attempt, RETRY_BACKOFFS[attempt], deadline)
+            if wait_time is None:
+                break
+            await _async_backoff("invalid_body", wait_time)
+        except Exception as e:
+            print(f"[ERROR] Unexpected error: {str(e)}")
+            _record_attempt("error", started)
+            rapidapi_breaker.record_failure()
+            break
+    
+    return None
+
+
+async def _async_search_locations(query: str, offset: int = 0,
+                                  deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Async equivalent of _search_locations.
+    
+    Args:
+        query: Search query
+        offset: Result offset of the page to request
+        deadline: Optional request deadline
+    
+    Returns:
+        Parsed page (see parse_search_results), or None if the request failed
+    """
+    headers, params = _search_request(query, offset)
+    return await async_make_api_request(SEARCH_URL, headers, params, parse=SearchPageParser, deadline=deadline)
+
+
+async def async_get_search_candidates(query: str, pages: int = 1,
+                                      deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Async equivalent of get_search_candidates; missing pages are fetched concurrently.
+    
+    Args:
+        query: Search query (normally the destination name)
+        pages: Number of result pages to cover
+        deadline: Optional request deadline
+    
+    Returns:
+        Parsed candidates (see get_search_candidates), or None if the request failed
+    """
+    cache_key = ("search", normalize_destination(query))
+    cached = await _async_cache_get(cache_key)
+    if cached is not None and _covers(cached, pages):
+        return cached
+    
+    async def fetch_and_parse():
+        current = await _async_cache_get(cache_key)
+        if current is not None and _covers(current, pages):
+            return current
+        
+        offsets = _missing_offsets(current, pages)
+        print(f"[INFO] Searching locations for: {query} ({len(offsets)} page(s) from offset {offsets[0]})")
+        responses = await asyncio.gather(*(_async_search_locations(query, offset, deadline) for offset in offsets))
+        candidates, added = _merge_pages(current, list(responses))
+        if added is not None:
+            print(f"[INFO] Parsed {len(added['hotels'])} hotels and {len(added['activities'])} activities from new pages")
+            await asyncio.to_thread(_result_cache.set, cache_key, candidates)
+            index_candidates(added)
+        return candidates
+    
+    return await _async_inflight_searches.do((cache_key, pages), fetch_and_parse)
+
+
+async def _async_search_until(query: str, kind: str, target: int, count_usable,
+                              deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """
+    Async equivalent of _search_until.
+    
+    Args:
+        query: Search query
+        kind: "hotels" or "activities"
+        target: Number of usable results wanted
+        count_usable: Callable returning the usable results in parsed candidates
+        deadline: Optional request deadline
+    
+    Returns:
+        Parsed candidates, or None if the first page could not be fetched
+    """
+    candidates = await async_get_search_candidates(
+        query, _pages_for(normalize_destination(query), kind, target), deadline
+    )
+    while candidates:
+        pages = _next_pages(query, kind, target, candidates, count_usable(candidates))
+        if pages is None:
+            break
+        if deadline is not None and deadline.expired:
+            deadline.note_missed(f"not fetching more {kind} pages")
+            break
+        grown = await async_get_search_candidates(query, pages, deadline)
+        if not grown or grown["pages"] <= candidates["pages"]:
+            break
+        candidates = grown
+    return candidates
+
+
+async def async_get_hotels(destination: str, limit: int = 5, deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Async equivalent of get_hotels.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of hotels to return
+        deadline: Optional request deadline
+    
+    Returns:
+        List of hotel dictionaries
+    """
+    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
+        return await asyncio.to_thread(_offline_results, "hotels", destination, limit)
+    
+    cached = await _async_lookup_results("hotels", destination, limit)
+    if cached is not None:
+        return cached
+    
+    hotels = []
+    candidates = await _async_search_until(destination, "hotels", limit, _count_hotels, deadline)
+    if candidates:
+        hotels = _select_hotels(candidates, limit)
+        print(f"[INFO] Returning {len(hotels)} hotels after filtering")
+    else:
+        print(f"[ERROR] API request failed for hotels, using fallback data")
+    
+    return await asyncio.to_thread(_store_results, "hotels", destination, limit, hotels, deadline)
+
+
+async def async_get_activities(destination: str, limit: int = 5,
+                               deadline: Optional[Deadline] = None) -> list[dict]:
+    """
+    Async equivalent of get_activities.
+    
+    Args:
+        destination: Destination city/location name
+        limit: Maximum number of activities to return
+        deadline: Optional request deadline
+    
+    Returns:
+        List of activity dictionaries
+    """
+    if not Config.USE_REAL_API or not Config.RAPIDAPI_KEY:
+        return await asyncio.to_thread(_offline_results, "activities", destination, limit)
+    
+    cached = await _async_lookup_results("activities", destination, limit)
+    if cached is not None:
+        return cached
+    
+    base = await _async_search_until(destination, "activities", limit, _activity_counter(destination), deadline)
+    activities = _select_activities(destination, limit, base)
+    if len(activities) < limit:
+        attractions = await _async_search_until(
+            f"{destination} attractions", "activities", limit - len(activities),
+            _activity_counter(destination, base, len(activities)), deadline
+        )
+        if attractions:
+            activities = _select_activities(destination, limit, base, attractions)
     
     print(f"[INFO] Returning {len(activities)} activities after filtering")
-    return activities if activities else get_mock_activities(destination, limit)
+    return await asyncio.to_thread(_store_results, "activities", destination, limit, activities, deadline)
 
 
 """
@@ -0,0 +1,235 @@
+"""
+In-process TTL + LRU cache used by the service layer.
+Entries expire after a per-entry TTL and are evicted least-recently-used
+once the cache exceeds its entry or byte budget. Optionally, expired entries
+are kept for a stale window so callers can serve them while revalidating.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the in-memory footprint of a cached value in bytes.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Approximate size in bytes (length of its JSON encoding)
+    """
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=_encode_fallback).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _encode_fallback(value: Any):
+    """Encode objects with a to_dict() wire form as that dict, anything else as str."""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+class TTLCache:
+    """Thread-safe cache with per-entry TTL and size/byte-based LRU eviction."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 0, default_ttl: float = 900,
+                 stale_ttl: float = 0, refresh_ahead: float = 0.0):
+        """
+        Args:
+            max_entries: Maximum number of entries (0 disables the limit)
+            max_bytes: Maximum total estimated size in bytes (0 disables the limit)
+            default_ttl: Default time-to-live in seconds for new entries
+            stale_ttl: Seconds an expired entry is still returned by get_stale
+            refresh_ahead: Fraction of the TTL before expiry from which get_stale
+                already reports an entry as due for refresh
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self._entries = OrderedDict()  # key -> (value, expires_at, size, refresh_at)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, returning default if it is missing or expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, _, _ = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                # Kept for get_stale until the stale window ends
+                if expires_at + self.stale_ttl <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> tuple[Any, bool]:
+        """
+        Look up a key for stale-while-revalidate: expired entries are still
+        returned during the stale window.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Tuple of (cached value or default, whether the caller should refresh it:
+            True when the value is stale or within the refresh-ahead window)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default, False
+
+            value, expires_at, _, refresh_at = entry
+            now = time.monotonic()
+            if expires_at + self.stale_ttl <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default, False
+
+            self._entries.move_to_end(key)
+            if expires_at <= now:
+                self.stale_hits += 1
+                return value, True
+            self.hits += 1
+            return value, refresh_at <= now
+
+    def refresh_due(self, key: Hashable) -> bool:
+        """
+        Check, without counting a lookup, whether an entry is missing, stale or
+        within the refresh-ahead window.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry should be refreshed before being relied on
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is None or entry[3] <= time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        """
+        Store a value, evicting least-recently-used entries if over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (defaults to default_ttl)
+            size: Size in bytes to account for the value (defaults to estimate_size)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if not self.max_bytes:
+            size = 0
+        elif size is None:
+            size = estimate_size(value)
+
+        # A single value larger than the whole budget is never cached
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            now = time.monotonic()
+            self._entries[key] = (value, now + ttl, size, now + ttl * (1 - self.refresh_ahead))
+            self._total_bytes += size
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache counters and current usage.
+
+        Returns:
+            Dict with entries, bytes, hits, stale_hits, misses, evictions,
+            expirations and hit_ratio (stale hits count as hits)
+        """
+        with self._lock:
+            hits = self.hits + self.stale_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry; caller must hold the lock."""
+        _, _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Evict LRU entries until within budget; caller must hold the lock."""
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
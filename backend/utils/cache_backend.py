@@ -0,0 +1,436 @@
+"""
+Shared (L2) cache backends.
+A backend stores opaque serialized payloads under string keys with a TTL, so
+every worker process can read what another one fetched. Two stores are
+provided: a SQLite file on the local host and a Redis-protocol server (Redis,
+Valkey, KeyDB or any local stand-in that speaks RESP). Backend errors never
+reach callers as failures: the backend is skipped for a short cooldown and
+the in-process cache keeps serving.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+from config.settings import Config
+
+
+# Field naming the record type of an encoded object
+TYPE_FIELD = "__type__"
+
+# Expired rows are purged (and the entry limit enforced) every this many writes
+SQLITE_PURGE_EVERY = 256
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at);
+"""
+
+
+class CacheBackendError(Exception):
+    """Raised when the shared cache cannot be reached or rejects a command."""
+
+
+class JSONCodec:
+    """
+    JSON serialization for cached values.
+    Records (objects with to_dict/from_dict) are tagged with their type so they
+    decode back to the same class; everything else must be JSON-serializable.
+    """
+
+    def __init__(self, record_types: Optional[dict[str, type]] = None):
+        """
+        Args:
+            record_types: Tag -> record class for objects stored inside values
+        """
+        self._types = record_types or {}
+        self._tags = {cls: tag for tag, cls in self._types.items()}
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value.
+
+        Raises:
+            TypeError: If the value contains an unregistered object
+        """
+        return json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), default=self._default
+        ).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Any:
+        """
+        Deserialize a payload produced by dumps.
+
+        Raises:
+            ValueError: If the payload is not valid JSON
+        """
+        if not self._types:
+            return json.loads(payload)
+        return json.loads(payload, object_hook=self._object_hook)
+
+    def _default(self, value: Any):
+        tag = self._tags.get(type(value))
+        if tag is None:
+            raise TypeError(f"Cannot cache object of type {type(value).__name__}")
+        return {TYPE_FIELD: tag, **value.to_dict()}
+
+    def _object_hook(self, obj: dict):
+        cls = self._types.get(obj.get(TYPE_FIELD)) if TYPE_FIELD in obj else None
+        return cls.from_dict(obj) if cls is not None else obj
+
+
+class CacheBackend:
+    """
+    Interface of a shared cache store.
+    Subclasses implement _get, _set, _delete, _clear and _entries; the public
+    methods add error handling and the cooldown after failures.
+    """
+
+    name = "backend"
+
+    def __init__(self, retry_seconds: float = 5.0):
+        """
+        Args:
+            retry_seconds: How long the backend is skipped after an error
+        """
+        self.retry_seconds = retry_seconds
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self.failures = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read a payload.
+
+        Returns:
+            Payload, or None if the key is missing or expired
+
+        Raises:
+            CacheBackendError: If the store failed (or is cooling down after a failure)
+        """
+        return self._call(self._get, key)
+
+    def set(self, key: str, payload: bytes, ttl: float) -> bool:
+        """
+        Store a payload for ttl seconds.
+
+        Returns:
+            False if the store failed
+        """
+        return self._try(self._set, key, payload, ttl)
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove a key.
+
+        Returns:
+            False if the store failed
+        """
+        return self._try(self._delete, key)
+
+    def clear(self, prefix: str) -> bool:
+        """
+        Remove every key starting with prefix.
+
+        Returns:
+            False if the store failed
+        """
+        return self._try(self._clear, prefix)
+
+    def stats(self) -> dict:
+        """
+        Return backend status.
+
+        Returns:
+            Dict with backend name, availability, failure count and stored entries
+            (None if unknown or the store is unreachable)
+        """
+        available = time.monotonic() >= self._down_until
+        entries = None
+        if available:
+            try:
+                entries = self._call(self._entries)
+            except CacheBackendError:
+                available = False
+        return {"backend": self.name, "available": available, "failures": self.failures, "entries": entries}
+
+    def _call(self, fn, *args):
+        if time.monotonic() < self._down_until:
+            raise CacheBackendError(f"{self.name} cache unavailable")
+        try:
+            return fn(*args)
+        except (CacheBackendError, OSError, sqlite3.Error) as e:
+            with self._lock:
+                self.failures += 1
+                self._down_until = time.monotonic() + self.retry_seconds
+            print(f"[WARNING] Shared {self.name} cache failed, skipping it for {self.retry_seconds:g}s: {str(e)}")
+            raise CacheBackendError(str(e)) from e
+
+    def _try(self, fn, *args) -> bool:
+        try:
+            self._call(fn, *args)
+        except CacheBackendError:
+            return False
+        return True
+
+    def _get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, key: str, payload: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _clear(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    def _entries(self) -> Optional[int]:
+        return None
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared cache in a SQLite file, for worker processes on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, max_entries: int = 0, timeout: float = 0.25,
+                 retry_seconds: float = 5.0):
+        """
+        Args:
+            db_path: SQLite database path
+            max_entries: Maximum stored rows, soonest-expiring dropped first (0 disables the limit)
+            timeout: Seconds to wait for a locked database
+            retry_seconds: How long the backend is skipped after an error
+        """
+        super().__init__(retry_seconds)
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SQLITE_SCHEMA)
+        self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, payload: bytes, ttl: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, payload, time.time() + ttl)
+        )
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % SQLITE_PURGE_EVERY == 0
+        if purge:
+            self._purge(conn)
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Drop expired rows, then the soonest-expiring ones beyond max_entries."""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY expires_at "
+                "LIMIT max(0, (SELECT COUNT(*) FROM cache_entries) - ?))",
+                (self.max_entries,)
+            )
+
+    def _delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _clear(self, prefix: str) -> None:
+        # Range scan on the primary key instead of LIKE (no escaping of the prefix)
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+        )
+
+    def _entries(self) -> Optional[int]:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache on a Redis-protocol server, for workers on several hosts.
+    Speaks RESP directly over one socket per thread, so no client library is needed.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 0.25, key_prefix: str = "",
+                 retry_seconds: float = 5.0):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            timeout: Socket connect/read timeout in seconds
+            key_prefix: Prepended to every key (lets several apps share a server)
+            retry_seconds: How long the backend is skipped after an error
+        """
+        super().__init__(retry_seconds)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self._local = threading.local()
+
+    def _connection(self):
+        """Return this thread's (socket, reader), connecting if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        self._local.conn = conn
+        try:
+            if self.password:
+                self._command("AUTH", self.password)
+            if self.db:
+                self._command("SELECT", self.db)
+        except Exception:
+            self._disconnect()
+            raise
+        return conn
+
+    def _disconnect(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def _command(self, *args):
+        """Send one command and return its decoded reply."""
+        sock, reader = self._connection()
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except (OSError, CacheBackendError):
+            # The reply may be partly unread: drop the connection so the next
+            # command does not read this one's leftovers
+            self._disconnect()
+            raise
+        except ValueError as e:
+            self._disconnect()
+            raise CacheBackendError(f"malformed reply: {str(e)}") from e
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise CacheBackendError("connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise CacheBackendError(body.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            if len(data) != length + 2:
+                raise CacheBackendError("connection closed by server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply(reader) for _ in range(length)]
+        raise CacheBackendError(f"unexpected reply {line[:20]!r}")
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", self.key_prefix + key)
+
+    def _set(self, key: str, payload: bytes, ttl: float) -> None:
+        self._command("SET", self.key_prefix + key, payload, "PX", max(1, int(ttl * 1000)))
+
+    def _delete(self, key: str) -> None:
+        self._command("DEL", self.key_prefix + key)
+
+    def _clear(self, prefix: str) -> None:
+        cursor = "0"
+        while True:
+            cursor, keys = self._command("SCAN", cursor, "MATCH", self.key_prefix + prefix + "*", "COUNT", 500)
+            if keys:
+                self._command("DEL", *keys)
+            cursor = cursor.decode("utf-8") if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                return
+
+    def _entries(self) -> Optional[int]:
+        return self._command("DBSIZE")
+
+
+_shared_backend = None
+_shared_backend_lock = threading.Lock()
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """
+    Return the process-wide L2 backend selected by Config.CACHE_BACKEND.
+
+    Returns:
+        SQLite or Redis backend, or None for "memory" (in-process caches only)
+    """
+    global _shared_backend
+    if _shared_backend is not None or Config.CACHE_BACKEND == "memory":
+        return _shared_backend
+
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            if Config.CACHE_BACKEND == "sqlite":
+                _shared_backend = SQLiteCacheBackend(
+                    Config.CACHE_DB_PATH,
+                    max_entries=Config.CACHE_L2_MAX_ENTRIES,
+                    timeout=Config.CACHE_L2_TIMEOUT_SECONDS,
+                    retry_seconds=Config.CACHE_L2_RETRY_SECONDS
+                )
+            elif Config.CACHE_BACKEND == "redis":
+                _shared_backend = RedisCacheBackend(
+                    Config.CACHE_REDIS_URL,
+                    timeout=Config.CACHE_L2_TIMEOUT_SECONDS,
+                    key_prefix=Config.CACHE_REDIS_PREFIX,
+                    retry_seconds=Config.CACHE_L2_RETRY_SECONDS
+                )
+            else:
+                print(f"[WARNING] Unknown CACHE_BACKEND {Config.CACHE_BACKEND!r}, using in-process caches only")
+        return _shared_backend
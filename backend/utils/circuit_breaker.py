@@ -0,0 +1,177 @@
+"""
+Circuit breaker for upstream dependencies.
+Tracks call outcomes over a sliding time window and opens when the share of
+failed or slow calls gets too high. While open, callers skip the upstream and
+go straight to their fallback; after a cool-down a limited number of trial
+calls (half-open) decide whether to close again or stay open.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe error-rate and latency circuit breaker for one upstream."""
+
+    def __init__(self, name: str, failure_ratio: float = 0.5, min_calls: int = 5,
+                 window_seconds: float = 60, slow_call_seconds: float = 5,
+                 open_seconds: float = 30, half_open_calls: int = 1, enabled: bool = True):
+        """
+        Args:
+            name: Upstream name (for logs and stats)
+            failure_ratio: Share of failed or slow calls in the window that opens the breaker
+            min_calls: Minimum calls in the window before the ratio is evaluated
+            window_seconds: Length of the sliding outcome window
+            slow_call_seconds: Calls slower than this count as failures
+            open_seconds: Time the breaker stays open before allowing trial calls
+            half_open_calls: Concurrent trial calls allowed while half-open
+            enabled: When False every call is allowed and nothing is recorded
+        """
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.enabled = enabled
+        self._state = CLOSED
+        self._outcomes = deque()  # (timestamp, failed)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go to the upstream.
+
+        Returns:
+            True to make the call (which must then be recorded or released),
+            False to use the fallback
+        """
+        if not self.enabled:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    self.short_circuited += 1
+                    return False
+                self._state = HALF_OPEN
+                self._trials = 0
+                print(f"[INFO] Circuit for {self.name} half-open, sending trial call")
+
+            if self._state == HALF_OPEN:
+                # A trial that was neither recorded nor released frees its slot after open_seconds
+                if self._trials >= self.half_open_calls and now - self._trial_started < self.open_seconds:
+                    self.short_circuited += 1
+                    return False
+                self._trials += 1
+                self._trial_started = now
+            return True
+
+    def record_success(self, elapsed: float) -> None:
+        """
+        Record a completed call.
+
+        Args:
+            elapsed: Call duration in seconds (slow calls count as failures)
+        """
+        if not self.enabled:
+            return
+        if elapsed >= self.slow_call_seconds:
+            print(f"[WARNING] Slow call to {self.name} ({elapsed:.1f}s)")
+            self.record_failure()
+            return
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                print(f"[INFO] Circuit for {self.name} closed")
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._failures = 0
+                return
+            self._add_outcome(False)
+
+    def record_failure(self) -> None:
+        """Record a failed call (error, timeout or unexpected status)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            if self._state == OPEN:
+                return
+            self._add_outcome(True)
+            calls = len(self._outcomes)
+            if calls >= self.min_calls and self._failures / calls >= self.failure_ratio:
+                self._open()
+
+    def release(self) -> None:
+        """
+        Give back an allowed call that ends without an outcome (shed by the rate
+        limiter, cut short by a deadline, abandoned by the client), so a
+        half-open trial slot is free again at once.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def _add_outcome(self, failed: bool) -> None:
+        """Append an outcome and drop those older than the window (lock held)."""
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            _, old_failed = self._outcomes.popleft()
+            self._failures -= old_failed
+
+    def _open(self) -> None:
+        """Open the breaker (lock held)."""
+        print(f"[WARNING] Circuit for {self.name} opened, using fallbacks for {self.open_seconds}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._failures = 0
+        self.times_opened += 1
+
+    def stats(self) -> dict:
+        """
+        Return breaker state and counters.
+
+        Returns:
+            Dict with enabled flag, state, calls and failures in the current window,
+            times_opened, short_circuited and seconds until the next trial
+        """
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "enabled": self.enabled,
+                "state": self._state,
+                "window_calls": len(self._outcomes),
+                "window_failures": self._failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(retry_in, 1)
+            }
@@ -0,0 +1,76 @@
+"""
+Shared, bounded thread pools for running independent I/O work concurrently.
+Stage tasks (single upstream fetches), batch tasks (whole trip plans that
+themselves fan out to stage tasks) and search page fetches (fanned out from
+stage tasks) use separate pools so a full outer pool can never starve the
+inner tasks it is waiting on. Background cache refreshes get their own pool
+so they never take capacity from user requests.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Config
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_pool(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return a named process-wide executor, creating it on first use.
+    
+    Args:
+        name: Pool name (also used as the thread name prefix)
+        max_workers: Maximum number of worker threads
+    
+    Returns:
+        ThreadPoolExecutor
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+                _executors[name] = executor
+    return executor
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide stage executor, creating it on first use.
+    
+    Returns:
+        ThreadPoolExecutor bounded by Config.STAGE_EXECUTOR_WORKERS
+    """
+    return _get_pool("stage", Config.STAGE_EXECUTOR_WORKERS)
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor for whole-destination batch jobs.
+    
+    Returns:
+        ThreadPoolExecutor bounded by Config.BATCH_MAX_CONCURRENCY
+    """
+    return _get_pool("batch", Config.BATCH_MAX_CONCURRENCY)
+
+
+def get_page_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor for parallel search page fetches.
+    
+    Returns:
+        ThreadPoolExecutor bounded by Config.SEARCH_PAGE_WORKERS
+    """
+    return _get_pool("pages", Config.SEARCH_PAGE_WORKERS)
+
+
+def get_refresh_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor for background cache refreshes.
+    
+    Returns:
+        ThreadPoolExecutor bounded by Config.REFRESH_WORKERS
+    """
+    return _get_pool("refresh", Config.REFRESH_WORKERS)
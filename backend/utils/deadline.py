@@ -0,0 +1,93 @@
+"""
+Request deadlines.
+A Deadline is created once per request and passed down to every layer that
+waits on an upstream, so timeouts, retries and backoff shrink to fit the
+time the request has left instead of each layer applying its own fixed budget.
+Background work (cache pre-warming) runs under a background Deadline, which
+tells those layers to give way to user requests for shared upstream quota.
+"""
+
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    An absolute point in time (monotonic clock) by which a request must finish.
+    Layers that skip or cut short work because of it call note_missed, so the
+    caller can tell a complete result from a partial one.
+    """
+
+    __slots__ = ("expires_at", "missed", "background")
+
+    def __init__(self, seconds: float, background: bool = False):
+        """
+        Args:
+            seconds: Time budget from now (float("inf") for none)
+            background: Work no user is waiting for; upstream quota is only taken
+                while it is spare, never queued for
+        """
+        self.expires_at = time.monotonic() + seconds
+        self.missed = False
+        self.background = background
+
+    def child(self) -> "Deadline":
+        """Same expiry with its own missed flag, e.g. one per concurrent stage."""
+        child = Deadline(0, self.background)
+        child.expires_at = self.expires_at
+        return child
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def note_missed(self, what: str) -> None:
+        """Record that work was skipped or cut short to meet the deadline."""
+        print(f"[WARNING] Request deadline reached, {what}")
+        self.missed = True
+
+    def __repr__(self) -> str:
+        background = ", background" if self.background else ""
+        return f"Deadline(remaining={self.remaining():.3f}s{background})"
+
+
+def time_left(deadline: Optional[Deadline], cap: float) -> float:
+    """
+    Clamp a timeout to a deadline.
+
+    Args:
+        deadline: Request deadline, or None for no deadline
+        cap: The timeout that applies without a deadline
+
+    Returns:
+        min(cap, seconds left before the deadline)
+    """
+    if deadline is None:
+        return cap
+    return min(cap, deadline.remaining())
+
+
+def request_deadline(header_value: Optional[str], default_seconds: float) -> Optional[Deadline]:
+    """
+    Build the deadline for an incoming request.
+
+    Args:
+        header_value: X-Request-Timeout header (seconds), may tighten but never extend the default
+        default_seconds: Configured budget; 0 or less disables the deadline unless the header sets one
+
+    Returns:
+        Deadline, or None if the request has no deadline
+    """
+    seconds = default_seconds if default_seconds > 0 else None
+    if header_value:
+        try:
+            requested = float(header_value)
+        except ValueError:
+            requested = None
+        if requested is not None and requested > 0:
+            seconds = requested if seconds is None else min(seconds, requested)
+    return Deadline(seconds) if seconds is not None else None
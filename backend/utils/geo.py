@@ -0,0 +1,95 @@
+"""
+Batch geo-filtering helpers.
+Computes haversine distances from one center to many points in a single
+vectorized NumPy pass when NumPy is installed, with a pure-Python fallback.
+"""
+
+import math
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+# Earth radius in kilometers (same as tripadvisor_service.haversine_distance)
+EARTH_RADIUS_KM = 6371.0
+
+# Below this many points the NumPy array setup costs more than it saves
+VECTORIZE_MIN_POINTS = 64
+
+
+def haversine_distances(center_lat: float, center_lng: float,
+                        lats: Sequence[float], lngs: Sequence[float]) -> list[float]:
+    """
+    Calculate great circle distances (km) from a center to many points.
+
+    Args:
+        center_lat, center_lng: Center coordinates in decimal degrees
+        lats, lngs: Point coordinates in decimal degrees (equal length)
+
+    Returns:
+        List of distances in kilometers, one per point
+    """
+    if np is not None and len(lats) >= VECTORIZE_MIN_POINTS:
+        a = _haversine_terms_numpy(center_lat, center_lng, lats, lngs)
+        return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).tolist()
+
+    return [
+        2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(max(a, 0.0), 1.0)))
+        for a in _haversine_terms_python(center_lat, center_lng, lats, lngs)
+    ]
+
+
+def within_radius_mask(center_lat: float, center_lng: float,
+                       lats: Sequence[float], lngs: Sequence[float], km: float) -> list[bool]:
+    """
+    Check which points lie within km of a center.
+    Compares the haversine "a" term against a precomputed threshold, so no
+    inverse trig is needed per point.
+
+    Args:
+        center_lat, center_lng: Center coordinates in decimal degrees
+        lats, lngs: Point coordinates in decimal degrees (equal length)
+        km: Maximum distance in kilometers
+
+    Returns:
+        List of booleans, True where the point is within the radius
+    """
+    if km >= math.pi * EARTH_RADIUS_KM:
+        return [True] * len(lats)
+
+    # distance <= km  <=>  a <= sin^2(km / 2R)
+    threshold = math.sin(km / (2 * EARTH_RADIUS_KM)) ** 2
+
+    if np is not None and len(lats) >= VECTORIZE_MIN_POINTS:
+        a = _haversine_terms_numpy(center_lat, center_lng, lats, lngs)
+        return (a <= threshold).tolist()
+
+    return [a <= threshold for a in _haversine_terms_python(center_lat, center_lng, lats, lngs)]
+
+
+def _haversine_terms_numpy(center_lat, center_lng, lats, lngs):
+    """Vectorized haversine "a" terms for all points."""
+    lat1 = math.radians(center_lat)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(lngs, dtype=np.float64)) - math.radians(center_lng)
+    return np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+
+
+def _haversine_terms_python(center_lat, center_lng, lats, lngs):
+    """Haversine "a" terms with the center's trig hoisted out of the loop."""
+    lat1 = math.radians(center_lat)
+    lng1 = math.radians(center_lng)
+    cos_lat1 = math.cos(lat1)
+    radians = math.radians
+    sin = math.sin
+    cos = math.cos
+
+    for lat, lng in zip(lats, lngs):
+        lat2 = radians(lat)
+        sin_dlat = sin((lat2 - lat1) / 2)
+        sin_dlon = sin((radians(lng) - lng1) / 2)
+        yield sin_dlat * sin_dlat + cos_lat1 * cos(lat2) * sin_dlon * sin_dlon
@@ -2,6 +2,9 @@
 Helper utility functions for the application.
 """
 
+import json
+import time
+
 
 def log_request(request):
     """
@@ -31,3 +34,65 @@ def format_json_response(data, status_code=200):
     from flask import jsonify
     return jsonify(data), status_code
 
+
+def timed(fn, *args, **kwargs):
+    """
+    Calls a function and measures its wall-clock duration.
+    
+    Args:
+        fn: Function to call
+        *args, **kwargs: Arguments passed to fn
+    
+    Returns:
+        tuple: (result, elapsed milliseconds rounded to 0.1 ms)
+    """
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def normalize_destination(destination):
+    """
+    Normalizes a destination name for use in cache keys.
+    
+    Args:
+        destination (str): Destination name as entered by the user
+    
+    Returns:
+        str: Lower-cased destination with collapsed whitespace
+    """
+    return " ".join(str(destination).lower().split())
+
+
+def format_sse(event, data):
+    """
+    Formats a Server-Sent Events message.
+    
+    Args:
+        event (str): Event name
+        data: JSON-serializable payload
+    
+    Returns:
+        str: SSE message terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=json_default)}\n\n"
+
+
+def json_default(obj):
+    """
+    json.dumps default hook for objects that provide a to_dict() wire form
+    (e.g. the Hotel/Activity records).
+    
+    Args:
+        obj: Object the encoder could not serialize
+    
+    Returns:
+        dict: obj.to_dict()
+    
+    Raises:
+        TypeError: If obj has no to_dict()
+    """
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
@@ -0,0 +1,151 @@
+"""
+Incremental JSON decoding for large upstream responses.
+Decodes the elements of one array member of a top-level JSON object as body
+chunks arrive, so callers can process items while the rest of the response
+is still downloading and never hold the whole decoded document.
+"""
+
+import codecs
+import json
+import re
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+
+
+class JSONArrayItemDecoder:
+    """
+    Push decoder yielding the items of `{"<key>": [item, ...], ...}`.
+    Other members of the top-level object are decoded and discarded.
+    """
+
+    def __init__(self, key: str):
+        """
+        Args:
+            key: Name of the top-level member holding the array
+        """
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "object"
+        self._member = None
+
+    def feed(self, chunk) -> list:
+        """
+        Add a chunk of the response body.
+
+        Args:
+            chunk: bytes or str
+
+        Returns:
+            List of array items completed by this chunk
+
+        Raises:
+            ValueError: If the document is not valid JSON of the expected shape
+        """
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk)
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        """
+        Signal the end of the body.
+
+        Returns:
+            List of any remaining array items
+
+        Raises:
+            ValueError: If the document is truncated or invalid
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON document")
+        return items
+
+    def _decode_value(self, pos: int, final: bool):
+        """
+        Decode one complete JSON value at pos.
+
+        Returns:
+            (value, end) or None if more input is needed
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A number cut by a chunk boundary decodes as a shorter number: only accept
+        # a value once the delimiter that follows it has arrived
+        if not final and (end >= len(self._buffer) or self._buffer[end] not in _DELIMITERS):
+            return None
+        return value, end
+
+    def _drain(self, final: bool) -> list:
+        """Decode as far as the buffered input allows."""
+        items = []
+        buffer = self._buffer
+        pos = 0
+        size = len(buffer)
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= size or self._state == "done":
+                break
+            char = buffer[pos]
+
+            if self._state == "object":
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                pos += 1
+                self._state = "member"
+
+            elif self._state == "member":
+                if char == "}":
+                    pos += 1
+                    self._state = "done"
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode_value(pos, final)
+                    if decoded is None:
+                        break
+                    self._member, pos = decoded
+                    self._state = "colon"
+
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError("Expected ':' after object key")
+                pos += 1
+                self._state = "value"
+
+            elif self._state == "value":
+                if self._member == self.key and char == "[":
+                    pos += 1
+                    self._state = "items"
+                else:
+                    decoded = self._decode_value(pos, final)
+                    if decoded is None:
+                        break
+                    pos = decoded[1]
+                    self._state = "member"
+
+            elif self._state == "items":
+                if char == "]":
+                    pos += 1
+                    self._state = "member"
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode_value(pos, final)
+                    if decoded is None:
+                        break
+                    item, pos = decoded
+                    items.append(item)
+
+        self._buffer = buffer[pos:]
+        return items
@@ -0,0 +1,83 @@
+"""
+Precompiled keyword classifier.
+Labels a piece of text with every tag whose keyword list has a case-insensitive
+substring match, using one combined regex scan instead of a Python loop per
+keyword list. Low-cardinality texts (categories, destinations) are memoized;
+single-tag checks on high-cardinality texts (names) use a per-tag regex.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+
+class KeywordClassifier:
+    """Tags text with every keyword set that has a substring match in one regex scan."""
+
+    def __init__(self, keyword_sets: dict[str, Iterable[str]], cache_size: int = 8192):
+        """
+        Args:
+            keyword_sets: Mapping of tag -> keywords (matched case-insensitively as substrings)
+            cache_size: Number of distinct texts whose tags are memoized
+        """
+        keyword_tags = {}
+        for tag, keywords in keyword_sets.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    keyword_tags.setdefault(keyword, set()).add(tag)
+
+        # The regex reports only the longest keyword starting at each position, so a
+        # keyword also carries the tags of every keyword that is a prefix of it.
+        self._tags = {
+            keyword: frozenset().union(*(
+                tags for other, tags in keyword_tags.items() if keyword.startswith(other)
+            ))
+            for keyword in keyword_tags
+        }
+
+        # Lookahead so overlapping keywords at every position are found
+        alternation = "|".join(re.escape(k) for k in sorted(keyword_tags, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))") if alternation else None
+        self._tag_patterns = {
+            tag: re.compile("|".join(re.escape(k) for k in sorted(keyword_tags, key=len, reverse=True)
+                                     if tag in keyword_tags[k]))
+            for tag in keyword_sets
+            if any(tag in tags for tags in keyword_tags.values())
+        }
+        self.tags = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> frozenset:
+        """
+        Return the set of tags matching text (memoized through self.tags).
+
+        Args:
+            text: Text to classify
+
+        Returns:
+            frozenset of tags
+        """
+        if not text or self._pattern is None:
+            return frozenset()
+
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._tags[match.group(1)]
+        return frozenset(found)
+
+    def has(self, text: str, tag: str) -> bool:
+        """
+        Check whether text matches a tag.
+        Not memoized, so suited to texts that rarely repeat (use tags() otherwise).
+
+        Args:
+            text: Text to classify
+            tag: Tag name
+
+        Returns:
+            True if any keyword of the tag occurs in text
+        """
+        pattern = self._tag_patterns.get(tag)
+        if not text or pattern is None:
+            return False
+        return pattern.search(text.lower()) is not None
@@ -0,0 +1,307 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+Counters and histograms keep one small slotted child per label set, each with
+its own lock. Hot paths bind their label values once (metric.labels(...)) and
+then pay one uncontended lock round-trip per inc/observe, with no allocation. Values that
+other components already count (cache hits, breaker states...) are read at
+scrape time by registered collectors instead of being double counted.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from config.settings import Config
+
+
+# Latency buckets in seconds, from in-process stages (parse, serialization)
+# up to slow upstream calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """Named metric with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), registry=None):
+        """
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names; values are given to labels() in the same order
+            registry: Registry to add the metric to (defaults to the global registry)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}  # label values as strings -> child
+        self._lookup = {}  # label values as passed -> child, skips str() on repeat calls
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values):
+        """
+        Return the child for one set of label values (created on first use).
+
+        Args:
+            *values: One value per label name, in order
+        """
+        child = self._lookup.get(values)
+        if child is not None:
+            return child
+
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        with self._lock:
+            child = self._children.setdefault(key, self._new_child())
+            self._lookup[values] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        """Return the exposition lines of this metric."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            lines.extend(child.render(self.name, dict(zip(self.labelnames, key))))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """Add amount (must be non-negative)."""
+        if not Config.METRICS_ENABLED:
+            return
+        with self._lock:
+            self._value += amount
+
+    def render(self, name: str, labels: dict) -> list[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self._value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, *values, amount: float = 1) -> None:
+        """
+        Add amount to the count for the given label values.
+
+        Args:
+            *values: Label values (see labels)
+            amount: Increment
+        """
+        self.labels(*values).inc(amount)
+
+
+class _Timer:
+    """Context manager observing the elapsed time of its block."""
+
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._child.observe(time.perf_counter() - self._started)
+        return False
+
+
+class _HistogramChild:
+    __slots__ = ("_buckets", "_counts", "_sum", "_lock")
+
+    def __init__(self, buckets: tuple):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        if not Config.METRICS_ENABLED:
+            return
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the duration of its block in seconds."""
+        return _Timer(self)
+
+    def render(self, name: str, labels: dict) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._buckets + (float("inf"),), counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies in seconds) over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS, registry=None):
+        """
+        Args:
+            name, documentation, labelnames, registry: See _Metric
+            buckets: Upper bounds of the buckets, ascending (+Inf is implied)
+        """
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, *values) -> None:
+        """
+        Record one observation for the given label values.
+
+        Args:
+            value: Observed value
+            *values: Label values (see labels)
+        """
+        self.labels(*values).observe(value)
+
+
+class Registry:
+    """Set of metrics and scrape-time collectors rendered together."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def register_collector(self, collector) -> None:
+        """
+        Add a callable run at scrape time.
+
+        Args:
+            collector: Returns an iterable of (name, kind, documentation, samples),
+                samples being (labels dict, value) pairs
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            Exposition text (ends with a newline)
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"[WARNING] Metrics collector failed: {str(e)}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# Application metrics
+
+request_seconds = Histogram(
+    "travel_request_duration_seconds",
+    "Time to produce a response (time to first byte for streamed responses), by route.",
+    ("route", "method", "status")
+)
+
+stage_seconds = Histogram(
+    "travel_stage_duration_seconds",
+    "Time spent per processing stage: upstream_fetch (one RapidAPI attempt), parse "
+    "(search page parsing inside a fetch), retry_backoff, filter (hotel/activity "
+    "selection), openai_call and serialization.",
+    ("stage",)
+)
+
+# Response body encoding and compression, shared by the Flask and ASGI routes
+serialization_seconds = stage_seconds.labels("serialization")
+
+upstream_responses = Counter(
+    "travel_upstream_responses_total",
+    "Upstream call outcomes by HTTP status code, timeout/error when there was no response, "
+    "or invalid_body when a 200 body could not be parsed.",
+    ("upstream", "status")
+)
+
+upstream_retries = Counter(
+    "travel_upstream_retries_total",
+    "Upstream attempts retried, by the reason of the failed attempt.",
+    ("upstream", "reason")
+)
+
+fallbacks = Counter(
+    "travel_fallbacks_total",
+    "Results served without the upstream API, by source (catalog or mock).",
+    ("kind", "source")
+)
+
+filter_items = Counter(
+    "travel_filter_items_total",
+    "Candidates kept or dropped by each hotel/activity filter (limit: not examined "
+    "because enough results were already selected).",
+    ("kind", "filter", "outcome")
+)
@@ -0,0 +1,254 @@
+"""
+Client-side token-bucket rate limiter.
+The bucket state lives in a small SQLite database so every thread and every
+worker process on the host draws from the same budget. Callers reserve a
+token up front: they either wait for it (up to max_wait) or are shed
+immediately, instead of discovering exhausted quota through HTTP 429.
+Falls back to an in-process bucket if the database is unavailable.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class TokenBucket:
+    """Token bucket shared across threads and processes through SQLite."""
+
+    def __init__(self, name: str, rate: float, burst: float, max_wait: float,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            name: Bucket name (one row per bucket in the database)
+            rate: Tokens added per second
+            burst: Bucket capacity
+            max_wait: Longest a caller may queue for a token before being shed
+            db_path: SQLite database path, or None for a process-local bucket
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Process-local state, used when db_path is None or the database fails
+        self._tokens = burst
+        self._updated_at = time.time()
+        self._stats = {
+            "acquired": 0,
+            "rejected": 0,
+            "waited": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "penalties": 0
+        }
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Return this thread's database connection, or None for a local bucket."""
+        if self.db_path is None:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=2, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Rate limiter store unavailable, using a local bucket: {str(e)}")
+            self.db_path = None
+            return None
+        self._local.conn = conn
+        return conn
+
+    def _take(self, tokens: float, updated_at: float, now: float, limit: Optional[float],
+              spare: float = 0):
+        """
+        Refill the bucket and reserve one token.
+
+        Args:
+            tokens, updated_at: Stored bucket state
+            now: Current time
+            limit: Longest acceptable wait, or None to only drain (no reservation)
+            spare: Tokens that must be left in the bucket after the reservation
+
+        Returns:
+            (new tokens, wait in seconds or None if the caller is shed)
+        """
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if limit is None:
+            return min(tokens, 0.0), 0.0
+
+        # Tokens may go negative: a negative balance is a queue of reservations
+        wait = max(0.0, (1 + spare - tokens) / self.rate) if self.rate > 0 else float("inf")
+        if wait > limit:
+            return tokens, None
+        return tokens - 1, wait
+
+    def _update(self, limit: Optional[float], spare: float = 0) -> Optional[float]:
+        """Apply _take atomically to the shared (or local) bucket state."""
+        now = time.time()
+        conn = self._connect()
+        if conn is not None:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = conn.execute(
+                        "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+                    ).fetchone()
+                    tokens, updated_at = row if row else (self.burst, now)
+                    tokens, wait = self._take(tokens, updated_at, now, limit, spare)
+                    conn.execute(
+                        "INSERT INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                        (self.name, tokens, now)
+                    )
+                    conn.execute("COMMIT")
+                    return wait
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                print(f"[WARNING] Rate limiter store error, using a local bucket: {str(e)}")
+
+        with self._lock:
+            self._tokens, wait = self._take(self._tokens, self._updated_at, now, limit, spare)
+            self._updated_at = now
+            return wait
+
+    def reserve(self, max_wait: Optional[float] = None, spare: float = 0) -> Optional[float]:
+        """
+        Reserve a token without sleeping.
+
+        Args:
+            max_wait: Longest acceptable wait (defaults to the bucket's max_wait)
+            spare: Tokens that must be left for other callers; with max_wait=0 this
+                makes a low-priority reservation that only succeeds while the bucket
+                has headroom and never queues ahead of anyone
+
+        Returns:
+            Seconds to wait before using the token, or None if the caller is shed
+        """
+        wait = self._update(self.max_wait if max_wait is None else max_wait, spare)
+        with self._lock:
+            if wait is None:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["acquired"] += 1
+                if wait > 0:
+                    self._stats["waited"] += 1
+                    self._stats["wait_seconds_total"] += wait
+                    self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+        return wait
+
+    def acquire(self, max_wait: Optional[float] = None, spare: float = 0) -> bool:
+        """
+        Take a token, sleeping until it is available.
+
+        Args:
+            max_wait: Longest acceptable wait (defaults to the bucket's max_wait)
+            spare: Tokens that must be left for other callers (see reserve)
+
+        Returns:
+            True if a token was taken, False if the caller was shed
+        """
+        wait = self.reserve(max_wait, spare)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def async_acquire(self, max_wait: Optional[float] = None, spare: float = 0) -> bool:
+        """
+        Async equivalent of acquire (waits without blocking the event loop).
+        The shared bucket is updated in a worker thread, since its transaction
+        can wait up to 2s for another process holding the database lock.
+
+        Args:
+            max_wait: Longest acceptable wait (defaults to the bucket's max_wait)
+            spare: Tokens that must be left for other callers (see reserve)
+
+        Returns:
+            True if a token was taken, False if the caller was shed
+        """
+        if self.db_path is None:
+            wait = self.reserve(max_wait, spare)
+        else:
+            wait = await asyncio.to_thread(self.reserve, max_wait, spare)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def available(self) -> float:
+        """
+        Read the tokens currently in the bucket without taking any.
+
+        Returns:
+            Token balance (negative while reservations are queued)
+        """
+        now = time.time()
+        conn = self._connect()
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens, updated_at = row if row else (self.burst, now)
+                return min(self.burst, tokens + (now - updated_at) * self.rate)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Rate limiter store error, using a local bucket: {str(e)}")
+
+        with self._lock:
+            return min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+
+    def penalize(self) -> None:
+        """Empty the bucket for every worker, e.g. after the upstream answered 429."""
+        self._update(None)
+        with self._lock:
+            self._stats["penalties"] += 1
+
+    async def async_penalize(self) -> None:
+        """Async equivalent of penalize (the shared bucket is updated in a worker thread)."""
+        if self.db_path is None:
+            self.penalize()
+        else:
+            await asyncio.to_thread(self.penalize)
+
+    def stats(self) -> dict:
+        """
+        Return limiter configuration and counters for this process.
+
+        Returns:
+            Dict with rate, burst, max_wait, shared flag, acquired, rejected,
+            waited, wait_seconds_total, wait_seconds_max and penalties
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wait_seconds_total"] = round(stats["wait_seconds_total"], 3)
+        stats["wait_seconds_max"] = round(stats["wait_seconds_max"], 3)
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_wait": self.max_wait,
+            "shared": self.db_path is not None,
+            **stats
+        }
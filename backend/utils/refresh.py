@@ -0,0 +1,87 @@
+"""
+Background revalidation for stale-while-revalidate caching.
+Callers serve a stale (or nearly expired) cached value immediately and hand
+the refresh to the shared refresher, which runs at most one refresh per key
+at a time on a bounded pool and drops refreshes once too many are pending.
+"""
+
+import threading
+from typing import Callable, Hashable
+from config.settings import Config
+from utils.concurrency import get_refresh_executor
+
+
+class BackgroundRefresher:
+    """Deduplicated, bounded background refresh jobs keyed by cache key."""
+
+    def __init__(self, max_pending: int):
+        """
+        Args:
+            max_pending: Maximum refreshes queued or running at once; more are dropped
+        """
+        self.max_pending = max_pending
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "scheduled": 0,
+            "deduplicated": 0,
+            "dropped": 0,
+            "completed": 0,
+            "failed": 0
+        }
+
+    def schedule(self, key: Hashable, fn: Callable[[], object]) -> bool:
+        """
+        Run fn in the background unless a refresh for key is already pending.
+
+        Args:
+            key: Identity of the refreshed entry (must be hashable)
+            fn: Zero-argument callable that fetches and stores the fresh value
+
+        Returns:
+            True if a refresh was scheduled, False if deduplicated or dropped
+        """
+        with self._lock:
+            if key in self._pending:
+                self._stats["deduplicated"] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self._stats["dropped"] += 1
+                return False
+            self._pending.add(key)
+            self._stats["scheduled"] += 1
+
+        try:
+            get_refresh_executor().submit(self._run, key, fn)
+        except RuntimeError:
+            # Executor shut down (interpreter exit)
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, key: Hashable, fn: Callable[[], object]) -> None:
+        """Execute one refresh and release its key."""
+        try:
+            fn()
+            outcome = "completed"
+        except Exception as e:
+            print(f"[WARNING] Background refresh failed for {key}: {str(e)}")
+            outcome = "failed"
+        with self._lock:
+            self._pending.discard(key)
+            self._stats[outcome] += 1
+
+    def stats(self) -> dict:
+        """
+        Return refresh counters.
+
+        Returns:
+            Dict with pending, scheduled, deduplicated, dropped, completed and failed counts
+        """
+        with self._lock:
+            return {"pending": len(self._pending), **self._stats}
+
+
+# Shared by the hotel/activity result cache and the summary cache
+refresher = BackgroundRefresher(max_pending=Config.REFRESH_MAX_PENDING)
@@ -0,0 +1,229 @@
+"""
+Response-level cache of serialized JSON bodies.
+Each entry holds the encoded bytes plus gzip (and brotli, when the brotli
+package is installed) variants computed once at store time, and a strong
+ETag per representation. Cache hits skip serialization and compression
+entirely, and conditional requests are answered with 304 Not Modified.
+"""
+
+import gzip
+import hashlib
+from typing import Hashable, Optional
+from flask import Response
+from config.settings import Config
+from utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 8
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = ("br", "gzip")
+
+
+class CachedBody:
+    """A serialized response body with its precompressed variants."""
+
+    __slots__ = ("body", "variants", "etag")
+
+    def __init__(self, body: bytes, min_compress_bytes: int = 512):
+        """
+        Args:
+            body: Encoded response body
+            min_compress_bytes: Bodies smaller than this are only stored uncompressed
+        """
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {}
+
+        if len(body) >= min_compress_bytes:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            if len(compressed) < len(body):
+                self.variants["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+                if len(compressed) < len(body):
+                    self.variants["br"] = compressed
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the body and all variants."""
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag for one representation (each content-coding gets its own tag)."""
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+    def select(self, accept_encoding: str) -> tuple[Optional[str], bytes]:
+        """
+        Pick the best representation for an Accept-Encoding header.
+
+        Args:
+            accept_encoding: Accept-Encoding request header value
+
+        Returns:
+            Tuple of (content-coding or None for identity, body bytes)
+        """
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                return encoding, self.variants[encoding]
+        return None, self.body
+
+    def matches(self, if_none_match: str) -> bool:
+        """
+        Check an If-None-Match header against any representation of this body.
+
+        Args:
+            if_none_match: If-None-Match request header value
+
+        Returns:
+            True if the client already holds the current body
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            # If-None-Match uses weak comparison
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            tag = tag.strip('"')
+            if tag == self.etag or tag.rsplit("-", 1)[0] == self.etag:
+                return True
+        return False
+
+
+def _accepted_encodings(header: str) -> set:
+    """
+    Parse an Accept-Encoding header into the set of acceptable codings.
+
+    Args:
+        header: Accept-Encoding header value
+
+    Returns:
+        Set of lowercase coding names with a non-zero q-value
+    """
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding)
+
+    if "*" in accepted:
+        accepted.update(ENCODINGS)
+    return accepted
+
+
+class ResponseCache:
+    """TTL + LRU cache of CachedBody entries, accounted by their byte size."""
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: float, min_compress_bytes: int = 512):
+        """
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total bytes of bodies and compressed variants
+            default_ttl: Time-to-live in seconds for new entries
+            min_compress_bytes: Bodies smaller than this are not compressed
+        """
+        self.min_compress_bytes = min_compress_bytes
+        self._cache = TTLCache(max_entries=max_entries, max_bytes=max_bytes, default_ttl=default_ttl)
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        """
+        Look up a cached response body.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CachedBody, or None on a miss
+        """
+        return self._cache.get(key)
+
+    def store(self, key: Hashable, body: bytes, cache: bool = True) -> CachedBody:
+        """
+        Compress and cache a response body.
+
+        Args:
+            key: Cache key
+            body: Encoded response body
+            cache: False to only build the entry without caching it (partial
+                plans, fallback data)
+
+        Returns:
+            The new CachedBody
+        """
+        entry = CachedBody(body, self.min_compress_bytes)
+        if cache:
+            self._cache.set(key, entry, size=entry.size)
+        return entry
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict with TTLCache stats and whether brotli is available
+        """
+        stats = self._cache.stats()
+        stats["brotli"] = brotli is not None
+        return stats
+
+
+def to_response(entry: CachedBody, request, cache_status: str = "HIT", conditional: bool = True) -> Response:
+    """
+    Build a Flask response for a cached body, negotiating content-coding
+    and answering If-None-Match with 304.
+
+    Args:
+        entry: Cached response body
+        request: Flask request object
+        cache_status: Value of the X-Cache header ("HIT" or "MISS")
+        conditional: Whether to honour If-None-Match (GET/HEAD only)
+
+    Returns:
+        Flask Response
+    """
+    encoding, body = entry.select(request.headers.get("Accept-Encoding", ""))
+    headers = {
+        "ETag": entry.etag_for(encoding),
+        "Vary": "Accept-Encoding",
+        "X-Cache": cache_status
+    }
+
+    if conditional and entry.matches(request.headers.get("If-None-Match", "")):
+        return Response(status=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, status=200, headers=headers, mimetype="application/json")
+
+
+# Shared response cache for /hotels, /activities and /plan_trip
+response_cache = ResponseCache(
+    max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=Config.RESPONSE_CACHE_MAX_BYTES,
+    default_ttl=Config.RESPONSE_CACHE_TTL_SECONDS,
+    min_compress_bytes=Config.RESPONSE_COMPRESS_MIN_BYTES
+)
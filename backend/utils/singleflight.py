@@ -0,0 +1,155 @@
+"""
+Single-flight request coalescing.
+Concurrent callers asking for the same key wait on one in-flight call
+and share its result (or exception) instead of each doing the work.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared async call whose leader was cancelled; followers retry."""
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with an identical key into one execution."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call (must be hashable)
+            fn: Zero-argument callable doing the actual work
+
+        Returns:
+            The result of fn, shared by every caller of this flight
+
+        Raises:
+            Any exception raised by fn, re-raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Remove before waking followers so later callers start a fresh flight
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> dict:
+        """
+        Return coalescing counters.
+
+        Returns:
+            Dict with executions, coalesced and in_flight counts
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent coroutine calls with an identical key on one event loop."""
+
+    def __init__(self):
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call (must be hashable)
+            fn: Zero-argument callable returning an awaitable doing the actual work
+
+        Returns:
+            The result of fn, shared by every caller of this flight
+
+        Raises:
+            Any exception raised by fn, re-raised in every caller. If the leader
+            is cancelled (client disconnect, deadline), followers are not: they
+            retry, the first one becoming the new leader.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                # Shield so a cancelled follower does not cancel the shared call
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except BaseException as e:
+            # A cancelled leader hands followers _LeaderCancelled so they retry
+            # instead of seeing a CancelledError of their own
+            future.set_exception(e if isinstance(e, Exception) else _LeaderCancelled())
+            # Mark retrieved so an unobserved failure is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Return coalescing counters.
+
+        Returns:
+            Dict with executions, coalesced and in_flight counts
+        """
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls)
+        }
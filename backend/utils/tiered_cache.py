@@ -0,0 +1,312 @@
+"""
+Two-tier cache: an in-process TTL/LRU cache (L1) in front of a shared backend (L2).
+L1 holds decoded values, so hits cost nothing; on an L1 miss (or when an L1 entry
+is due for refresh) the shared backend is consulted and its answer copied into L1.
+Writes and deletes go to both tiers, so what one worker process fetches or
+invalidates is seen by the others. L1 copies live at most l1_ttl seconds before
+being re-checked against L2. Without a backend this is a plain TTLCache.
+Offers the same get/get_stale/refresh_due/set/delete/clear interface as TTLCache,
+plus get_local for callers that must not wait on the backend.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Hashable, Optional
+from utils.cache import TTLCache
+from utils.cache_backend import CacheBackend, CacheBackendError, JSONCodec
+
+
+# Bumped when the cached value shapes change, so old L2 entries are ignored
+SCHEMA_VERSION = 1
+
+_MISSING = object()
+
+
+class TieredCache:
+    """Thread-safe L1 (in-process) + L2 (shared) cache with TTL and stale windows."""
+
+    def __init__(self, namespace: str, backend: Optional[CacheBackend] = None,
+                 codec: Optional[JSONCodec] = None, l1_ttl: float = 0,
+                 max_entries: int = 256, max_bytes: int = 0, default_ttl: float = 900,
+                 stale_ttl: float = 0, refresh_ahead: float = 0.0):
+        """
+        Args:
+            namespace: Key prefix separating this cache from others in the backend
+            backend: Shared L2 store, or None for L1 only
+            codec: Serializer for L2 payloads (defaults to plain JSON)
+            l1_ttl: Longest an L1 copy is used before re-checking L2 (0 disables the cap)
+            max_entries, max_bytes: L1 limits (see TTLCache)
+            default_ttl: Default time-to-live in seconds for new entries
+            stale_ttl: Seconds an expired entry is still returned by get_stale
+            refresh_ahead: Fraction of the TTL before expiry from which an entry is due for refresh
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self.codec = codec or JSONCodec()
+        self.l1_ttl = l1_ttl
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self.l1 = TTLCache(
+            max_entries=max_entries, max_bytes=max_bytes, default_ttl=default_ttl,
+            stale_ttl=stale_ttl, refresh_ahead=refresh_ahead
+        )
+        self._prefix = f"{namespace}:{SCHEMA_VERSION}:"
+        self._lock = threading.Lock()
+        self._counts = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l2_hits": 0,
+            "l2_stale_hits": 0,
+            "l2_misses": 0,
+            "l2_errors": 0,
+            "fallback_hits": 0
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, returning default if it is missing or expired in both tiers.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        value = self.l1.get(key, _MISSING)
+        if self.backend is None:
+            return default if value is _MISSING else value
+        if value is not _MISSING:
+            self._count("l1_hits")
+            return value
+
+        self._count("l1_misses")
+        try:
+            envelope = self._load(key)
+        except CacheBackendError:
+            self._count("l2_errors")
+            return default
+        if envelope is None or envelope["e"] <= time.time():
+            self._count("l2_misses")
+            return default
+        self._count("l2_hits")
+        return envelope["v"]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> tuple[Any, bool]:
+        """
+        Look up a key for stale-while-revalidate (see TTLCache.get_stale).
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Tuple of (cached value or default, whether the caller should refresh it)
+        """
+        value, refresh = self.l1.get_stale(key, _MISSING)
+        if self.backend is None:
+            return (default, False) if value is _MISSING else (value, refresh)
+        if value is not _MISSING and not refresh:
+            self._count("l1_hits")
+            return value, False
+
+        # Missing or due in L1: another worker may already have a fresher copy
+        self._count("l1_misses")
+        try:
+            envelope = self._load(key)
+        except CacheBackendError:
+            self._count("l2_errors")
+            if value is _MISSING:
+                return default, False
+            self._count("fallback_hits")
+            return value, refresh
+        if envelope is None:
+            # Expired or invalidated everywhere
+            self._count("l2_misses")
+            return default, False
+
+        now = time.time()
+        if envelope["e"] <= now:
+            self._count("l2_stale_hits")
+            return envelope["v"], True
+        self._count("l2_hits")
+        return envelope["v"], envelope["r"] <= now
+
+    def get_local(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key in L1 only, never touching the backend (safe on an event loop).
+        Entries that are stale or due for refresh are not returned; on a miss
+        nothing is counted, so the caller can go on to get/get_stale.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Fresh L1 value or default
+        """
+        if self.l1.refresh_due(key):
+            return default
+        value = self.l1.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if self.backend is not None:
+            self._count("l1_hits")
+        return value
+
+    def refresh_due(self, key: Hashable) -> bool:
+        """
+        Check, without counting a lookup, whether an entry is missing, stale or
+        within the refresh-ahead window in both tiers.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry should be refreshed before being relied on
+        """
+        if not self.l1.refresh_due(key):
+            return False
+        if self.backend is None:
+            return True
+        try:
+            envelope = self._load(key)
+        except CacheBackendError:
+            return True
+        return envelope is None or envelope["r"] <= time.time()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (defaults to default_ttl)
+            size: Size in bytes to account for the value in L1 (defaults to the payload size)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if self.backend is None:
+            self.l1.set(key, value, ttl=ttl, size=size)
+            return
+
+        now = time.time()
+        try:
+            payload = self.codec.dumps({"e": now + ttl, "r": now + ttl * (1 - self.refresh_ahead), "v": value})
+        except (TypeError, ValueError) as e:
+            print(f"[WARNING] Value for {self.namespace} cache not serializable, caching in-process only: {str(e)}")
+            payload = None
+
+        self.l1.set(key, value, ttl=self._l1_ttl(ttl), size=size if size is not None or payload is None else len(payload))
+        if payload is not None:
+            self.backend.set(self._key(key), payload, ttl + self.stale_ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key from both tiers.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key was present in L1
+        """
+        if self.backend is not None:
+            self.backend.delete(self._key(key))
+        return self.l1.delete(key)
+
+    def clear(self) -> None:
+        """Remove all entries of this namespace from both tiers (counters are kept)."""
+        if self.backend is not None:
+            self.backend.clear(self._prefix)
+        self.l1.clear()
+
+    def stats(self) -> dict:
+        """
+        Return counters and current usage per tier.
+
+        Returns:
+            Dict with the L1 usage counters (entries, bytes, evictions, expirations),
+            overall hits, misses and hit_ratio, and under "tiers" the lookups,
+            hits and hit_ratio of each tier (plus errors and backend status for L2)
+        """
+        stats = self.l1.stats()
+        if self.backend is None:
+            stats["tiers"] = {
+                "l1": {key: stats[key] for key in ("hits", "stale_hits", "misses", "hit_ratio")},
+                "l2": None
+            }
+            return stats
+
+        with self._lock:
+            counts = dict(self._counts)
+        l2_lookups = counts["l2_hits"] + counts["l2_stale_hits"] + counts["l2_misses"] + counts["l2_errors"]
+        l1_lookups = counts["l1_hits"] + counts["l1_misses"]
+        hits = counts["l1_hits"] + counts["l2_hits"] + counts["fallback_hits"]
+        stale_hits = counts["l2_stale_hits"]
+        lookups = l1_lookups
+
+        stats.update({
+            "hits": hits,
+            "stale_hits": stale_hits,
+            "misses": lookups - hits - stale_hits,
+            "hit_ratio": round((hits + stale_hits) / lookups, 4) if lookups else 0.0,
+            "tiers": {
+                "l1": {
+                    "hits": counts["l1_hits"],
+                    "misses": counts["l1_misses"],
+                    "hit_ratio": round(counts["l1_hits"] / l1_lookups, 4) if l1_lookups else 0.0
+                },
+                "l2": {
+                    "hits": counts["l2_hits"],
+                    "stale_hits": stale_hits,
+                    "misses": counts["l2_misses"],
+                    "errors": counts["l2_errors"],
+                    "hit_ratio": round((counts["l2_hits"] + stale_hits) / l2_lookups, 4) if l2_lookups else 0.0,
+                    **self.backend.stats()
+                }
+            }
+        })
+        return stats
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def _key(self, key: Hashable) -> str:
+        """Backend key: namespace, schema version and the JSON-encoded key."""
+        return self._prefix + json.dumps(list(key) if isinstance(key, tuple) else key, separators=(",", ":"))
+
+    def _l1_ttl(self, ttl: float) -> float:
+        return min(ttl, self.l1_ttl) if self.l1_ttl and ttl > 0 else ttl
+
+    def _load(self, key: Hashable) -> Optional[dict]:
+        """
+        Read an entry from L2 and copy it into L1.
+
+        Returns:
+            Envelope with value "v", expiry "e" and refresh time "r" (epoch seconds),
+            or None if L2 has no usable entry
+
+        Raises:
+            CacheBackendError: If the backend failed
+        """
+        payload = self.backend.get(self._key(key))
+        if payload is None:
+            return None
+        try:
+            envelope = self.codec.loads(payload)
+            value, expires_at = envelope["v"], envelope["e"]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"[WARNING] Dropping unreadable {self.namespace} cache entry: {str(e)}")
+            self.backend.delete(self._key(key))
+            return None
+
+        # Negative remaining TTL keeps a stale value stale in L1 too
+        self.l1.set(key, value, ttl=self._l1_ttl(expires_at - time.time()), size=len(payload))
+        return envelope
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1